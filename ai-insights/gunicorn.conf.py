@@ -0,0 +1,34 @@
+"""
+Gunicorn config for production (multi-worker) deployments.
+
+WHY: `uvicorn --workers N` imports the app separately in every worker, so each
+     one loads its own copy of the sentence-transformers/reranker weights and
+     Chroma client (~1.5 GB RSS each). With preload_app the master imports
+     main.py and builds the RAG singletons once, then forks the uvicorn workers,
+     which share those pages copy-on-write.
+
+Run:
+    gunicorn -c gunicorn.conf.py main:app
+
+`python main.py` still runs a single uvicorn process for local development.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8001')}"
+# setdefault so the app can see the worker count (the job store warns without REDIS_URL)
+workers = int(os.environ.setdefault("WEB_CONCURRENCY", "2"))
+# UvicornWorker uses loop="auto"/http="auto", i.e. uvloop + httptools when installed
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# Match the uvicorn settings in main.py
+keepalive = 5
+graceful_timeout = 30
+
+
+def when_ready(server):
+    """Runs in the master after the app is imported and before workers are forked."""
+    import main
+
+    main.preload_rag_models()
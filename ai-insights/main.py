@@ -1,7 +1,17 @@
 """FastAPI Server for AI Insights RAG Pipeline"""
 
 import asyncio
+import codecs
+import functools
+import gc
+import hashlib
+import importlib
+import importlib.util
+import multiprocessing
 import os
+import sys
+import tempfile
+import time
 
 # CRITICAL: Set environment variables BEFORE any imports that might use them
 # This prevents race conditions where libraries read env vars at import time
@@ -12,68 +22,155 @@ if not os.getenv("EMBEDDING_API_KEY") and os.getenv("HUGGINGFACE_API_KEY"):
     os.environ["EMBEDDING_API_KEY"] = os.getenv("HUGGINGFACE_API_KEY")
 
 # Now safe to import everything else
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
+import anyio
 import httpx
+import numpy as np
+import orjson
 from fastapi import BackgroundTasks, FastAPI, File, Header, HTTPException, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
-from pydantic import BaseModel
-
-# Lazy imports - heavy ML libraries loaded on first use
-_document_loader = None
-_retrieval_pipeline = None
-_generator = None
-_vector_store = None
+from pydantic import BaseModel, Field
+
+# Lazy imports - heavy ML libraries loaded on first use.
+# Module attribute -> (module, factory); see __getattr__ below.
+_LAZY = {
+    "document_loader": ("ai_insights.retrieval", "get_document_loader"),
+    "retrieval": ("ai_insights.retrieval", "get_retrieval_pipeline"),
+    "generator": ("ai_insights.utils", "get_generator"),
+    "vector_store": ("ai_insights.retrieval", "get_vector_store"),
+}
+_cognee_module = None
 _cognee_initialized = False
 
+# Process-wide Cognee client (resolved once via the lazy loader, then reused)
+_cognee_client_singleton = None
+_cognee_client_checked_at: float = 0.0
+_cognee_lock = asyncio.Lock()
+COGNEE_CLIENT_RECHECK_SECONDS = 300  # pool_pre_ping-style re-validation interval
+
+# Block startup until the RAG models are loaded (unset: load them in the background)
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "").lower() in ("true", "1", "yes")
+
 from ai_insights.config import API_HOST, API_PORT, SUPABASE_KEY, SUPABASE_URL, get_logger
 from ai_insights.utils import update_cognee_availability
+from ai_insights.utils.metrics import (
+    REGISTRY,
+    llm_generate_duration_seconds,
+    rag_retrieve_duration_seconds,
+)
+from ai_insights.utils.semantic_cache import clear_semantic_caches, get_semantic_cache
+from ai_insights.utils.validation import InsightType
 
 logger = get_logger(__name__)
 
 
+def __getattr__(name: str):
+    """
+    Build a heavy singleton on first `main.<name>` access (PEP 562).
+
+    WHY: The RAG stack (torch, sentence-transformers, chroma) can't be imported
+         at module top without slowing boot. The built object is stored as a
+         real module global, so this only runs once per name; after that
+         `main.retrieval` is a plain attribute lookup.
+    """
+    spec = _LAZY.get(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, factory = spec
+    obj = getattr(importlib.import_module(module), factory)()
+    globals()[name] = obj
+    return obj
+
+
+def _lazy(name: str):
+    # Bare names inside this module don't go through __getattr__, so look in globals first
+    obj = globals().get(name)
+    return obj if obj is not None else __getattr__(name)
+
+
+# Named getters are kept as the call sites (and patch points) inside this module
 def get_lazy_document_loader():
     """Lazy load document loader."""
-    global _document_loader
-    if _document_loader is None:
-        from ai_insights.retrieval import get_document_loader
-
-        _document_loader = get_document_loader()
-    return _document_loader
+    return _lazy("document_loader")
 
 
 def get_lazy_retrieval():
     """Lazy load retrieval pipeline."""
-    global _retrieval_pipeline
-    if _retrieval_pipeline is None:
-        from ai_insights.retrieval import get_retrieval_pipeline
-
-        _retrieval_pipeline = get_retrieval_pipeline()
-    return _retrieval_pipeline
+    return _lazy("retrieval")
 
 
 def get_lazy_generator():
     """Lazy load generator."""
-    global _generator
-    if _generator is None:
-        from ai_insights.utils import get_generator
-
-        _generator = get_generator()
-    return _generator
+    return _lazy("generator")
 
 
 def get_lazy_vector_store():
     """Lazy load vector store."""
-    global _vector_store
-    if _vector_store is None:
-        from ai_insights.retrieval import get_vector_store
+    return _lazy("vector_store")
+
+
+def get_lazy_cognee_loader():
+    """
+    Lazy load the Cognee loader.
+
+    WHY: ai_insights.cognee pulls in the cognee package, so it can't be imported
+         at module top. The package is resolved once and cached here instead of
+         re-running `from ... import` (import lock + sys.modules lookup) on every
+         query and background task. No await between check and assignment, so
+         no lock is needed on the event loop.
+    """
+    global _cognee_module
+    if _cognee_module is None:
+        _cognee_module = importlib.import_module("ai_insights.cognee")
+    return _cognee_module.get_cognee_lazy_loader()
+
+
+async def _get_cognee():
+    """
+    Get the shared Cognee client, resolving it once per process.
+
+    WHY: Re-resolving the client through the lazy loader in every background task
+         (and again for cognify) adds churn on hot webhook/sync paths. The client is
+         cached here and re-validated against the loader every
+         COGNEE_CLIENT_RECHECK_SECONDS, so a reset loader is picked up.
+
+    Returns None when Cognee is unavailable (never cached, so later calls retry).
+    """
+    global _cognee_client_singleton, _cognee_client_checked_at
+
+    now = time.monotonic()
+    if (
+        _cognee_client_singleton is not None
+        and now - _cognee_client_checked_at < COGNEE_CLIENT_RECHECK_SECONDS
+    ):
+        return _cognee_client_singleton
+
+    async with _cognee_lock:
+        # Double-check after acquiring lock
+        if (
+            _cognee_client_singleton is not None
+            and now - _cognee_client_checked_at < COGNEE_CLIENT_RECHECK_SECONDS
+        ):
+            return _cognee_client_singleton
+
+        client = await get_lazy_cognee_loader().get_client()
+        _cognee_client_singleton = client
+        _cognee_client_checked_at = time.monotonic() if client is not None else 0.0
+        return client
 
-        _vector_store = get_vector_store()
-    return _vector_store
+
+def _cognee_installed() -> bool:
+    """Whether the cognee package is importable, checked without importing it."""
+    return "cognee" in sys.modules or importlib.util.find_spec("cognee") is not None
 
 
 async def background_warmup():
@@ -84,17 +181,19 @@ async def background_warmup():
     If this fails silently, queries will crash with NoneType errors later.
     """
     global _cognee_initialized
+    if not _cognee_installed():
+        # Skip the ai_insights.cognee import tree entirely on RAG-only deployments
+        logger.info("Cognee package not installed - running in RAG-only mode")
+        _cognee_initialized = False
+        update_cognee_availability(False)
+        return
+
     try:
         logger.info("Background warmup: Loading Cognee...")
 
-        # Import Cognee here to keep main thread light during boot
-        from ai_insights.cognee import get_cognee_lazy_loader
-
-        loader = get_cognee_lazy_loader()
-
         # Get client to trigger initialization (but don't run cognify)
-        # CRITICAL: This must be awaited since get_client() is now async
-        client = await loader.get_client()
+        # Cognee is imported inside _get_cognee to keep main thread light during boot
+        client = await _get_cognee()
 
         if client:
             # Just initialize config, don't process data
@@ -124,6 +223,67 @@ async def background_warmup():
         update_cognee_availability(False)
 
 
+async def background_rag_warmup():
+    """
+    Pre-load the RAG singletons (models, Chroma client, Groq client) in worker threads.
+
+    WHY: Each lazy getter costs seconds on first use (torch/sentence-transformers,
+         chroma), so without this the first /query pays all of them in series.
+         Leaf singletons (embeddings, reranker, vector store) are built first and
+         in parallel, so the retrieval pipeline and document loader that share
+         them don't race to build duplicate models.
+    """
+
+    async def warm_retrieval():
+        retrieval = await asyncio.to_thread(importlib.import_module, "ai_insights.retrieval")
+        embeddings, _, _ = await asyncio.gather(
+            asyncio.to_thread(retrieval.get_embeddings),
+            asyncio.to_thread(retrieval.get_reranker),
+            asyncio.to_thread(get_lazy_vector_store),
+        )
+        await asyncio.gather(
+            asyncio.to_thread(get_lazy_retrieval),
+            asyncio.to_thread(get_lazy_document_loader),
+        )
+        # One throwaway encode pays torch's first-inference setup (thread pools,
+        # allocator, kernel selection) here rather than in the first /query
+        await asyncio.to_thread(embeddings.embed_text, "warm-up")
+
+    results = await asyncio.gather(
+        warm_retrieval(), asyncio.to_thread(get_lazy_generator), return_exceptions=True
+    )
+    failures = [r for r in results if isinstance(r, Exception)]
+    for failure in failures:
+        # Not fatal: the getters retry on first use
+        logger.warning(f"RAG warm-up failed, will load on first use: {failure}")
+    if not failures:
+        logger.info("RAG background warm-up complete")
+
+
+def preload_rag_models():
+    """
+    Build the heavy RAG singletons in the current process before workers fork.
+
+    WHY: Under gunicorn --preload (see gunicorn.conf.py) the master imports this
+         module once and forks the workers from it. Models loaded here are shared
+         copy-on-write, so N workers hold one copy of the embedding/reranker
+         weights instead of N. The generator is skipped: it is cheap to build
+         and its HTTP client should be created per worker.
+    """
+    try:
+        get_lazy_vector_store()
+        get_lazy_retrieval()
+        get_lazy_document_loader()
+    except Exception as e:
+        # Workers fall back to their own lazy loading
+        logger.warning(f"RAG preload failed, workers will load on first use: {e}")
+        return
+    # Move everything allocated so far out of GC tracking, so collections in the
+    # workers don't write to (and un-share) these pages
+    gc.freeze()
+    logger.info("RAG models preloaded for forked workers")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -143,6 +303,25 @@ async def lifespan(app: FastAPI):
     warmup_task = asyncio.create_task(background_warmup())
     _cognee_initialized = False
 
+    # Load the RAG stack alongside Cognee so the first /query doesn't pay for it.
+    # With PRELOAD_MODELS the app only starts serving once the models are loaded, so
+    # no request ever sees a cold model (slower boot, higher baseline memory).
+    rag_warmup_task = None
+    if PRELOAD_MODELS:
+        await background_rag_warmup()
+    else:
+        rag_warmup_task = asyncio.create_task(background_rag_warmup())
+
+    # Persistent worker pool for sync jobs
+    await job_queue.start()
+    app.state.arq = await _open_arq_pool()
+    cache_listener_task = None
+    if app.state.arq is not None:
+        cache_listener_task = asyncio.create_task(_listen_for_cache_invalidation(app.state.arq))
+
+    # Open the shared Supabase client up front so the first request doesn't build it
+    get_http_client()
+
     yield  # Control is handed back to FastAPI to start receiving requests
 
     # --- SHUTDOWN ---
@@ -155,6 +334,26 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️ Error during warmup task cancellation: {e}")
 
+    if rag_warmup_task is not None:
+        rag_warmup_task.cancel()
+
+    await job_queue.stop()
+
+    if cache_listener_task is not None:
+        cache_listener_task.cancel()
+
+    if app.state.arq is not None:
+        await app.state.arq.aclose()
+
+    if _csv_pool is not None:
+        _csv_pool.shutdown(wait=False, cancel_futures=True)
+
+    if _cognify_task is not None and not _cognify_task.done():
+        _cognify_task.cancel()
+
+    await close_http_client()
+    await close_job_store()
+
 
 # Initialize FastAPI with the lifespan and OpenAPI docs
 app = FastAPI(
@@ -200,23 +399,36 @@ Most endpoints require `X-Admin-Key` header for write operations.
     },
 )
 
+# Compress JSON responses. Product and query payloads are repetitive text and
+# shrink several-fold; tiny bodies aren't worth the CPU. Added first so it is the
+# innermost middleware and sees whole route responses (the BaseHTTPMiddleware
+# layers below re-stream bodies, which would defeat minimum_size). SSE streams
+# opt out via Content-Encoding: identity (SSE_HEADERS).
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # CORS middleware for frontend access
-# Explicit origins for production + wildcard for development
+# Explicit origins only: browsers reject "*" with credentials anyway. Extra
+# deploy origins (previews, custom domains) come from FRONTEND_ORIGIN, comma-separated.
 CORS_ORIGINS = [
     "https://studio-pilot-vision.lovable.app",
     "https://studio-pilot-vision.onrender.com",
     "http://localhost:5173",
     "http://localhost:3000",
     "http://localhost:8080",
-]
+] + [o.strip() for o in os.getenv("FRONTEND_ORIGIN", "").split(",") if o.strip()]
+
+# Preflights are cached by the browser for 24h, so the SPA's JSON POSTs pay
+# the extra OPTIONS round trip once per day instead of once per request.
+CORS_MAX_AGE = 86400
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=CORS_ORIGINS + ["*"],  # Explicit + wildcard fallback
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"],  # Allow frontend to read custom headers
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization", "Cache-Control", "X-API-Key", "X-Admin-Key"],
+    expose_headers=["X-RateLimit-Limit-Minute", "X-RateLimit-Remaining-Minute"],
+    max_age=CORS_MAX_AGE,
 )
 
 # Rate limiting middleware - prevents API abuse
@@ -247,12 +459,15 @@ async def global_exception_handler(request: Request, exc: Exception):
     """
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
     
-    # Get origin from request
-    origin = request.headers.get("origin", "*")
-    
-    # Check if origin is allowed
-    if origin not in CORS_ORIGINS:
-        origin = "*"
+    # Only echo allowed origins, same as CORSMiddleware
+    origin = request.headers.get("origin")
+    headers = {}
+    if origin in CORS_ORIGINS:
+        headers = {
+            "Access-Control-Allow-Origin": origin,
+            "Access-Control-Allow-Credentials": "true",
+            "Vary": "Origin",
+        }
     
     return JSONResponse(
         status_code=500,
@@ -261,12 +476,7 @@ async def global_exception_handler(request: Request, exc: Exception):
             "error": "Internal server error",
             "detail": str(exc) if os.getenv("DEBUG", "false").lower() == "true" else "An unexpected error occurred",
         },
-        headers={
-            "Access-Control-Allow-Origin": origin,
-            "Access-Control-Allow-Credentials": "true",
-            "Access-Control-Allow-Methods": "*",
-            "Access-Control-Allow-Headers": "*",
-        }
+        headers=headers,
     )
 
 
@@ -279,13 +489,21 @@ class QueryRequest(BaseModel):
 
 
 class IngestRequest(BaseModel):
-    source: str  # "products", "feedback", "documents"
+    source: Literal["products", "feedback", "documents"]
     product_id: Optional[str] = None
 
 
+# Upper bound on ids per /product-insight/batch call (keeps the in.(...) URL short)
+PRODUCT_BATCH_MAX_IDS = 50
+
 class ProductInsightRequest(BaseModel):
     product_id: str
-    insight_type: str = "summary"  # summary, risks, opportunities, recommendations
+    insight_type: InsightType = "summary"
+
+
+class ProductInsightBatchRequest(BaseModel):
+    product_ids: list[str] = Field(min_length=1, max_length=PRODUCT_BATCH_MAX_IDS)
+    insight_type: InsightType = "summary"
 
 
 class PortfolioInsightRequest(BaseModel):
@@ -301,22 +519,209 @@ class InsightResponse(BaseModel):
     usage: Optional[dict] = None
 
 
+# Shared Supabase HTTP client - reuses keep-alive TCP/TLS connections across requests
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the pooled HTTP client used for Supabase REST calls.
+
+    WHY: Building a new AsyncClient per call pays a TCP+TLS handshake every time
+         (100-300ms). HTTP/2 is enabled when the optional `h2` package is installed.
+         The REST base URL and auth headers live on the client, so calls pass
+         only the endpoint and params.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            base_url=f"{SUPABASE_URL}/rest/v1/",
+            headers={"apikey": SUPABASE_KEY or "", "Authorization": f"Bearer {SUPABASE_KEY}"},
+            http2=importlib.util.find_spec("h2") is not None,
+            # Idle connections are kept for 30s so dashboard polling stays on warm sockets
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30),
+            # Fail fast if Supabase is unreachable; large table reads still get 30s
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the pooled HTTP client (called on shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# In-flight Supabase GETs, keyed by endpoint + params (singleflight)
+_supabase_inflight: dict[tuple, asyncio.Task] = {}
+
+
 # Supabase client helper
 async def fetch_from_supabase(endpoint: str, params: dict = None) -> dict:
-    """Fetch data from Supabase REST API."""
+    """
+    Fetch data from Supabase REST API.
+
+    WHY: Ingest, Cognee ingest and sync paths often request the same table at
+         the same moment (e.g. everything kicked off after a deploy). Identical
+         concurrent requests share one round trip; the shared result must be
+         treated as read-only.
+    """
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(status_code=500, detail="Supabase not configured")
 
-    url = f"{SUPABASE_URL}/rest/v1/{endpoint}"
-    headers = {
-        "apikey": SUPABASE_KEY,
-        "Authorization": f"Bearer {SUPABASE_KEY}",
-    }
+    key = (endpoint, tuple(sorted((params or {}).items())))
+    task = _supabase_inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch_from_supabase(endpoint, params))
+        _supabase_inflight[key] = task
+        task.add_done_callback(lambda _: _supabase_inflight.pop(key, None))
+    # Shield so one cancelled caller doesn't cancel the fetch for the others
+    return await asyncio.shield(task)
+
+
+async def _fetch_from_supabase(endpoint: str, params: Optional[dict]) -> dict:
+    response = await get_http_client().get(endpoint, params=params)
+    response.raise_for_status()
+    # orjson parses the raw body directly; bulk product payloads are large
+    return orjson.loads(response.content)
+
+
+# Short-TTL cache for interactive product/portfolio reads
+SUPABASE_CACHE_TTL_SECONDS = float(os.getenv("SUPABASE_CACHE_TTL_SECONDS", "30"))
+SUPABASE_CACHE_MAX_ENTRIES = 512
+_supabase_cache: OrderedDict[tuple, tuple[float, list]] = OrderedDict()
+
+
+async def fetch_from_supabase_cached(endpoint: str, params: dict = None, fresh: bool = False) -> list:
+    """
+    fetch_from_supabase with a short-TTL LRU cache keyed by endpoint + params.
+
+    WHY: Dashboards ask for insights on the same product many times per session;
+         each repeat was a full Supabase round trip for identical data. Results
+         are shared between callers - treat them as read-only.
+
+    `fresh=True` skips the cached copy (the new result still refreshes the cache).
+    """
+    key = (endpoint, tuple(sorted((params or {}).items())))
+    cached = _supabase_cache.get(key)
+    if not fresh and cached is not None and time.monotonic() - cached[0] < SUPABASE_CACHE_TTL_SECONDS:
+        _supabase_cache.move_to_end(key)
+        return cached[1]
+
+    result = await fetch_from_supabase(endpoint, params=params)
+    _supabase_cache[key] = (time.monotonic(), result)
+    _supabase_cache.move_to_end(key)
+    if len(_supabase_cache) > SUPABASE_CACHE_MAX_ENTRIES:
+        _supabase_cache.popitem(last=False)
+    return result
+
+
+def clear_supabase_cache():
+    """Drop cached Supabase reads (after ingests / data-change webhooks)."""
+    _supabase_cache.clear()
+
+
+def _no_cache(cache_control: Optional[str]) -> bool:
+    """Whether a request's Cache-Control header asks to bypass cached Supabase reads."""
+    # Direct (non-HTTP) calls leave the Header() default in place, which isn't a str
+    return isinstance(cache_control, str) and "no-cache" in cache_control.lower()
+
+
+async def count_from_supabase(endpoint: str, params: dict = None) -> Optional[int]:
+    """
+    Count rows matching a Supabase REST query without fetching them.
+
+    WHY: A HEAD with `Prefer: count=exact` returns only the total in the
+         Content-Range header (e.g. `0-24/123` or `*/0`), so empty syncs can
+         short-circuit before any rows are transferred.
+
+    Returns None if the server doesn't report a total.
+    """
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise HTTPException(status_code=500, detail="Supabase not configured")
+
+    response = await get_http_client().head(endpoint, headers={"Prefer": "count=exact"}, params=params)
+    response.raise_for_status()
+    total = response.headers.get("content-range", "").rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+
+# Rows per page when streaming whole tables (/api/sync, /ingest)
+SUPABASE_PAGE_SIZE = int(os.getenv("SUPABASE_PAGE_SIZE", "1000"))
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        return response.json()
+# Product columns read by the document loader, Cognee snapshot ingestion and the generator.
+# Explicit lists instead of `*` keep wide columns (justification texts, prediction
+# feature blobs, compliance notes) off the wire; add a column here when a consumer needs it.
+_PRODUCT_COLUMNS = (
+    "id,name,product_type,region,lifecycle_stage,owner_email,revenue_target,"
+    "launch_date,success_metric,gating_status,updated_at"
+)
+_READINESS_COLUMNS = "readiness_score,risk_band"
+_PREDICTION_COLUMNS = "success_probability,revenue_probability,failure_risk"
+_COMPLIANCE_COLUMNS = "status,certification_type,expiry_date"
+
+# Shared PostgREST query params for sync paths (treat as read-only; copy before adding filters)
+_PRODUCTS_PARAMS = {
+    "select": (
+        f"{_PRODUCT_COLUMNS},readiness:product_readiness({_READINESS_COLUMNS}),"
+        f"prediction:product_predictions({_PREDICTION_COLUMNS})"
+    )
+}
+# Portfolio insights only summarize these fields per product (see InsightGenerator._portfolio_context)
+_PORTFOLIO_PARAMS = {"select": "id,name,lifecycle_stage,region,revenue_target"}
+_FEEDBACK_PARAMS = {"select": "*,product:products(name)"}
+_ACTIONS_PARAMS = {"select": "*,product:products(name)"}
+_SELECT_ALL_PARAMS = {"select": "*"}
+
+
+async def fetch_from_supabase_paged(
+    endpoint: str,
+    params: dict = None,
+    page_size: Optional[int] = None,
+    prefetch: bool = False,
+) -> AsyncIterator[list]:
+    """
+    Fetch a Supabase table page by page (PostgREST limit/offset).
+    
+    WHY: Materializing a 100k+ row table before ingesting spikes memory and
+         delays the first ingest until the whole download finishes. Yielding
+         pages lets callers start ingesting while later pages download.
+         Pages are ordered by id (unless the caller orders them) so
+         limit/offset windows never skip or repeat rows.
+    
+    With prefetch=True the next page is requested before the current one is
+    yielded, so a caller that processes pages inline overlaps the download of
+    page N+1 with its work on page N (one extra page held in memory).
+    Close the generator (`await pages.aclose()`) to cancel an unused prefetch.
+    """
+    page_size = page_size or SUPABASE_PAGE_SIZE
+    
+    def fetch_page(offset: int) -> asyncio.Task:
+        return asyncio.create_task(fetch_from_supabase(
+            endpoint,
+            params={"order": "id", **(params or {}), "limit": page_size, "offset": offset},
+        ))
+    
+    offset = 0
+    pending = fetch_page(offset)
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            offset += page_size
+            # A short page is the last one
+            full = len(page) >= page_size
+            if full and prefetch:
+                pending = fetch_page(offset)
+            if page:
+                yield page
+            if full and pending is None:
+                pending = fetch_page(offset)
+    finally:
+        if pending is not None:
+            pending.cancel()
 
 
 @app.get("/")
@@ -330,14 +735,47 @@ async def root():
     }
 
 
+# /health and /stats are hit by probes and dashboard polling; reuse a vector count this long
+VECTOR_COUNT_TTL_SECONDS = 2.0
+_vector_count_cache: Optional[tuple[object, float, int]] = None  # (store, read at, count)
+
+
+async def _vector_store_and_count():
+    """Return the vector store and its document count (cached for VECTOR_COUNT_TTL_SECONDS)."""
+    global _vector_count_cache
+    # Chroma calls are blocking (and the first one opens the store) - keep them off the loop
+    vs = await asyncio.to_thread(get_lazy_vector_store)
+    cached = _vector_count_cache
+    if cached is not None and cached[0] is vs and time.monotonic() - cached[1] < VECTOR_COUNT_TTL_SECONDS:
+        return vs, cached[2]
+    count = await asyncio.to_thread(vs.count)
+    _vector_count_cache = (vs, time.monotonic(), count)
+    return vs, count
+
+
+def _etag_response(request: Request, payload: dict) -> Response:
+    """
+    JSON response with a weak ETag over the body; 304 if the client already has it.
+
+    WHY: Pollers re-sending If-None-Match get an empty 304 instead of the body,
+         and max-age lets browsers/CDNs skip the request entirely for the
+         vector count cache window.
+    """
+    body = orjson.dumps(payload)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"max-age={int(VECTOR_COUNT_TTL_SECONDS)}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/health", tags=["health"], summary="Health Check", 
          description="Returns detailed health status of all AI services including ChromaDB, Cognee, and Groq.")
-async def health():
+async def health(request: Request):
     """Detailed health check with service status."""
-    vs = get_lazy_vector_store()
-    vector_count = vs.count()
+    _, vector_count = await _vector_store_and_count()
 
-    return {
+    return _etag_response(request, {
         "status": "healthy",
         "vector_store": {
             "connected": vector_count >= 0,
@@ -345,43 +783,224 @@ async def health():
         },
         "groq_configured": bool(os.getenv("GROQ_API_KEY")),
         "cognee_initialized": _cognee_initialized,
-    }
+    })
 
 
 @app.get("/metrics")
 async def metrics():
-    """Prometheus metrics endpoint."""
-    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    """Prometheus metrics endpoint (application registry only, no process/GC collectors)."""
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+
+# Cap concurrent Groq calls so request bursts don't trip provider rate limits.
+# This is the admission gate: callers that can't get a slot in time get a 429.
+# Inside the worker thread the generator also takes a permit from generator.llm_slots
+# (same LLM_MAX_CONCURRENCY), the process-wide cap that orchestrator and intent
+# classifier calls share. API calls alone never exceed it, so that second wait only
+# happens - in the thread, not on the loop - while those other callers hold permits.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+_llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+# Cap concurrent retrievals (embedding + vector search) so bursts don't fill the thread pool
+VSTORE_MAX_CONCURRENCY = int(os.getenv("VSTORE_MAX_CONCURRENCY", "16"))
+_vstore_semaphore = asyncio.Semaphore(VSTORE_MAX_CONCURRENCY)
+
+# LLM calls one /product-insight/batch request may have in flight. Kept well under
+# LLM_MAX_CONCURRENCY, so a 50-id batch neither waits out its own 429s nor takes
+# every slot from other clients.
+PRODUCT_INSIGHT_BATCH_CONCURRENCY = int(os.getenv("PRODUCT_INSIGHT_BATCH_CONCURRENCY", "2"))
+
+# How long a request waits for an LLM/retrieval slot before it is shed with a 429
+CONCURRENCY_WAIT_SECONDS = float(os.getenv("CONCURRENCY_WAIT_SECONDS", "10"))
+
+
+@asynccontextmanager
+async def _slot(semaphore: asyncio.Semaphore, backend: str):
+    """
+    Hold one of `semaphore`'s slots, or fail fast with 429 if none frees up.
+
+    WHY: Under a burst, waiting callers pile up behind the semaphore and time
+         out client-side anyway; a prompt 429 + Retry-After lets them back off.
+    """
+    try:
+        await asyncio.wait_for(semaphore.acquire(), CONCURRENCY_WAIT_SECONDS)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=429,
+            detail=f"{backend} is at capacity, retry shortly",
+            headers={"Retry-After": "1"},
+        ) from None
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+async def _run_generator(generate, **kwargs) -> dict:
+    """
+    Run a blocking generator call (sync Groq client) off the event loop.
+
+    WHY: Each call is a 1-3s HTTP round trip; run inline it stalls every other
+         request on this worker for that long.
+    """
+    async with _slot(_llm_semaphore, "LLM"):
+        with llm_generate_duration_seconds.time():
+            return await asyncio.to_thread(generate, **kwargs)
+
+
+async def _run_retrieval(retrieve, **kwargs) -> list[dict]:
+    """Run a blocking retrieval call (embedding + vector search) off the event loop."""
+    async with _slot(_vstore_semaphore, "Vector store"):
+        return await asyncio.to_thread(retrieve, **kwargs)
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable nginx buffering
+    "Content-Encoding": "identity",  # Keep GZipMiddleware from buffering events
+}
+
+
+def _sse(event: dict) -> bytes:
+    return b"data: " + orjson.dumps(event) + b"\n\n"
+
+
+def _stream_llm_events(
+    start: Callable[[], tuple[list[dict], Iterator[str]]],
+    format_sources: Optional[Callable[[list[dict]], list]] = None,
+) -> StreamingResponse:
+    """
+    SSE response for a token-streamed LLM answer.
+
+    `start` returns the context chunks and a blocking iterator of text deltas;
+    it is called inside the stream so setup failures become an "error" event.
+
+    EVENTS (same envelope as /ai/query/stream):
+    - "token": {"text": ...} answer deltas, in order
+    - "sources": format_sources(chunks), after the answer (skipped if None)
+    - "error": Error event if something fails
+    - "complete": Stream completion marker
+    """
+
+    async def event_generator():
+        start_time = time.time()
+        try:
+            chunks, deltas = start()
+
+            # Groq's stream is a blocking iterator; pull each delta in a worker thread
+            async with _slot(_llm_semaphore, "LLM"):
+                while (delta := await asyncio.to_thread(next, deltas, None)) is not None:
+                    yield _sse({"type": "token", "payload": {"text": delta}})
+
+            if format_sources is not None:
+                yield _sse({
+                    "type": "sources",
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "payload": format_sources(chunks),
+                })
+            yield _sse({
+                "type": "complete",
+                "timestamp": datetime.utcnow().isoformat(),
+                "elapsed_ms": int((time.time() - start_time) * 1000),
+            })
+
+        except Exception as e:
+            yield _sse({
+                "type": "error",
+                "timestamp": datetime.utcnow().isoformat(),
+                "payload": {"source": "stream", "error": str(e)},
+            })
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def _embed_for_cache(query: str) -> Optional[np.ndarray]:
+    """Embed a query for the semantic cache; None if embedding is unavailable."""
+    try:
+        return np.asarray(get_lazy_retrieval().embeddings.embed_text(query)[0], dtype=np.float32)
+    except Exception as e:
+        logger.debug(f"Semantic cache embedding skipped: {e}")
+        return None
+
+
+async def _embed_query(query: str) -> Optional[np.ndarray]:
+    """
+    Embed a query once for the semantic cache lookup and, on a miss, retrieval.
+
+    WHY: It is the same model forward pass retrieval would run, so it takes a
+         vector store slot and its result is handed to retrieve(query_vector=).
+    """
+    async with _slot(_vstore_semaphore, "Vector store"):
+        return await asyncio.to_thread(_embed_for_cache, query)
+
+
+async def _retrieve_for_query(request: QueryRequest, query_vector: Optional[np.ndarray] = None):
+    """Resolve the RAG singletons and retrieve context chunks for a /query request."""
+    # First use builds the models/clients, so resolve the singletons in threads too
+    retrieval, generator = await asyncio.gather(
+        asyncio.to_thread(get_lazy_retrieval), asyncio.to_thread(get_lazy_generator)
+    )
+
+    # Retrieve relevant context (embedding + vector search - blocking, keep off the event loop)
+    with rag_retrieve_duration_seconds.time():
+        if request.product_id:
+            chunks = await _run_retrieval(
+                retrieval.retrieve_for_product,
+                product_id=request.product_id,
+                query=request.query,
+                top_k=request.top_k,
+                query_vector=query_vector,
+            )
+        else:
+            chunks = await _run_retrieval(
+                retrieval.retrieve,
+                query=request.query,
+                top_k=request.top_k,
+                query_vector=query_vector,
+            )
+    return generator, chunks
 
 
 @app.post("/query", response_model=InsightResponse)
-async def query_insights(request: QueryRequest):
+async def query_insights(request: QueryRequest, stream: bool = False):
     """
     Query the RAG pipeline for insights.
 
     This endpoint:
-    1. Embeds the query using binary quantization
-    2. Retrieves top-k similar chunks using Hamming distance
-    3. Generates an insight using Groq LLM
-    """
-    retrieval = get_lazy_retrieval()
-    generator = get_lazy_generator()
+    1. Checks the semantic cache (exact match, then near-duplicate query)
+    2. Embeds the query (float32, same model as ingestion)
+    3. Retrieves top-k similar chunks from ChromaDB (HNSW + cosine), then reranks
+    4. Generates an insight using Groq LLM
 
-    # Retrieve relevant context
-    if request.product_id:
-        chunks = retrieval.retrieve_for_product(
-            product_id=request.product_id,
-            query=request.query,
-            top_k=request.top_k,
-        )
-    else:
-        chunks = retrieval.retrieve(
-            query=request.query,
-            top_k=request.top_k,
+    With ?stream=true the answer is sent as SSE "token" events while it is
+    generated (see _stream_llm_events). Streamed answers bypass the cache.
+    """
+    if stream:
+        generator, chunks = await _retrieve_for_query(request)
+        return _stream_llm_events(
+            lambda: (chunks, generator.stream(query=request.query, retrieved_chunks=chunks)),
+            format_sources=generator.format_sources if request.include_sources else None,
         )
 
+    cache = get_semantic_cache("query")
+    cache_scope = f"{request.product_id or ''}|{request.top_k}|{request.include_sources}"
+    cache_key = cache.make_key(request.query, cache_scope)
+    cached = cache.get_exact(cache_key)
+    if cached is not None:
+        return cached
+
+    query_embedding = await _embed_query(request.query)
+    if query_embedding is not None:
+        cached = cache.get_similar(query_embedding, cache_scope)
+        if cached is not None:
+            return cached
+
+    generator, chunks = await _retrieve_for_query(request, query_embedding)
+
     # Generate insight
-    result = generator.generate(
+    result = await _run_generator(
+        generator.generate,
         query=request.query,
         retrieved_chunks=chunks,
     )
@@ -389,20 +1008,55 @@ async def query_insights(request: QueryRequest):
     if not request.include_sources:
         result.pop("sources", None)
 
-    return InsightResponse(**result)
+    response = InsightResponse(**result)
+    if response.success:
+        cache.put(cache_key, query_embedding, cache_scope, response)
+    return response
+
+
+_PRODUCT_DETAIL_SELECT = f"{_PRODUCTS_PARAMS['select']},compliance:product_compliance({_COMPLIANCE_COLUMNS})"
+
+
+async def fetch_products_bulk(ids: list[str], fresh: bool = False) -> dict[str, dict]:
+    """
+    Fetch several products (with readiness/prediction/compliance) in one request.
+
+    WHY: One PostgREST `in.(...)` filter replaces N `eq.` round trips when a
+         dashboard asks about several products at once. Unknown ids are simply
+         absent from the result.
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    # Quote each id so commas/parentheses inside an id can't break the list syntax
+    id_list = ",".join(f'"{product_id}"' for product_id in unique_ids)
+    products = await fetch_from_supabase_cached(
+        "products", params={"id": f"in.({id_list})", "select": _PRODUCT_DETAIL_SELECT}, fresh=fresh
+    )
+    return {str(product["id"]): product for product in products}
 
 
 @app.post("/product-insight", response_model=InsightResponse)
-async def product_insight(request: ProductInsightRequest):
-    """Generate a specific type of insight for a product."""
+async def product_insight(request: ProductInsightRequest, cache_control: Optional[str] = Header(None)):
+    """
+    Generate a specific type of insight for a product.
+
+    Answers are cached per (product, insight type) in the semantic cache's
+    exact tier, and product data for SUPABASE_CACHE_TTL_SECONDS; send
+    `Cache-Control: no-cache` to regenerate from fresh data.
+    """
+    fresh = _no_cache(cache_control)
+    cache = get_semantic_cache("product_insight")
+    cache_key = cache.make_key(request.insight_type, request.product_id)
+    if not fresh:
+        cached = cache.get_exact(cache_key)
+        if cached is not None:
+            return cached
+
     try:
         # Fetch product data from Supabase
-        products = await fetch_from_supabase(
+        products = await fetch_from_supabase_cached(
             "products",
-            params={
-                "id": f"eq.{request.product_id}",
-                "select": "*,readiness:product_readiness(*),prediction:product_predictions(*),compliance:product_compliance(*)",
-            },
+            params={"id": f"eq.{request.product_id}", "select": _PRODUCT_DETAIL_SELECT},
+            fresh=fresh,
         )
 
         if not products:
@@ -412,29 +1066,97 @@ async def product_insight(request: ProductInsightRequest):
 
         # Generate insight
         generator = get_lazy_generator()
-        result = generator.generate_product_insight(
+        result = await _run_generator(
+            generator.generate_product_insight,
             product_data=product,
             insight_type=request.insight_type,
         )
 
-        return InsightResponse(**result)
+        response = InsightResponse(**result)
+        if response.success:
+            cache.put(cache_key, None, request.product_id, response)
+        return response
 
     except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch product: {str(e)}")
 
 
+@app.post("/product-insight/batch", response_model=dict[str, InsightResponse])
+async def product_insight_batch(
+    request: ProductInsightBatchRequest, cache_control: Optional[str] = Header(None)
+):
+    """
+    Generate the same insight type for several products.
+
+    Answers come from the /product-insight cache when present. The remaining
+    products are fetched in one Supabase request, and at most
+    PRODUCT_INSIGHT_BATCH_CONCURRENCY of their LLM calls run at once. Returns a
+    response per requested id; unknown ids get success=False.
+    """
+    fresh = _no_cache(cache_control)
+    cache = get_semantic_cache("product_insight")
+    responses = {
+        product_id: InsightResponse(success=False, error="Product not found")
+        for product_id in request.product_ids
+    }
+    missing = []
+    for product_id in responses:
+        cached = None if fresh else cache.get_exact(cache.make_key(request.insight_type, product_id))
+        if cached is not None:
+            responses[product_id] = cached
+        else:
+            missing.append(product_id)
+    if not missing:
+        return responses
+
+    try:
+        products = await fetch_products_bulk(missing, fresh=fresh)
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch products: {str(e)}")
+
+    generator = get_lazy_generator()
+    batch_slots = asyncio.Semaphore(PRODUCT_INSIGHT_BATCH_CONCURRENCY)
+
+    async def _generate(product_id: str) -> dict:
+        async with batch_slots:
+            return await _run_generator(
+                generator.generate_product_insight,
+                product_data=products[product_id],
+                insight_type=request.insight_type,
+            )
+
+    found = [product_id for product_id in missing if product_id in products]
+    results = await asyncio.gather(*(_generate(product_id) for product_id in found), return_exceptions=True)
+
+    for product_id, result in zip(found, results):
+        if isinstance(result, Exception):
+            responses[product_id] = InsightResponse(success=False, error=str(result))
+            continue
+        response = InsightResponse(**result)
+        if response.success:
+            cache.put(cache.make_key(request.insight_type, product_id), None, product_id, response)
+        responses[product_id] = response
+    return responses
+
+
 @app.post("/portfolio-insight", response_model=InsightResponse)
-async def portfolio_insight(request: PortfolioInsightRequest):
-    """Generate insights across the product portfolio."""
+async def portfolio_insight(request: PortfolioInsightRequest, cache_control: Optional[str] = Header(None)):
+    """
+    Generate insights across the product portfolio.
+
+    Send `Cache-Control: no-cache` to bypass the cached product list.
+    """
     try:
         # Fetch all products from Supabase
-        params = {"select": "*,readiness:product_readiness(*),prediction:product_predictions(*)"}
+        params = dict(_PORTFOLIO_PARAMS)
 
         if request.filters:
             for key, value in request.filters.items():
                 params[key] = f"eq.{value}"
 
-        products = await fetch_from_supabase("products", params=params)
+        products = await fetch_from_supabase_cached(
+            "products", params=params, fresh=_no_cache(cache_control)
+        )
 
         if not products:
             return InsightResponse(
@@ -444,7 +1166,8 @@ async def portfolio_insight(request: PortfolioInsightRequest):
 
         # Generate portfolio insight
         generator = get_lazy_generator()
-        result = generator.generate_portfolio_insight(
+        result = await _run_generator(
+            generator.generate_portfolio_insight,
             products=products,
             query=request.query,
         )
@@ -464,60 +1187,83 @@ async def ingest_data(request: IngestRequest, background_tasks: BackgroundTasks)
     - products: Fetch and ingest all product data from Supabase
     - feedback: Fetch and ingest all feedback data
     - documents: Ingest documents from the documents directory
-    """
-    loader = get_lazy_document_loader()
 
+    Loading/embedding is blocking (models + Chroma), so it runs in worker threads;
+    the first call also builds the document loader concurrently with the fetch.
+    """
     if request.source == "documents":
         # Ingest from local documents directory
-        count = loader.ingest_from_directory()
+        loader = await asyncio.to_thread(get_lazy_document_loader)
+        count = await asyncio.to_thread(loader.ingest_from_directory)
+        clear_semantic_caches()
         return {"success": True, "ingested": count, "source": "documents"}
 
     elif request.source == "products":
         try:
-            products = await fetch_from_supabase(
-                "products",
-                params={
-                    "select": "*,readiness:product_readiness(*),prediction:product_predictions(*),compliance:product_compliance(*)",
-                },
+            count = await _ingest_supabase_pages(
+                "products", {"select": _PRODUCT_DETAIL_SELECT}, "load_product_data"
             )
-
-            documents = loader.load_product_data(products)
-            count = loader.ingest_documents(documents)
+            clear_supabase_cache()
+            clear_semantic_caches()
 
             return {"success": True, "ingested": count, "source": "products"}
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to ingest products: {str(e)}")
 
-    elif request.source == "feedback":
+    else:  # feedback
         try:
             params = {"select": "*"}
             if request.product_id:
                 params["product_id"] = f"eq.{request.product_id}"
 
-            feedback = await fetch_from_supabase("product_feedback", params=params)
-
-            documents = loader.load_feedback_data(feedback)
-            count = loader.ingest_documents(documents)
+            count = await _ingest_supabase_pages("product_feedback", params, "load_feedback_data")
+            clear_supabase_cache()
+            clear_semantic_caches()
 
             return {"success": True, "ingested": count, "source": "feedback"}
 
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to ingest feedback: {str(e)}")
 
-    else:
-        raise HTTPException(status_code=400, detail=f"Unknown source: {request.source}")
 
+async def _ingest_supabase_pages(endpoint: str, params: dict, load: str) -> int:
+    """
+    Fetch a table page by page and embed + upsert each page as it arrives.
 
-@app.get("/stats")
-async def get_stats():
-    """Get statistics about the vector store."""
-    vs = get_lazy_vector_store()
+    WHY: Fetching the whole table first kept every row (and the documents built
+         from them) in memory at once, and nothing reached the store until the
+         full fetch finished. Pages bound memory by SUPABASE_PAGE_SIZE, and the
+         next page is prefetched while the current one is embedded. The loader
+         is built alongside the first fetch.
 
-    return {
-        "total_vectors": vs.count(),
-        "collection": vs.collection_name,
-    }
+    `load` names the DocumentLoader method that turns rows into documents.
+    """
+    count = 0
+    pages = fetch_from_supabase_paged(endpoint, params, prefetch=True)
+    loader_task = asyncio.create_task(asyncio.to_thread(get_lazy_document_loader))
+    try:
+        async for rows in pages:
+            loader = await loader_task
+            documents = await asyncio.to_thread(getattr(loader, load), rows)
+            count += await asyncio.to_thread(loader.ingest_documents, documents)
+    finally:
+        # Cancels a prefetch still in flight if ingest failed part-way
+        await pages.aclose()
+        loader_task.cancel()
+        await asyncio.gather(loader_task, return_exceptions=True)
+    return count
+
+
+@app.get("/stats")
+async def get_stats(request: Request):
+    """Get statistics about the vector store."""
+    vs, vector_count = await _vector_store_and_count()
+
+    return _etag_response(request, {
+        "total_vectors": vector_count,
+        "collection": vs.collection_name,
+    })
 
 
 @app.get("/api/reports/executive-summary", tags=["reports"], summary="Executive Summary Dashboard")
@@ -534,7 +1280,7 @@ async def get_executive_summary():
 
         # Get all products with readiness
         products_response = supabase.table("products").select(
-            "*, product_readiness(risk_band, readiness_score)"
+            "lifecycle_stage, revenue_target, launch_date, product_readiness(risk_band, readiness_score)"
         ).execute()
 
         products = products_response.data if products_response.data else []
@@ -639,69 +1385,215 @@ async def get_executive_summary():
         }
 
 
-# In-memory job status tracking (use Redis in production)
-_job_status: dict = {}
+# Job status tracking - Redis when REDIS_URL is set (shared across workers), else in-memory
+from ai_insights.utils.job_store import close_job_store, get_job_store
+
+job_store = get_job_store()
+
+# Background jobs (syncs, uploads, ingestion) run on a bounded worker pool (started in
+# lifespan) instead of BackgroundTasks
+from ai_insights.utils.job_queue import get_job_queue
+
+job_queue = get_job_queue()
+JOB_QUEUE_RETRY_AFTER_SECONDS = 30
+
+# CSV_INGEST_QUEUE=arq hands Jira CSV ingestion to out-of-process arq workers
+# (`arq worker.WorkerSettings`), so embedding large exports never competes with
+# request handling on the API workers. Needs REDIS_URL (arq + job status) and a
+# CSV_SPOOL_DIR volume shared with the workers.
+CSV_INGEST_QUEUE = os.getenv("CSV_INGEST_QUEUE", "local").lower()
+CSV_SPOOL_DIR = os.getenv("CSV_SPOOL_DIR") or None
+
+# Workers must write to the index this API reads. The vector store is a
+# chromadb.PersistentClient on local disk, and each process holds its own copy of
+# the index, so a worker's writes never reach the API - not even on the same host
+# and Chroma directory. Until the vector store is networked, CSV_INGEST_QUEUE=arq
+# is refused and CSVs are ingested in-process.
+VECTOR_STORE_SHARED_WITH_WORKERS = False
+
+# Out-of-process ingesters publish here once new data is stored; every API process
+# clears its answer caches on each message (clearing in the worker would be a no-op)
+CACHE_INVALIDATION_CHANNEL = "semantic-cache:invalidate"
+
+
+async def _open_arq_pool():
+    """Connect to the arq queue when CSV_INGEST_QUEUE=arq, else None (local job queue)."""
+    if CSV_INGEST_QUEUE != "arq":
+        return None
+    if not VECTOR_STORE_SHARED_WITH_WORKERS:
+        logger.warning(
+            "CSV_INGEST_QUEUE=arq needs a vector store shared with the workers - ingesting CSVs in-process"
+        )
+        return None
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        logger.warning("CSV_INGEST_QUEUE=arq without REDIS_URL - ingesting CSVs in-process")
+        return None
+    try:
+        from arq import create_pool
+        from arq.connections import RedisSettings
+    except ImportError:
+        logger.warning("CSV_INGEST_QUEUE=arq but arq is not installed - ingesting CSVs in-process")
+        return None
+    return await create_pool(RedisSettings.from_dsn(redis_url))
+
+
+async def _listen_for_cache_invalidation(redis) -> None:
+    """Clear this process's semantic caches whenever an arq worker stores new data."""
+    pubsub = redis.pubsub()
+    await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+    try:
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                clear_semantic_caches()
+    finally:
+        await pubsub.reset()
+
+
+async def _enqueue_job(job_id: str, background_tasks: BackgroundTasks, job) -> None:
+    """
+    Hand a job to the worker pool, or to BackgroundTasks when the pool isn't running
+    (e.g. the app was mounted without its lifespan).
+
+    Raises a 503 with Retry-After when the queue is full.
+    """
+    if not job_queue.running:
+        background_tasks.add_task(job)
+        return
+    try:
+        job_queue.submit(job)
+    except asyncio.QueueFull:
+        await job_store.update(job_id, status="rejected", error="Job queue full")
+        raise HTTPException(
+            status_code=503,
+            detail="Job queue is full, retry later",
+            headers={"Retry-After": str(JOB_QUEUE_RETRY_AFTER_SECONDS)},
+        )
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    JSON response rendered with orjson, for hot endpoints that return plain dicts.
+
+    WHY: Status endpoints are polled every second or so and /ai/query returns
+         large nested dicts; orjson renders these several times faster than
+         the stdlib encoder. Endpoints with a response_model don't need this -
+         FastAPI already serializes those straight to JSON bytes via Pydantic,
+         which is also why this isn't the app-wide default_response_class
+         (a custom default disables that fast path).
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
 
 # Webhook debouncing - prevent rapid re-syncs
 _last_webhook_sync: float = 0
-_webhook_sync_cooldown: int = 60  # Minimum seconds between webhook syncs
-_webhook_sync_in_progress: bool = False
+_webhook_sync_cooldown: int = 60  # Minimum seconds between webhook sync starts
+_webhook_lock = asyncio.Lock()  # Held for the whole sync run; coalesces overlapping triggers
+_last_webhook_done: float = 0.0
+WEBHOOK_DEBOUNCE_SECONDS = 10  # Minimum seconds after a sync finishes before the next may start
 
 
-def process_jira_csv_background(job_id: str, csv_text: str, filename: str):
-    """Background task to process Jira CSV."""
-    from ai_insights.utils.jira_parser import get_ingestion_summary, parse_jira_csv
+# CSV parsing is pure-Python and holds the GIL, so threads can't run it alongside
+# request handling. Parse in a small process pool instead (0 = parse in a thread).
+CSV_PARSE_WORKERS = int(os.getenv("CSV_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+_csv_pool: Optional[ProcessPoolExecutor] = None
 
-    try:
-        _job_status[job_id] = {"status": "parsing", "progress": 0}
 
-        # Parse CSV
-        documents = parse_jira_csv(csv_text)
+def _get_csv_pool() -> Optional[ProcessPoolExecutor]:
+    """Get or create the CSV parse process pool (None when disabled)."""
+    global _csv_pool
+    if _csv_pool is None and CSV_PARSE_WORKERS > 0:
+        # spawn, not fork: forking a process that already runs threads can deadlock
+        _csv_pool = ProcessPoolExecutor(
+            max_workers=CSV_PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _csv_pool
 
-        if not documents:
-            _job_status[job_id] = {"status": "failed", "error": "No valid tickets found"}
-            return
 
-        _job_status[job_id] = {
-            "status": "processing",
-            "progress": 20,
-            "total_tickets": len(documents),
-        }
+# Parsed tickets are embedded and written to the vector store this many at a time
+CSV_INGEST_BATCH_SIZE = 256
 
-        # Get summary
-        summary = get_ingestion_summary(documents)
 
-        _job_status[job_id]["progress"] = 40
-        _job_status[job_id]["summary"] = summary
+async def process_jira_csv_background(
+    job_id: str,
+    csv_path: str,
+    filename: str,
+    invalidate_caches: Optional[Callable[[], Awaitable[None]]] = None,
+):
+    """
+    Background task to process Jira CSV spooled to `csv_path` (deleted once read).
 
-        # Ingest into vector store
-        loader = get_lazy_document_loader()
+    `invalidate_caches` replaces the in-process cache clear after ingest; arq
+    workers pass one that notifies the API processes, whose caches they can't reach.
+    """
+    from ai_insights.utils.jira_parser import parse_jira_csv_file
 
-        loader_docs = []
-        for doc in documents:
-            loader_docs.append(
-                {
-                    "id": doc["id"],
-                    "text": doc["text"],
-                    "metadata": doc["metadata"],
-                }
-            )
+    try:
+        await job_store.set(job_id, {"status": "parsing", "progress": 0})
 
-        _job_status[job_id]["status"] = "ingesting"
-        _job_status[job_id]["progress"] = 60
+        # Decode + parse + summarize in the CSV pool (default thread pool if disabled)
+        loop = asyncio.get_running_loop()
+        documents, summary = await loop.run_in_executor(_get_csv_pool(), parse_jira_csv_file, csv_path)
 
-        count = loader.ingest_documents(loader_docs)
+        if not documents:
+            await job_store.set(job_id, {"status": "failed", "error": "No valid tickets found"})
+            return
 
-        _job_status[job_id] = {
+        await job_store.set(job_id, {
+            "status": "processing",
+            "progress": 40,
+            "total_tickets": len(documents),
+            "summary": summary,
+        })
+
+        # Ingest into vector store (parsed tickets are already id/text/metadata records)
+        loader = await asyncio.to_thread(get_lazy_document_loader)
+
+        await job_store.update(job_id, status="ingesting", progress=60)
+
+        # Embed + upsert in batches so chunk/embedding arrays stay bounded for big exports,
+        # and report progress between batches
+        count = 0
+        total = len(documents)
+        for start in range(0, total, CSV_INGEST_BATCH_SIZE):
+            batch = documents[start : start + CSV_INGEST_BATCH_SIZE]
+            count += await asyncio.to_thread(loader.ingest_records, batch)
+            done = start + len(batch)
+            if done < total:
+                await job_store.update(job_id, progress=60 + 40 * done // total, ingested=count)
+
+        # Cached answers predate these tickets
+        if invalidate_caches is None:
+            clear_semantic_caches()
+        else:
+            await invalidate_caches()
+        await job_store.set(job_id, {
             "status": "completed",
             "progress": 100,
             "filename": filename,
             "ingested": count,
             "summary": summary,
-        }
+        })
 
     except Exception as e:
-        _job_status[job_id] = {"status": "failed", "error": str(e)}
+        await job_store.set(job_id, {"status": "failed", "error": str(e)})
+    finally:
+        # parse_jira_csv_file removes the spool itself; this covers failures before it ran
+        try:
+            os.unlink(csv_path)
+        except OSError:
+            pass
+
+
+# Uploads are read/hashed in 64KB chunks so large CSVs never sit fully in memory on the request path
+CSV_UPLOAD_CHUNK_SIZE = 1 << 16
+CSV_HEADER_SNIFF_BYTES = 4096
+CSV_CONTENT_TYPES = ("text/csv", "application/csv", "application/vnd.ms-excel")
+
+# Upload jobs in these states are still running; a re-upload joins them instead of re-queueing
+UPLOAD_IN_FLIGHT_STATUSES = ("queued", "parsing", "processing", "ingesting")
+_upload_locks: dict[str, asyncio.Lock] = {}
 
 
 @app.post("/upload/jira-csv")
@@ -711,37 +1603,86 @@ async def upload_jira_csv(file: UploadFile = File(...), background_tasks: Backgr
 
     Returns a job_id immediately. Poll /upload/status/{job_id} for progress.
     """
-    if not file.filename.endswith(".csv"):
+    if (
+        not (file.filename or "").lower().endswith(".csv")
+        and (file.content_type or "").split(";")[0].strip() not in CSV_CONTENT_TYPES
+    ):
         raise HTTPException(status_code=400, detail="File must be a CSV")
 
+    csv_path = None
     try:
-        # Read file content
-        content = await file.read()
-        csv_text = content.decode("utf-8")
-
-        # Quick validation - just check if it parses
-        import hashlib
-
-        job_id = hashlib.md5(f"{file.filename}_{len(csv_text)}".encode()).hexdigest()[:12]
-
-        # Check if same job already running
-        if job_id in _job_status and _job_status[job_id].get("status") in [
-            "parsing",
-            "processing",
-            "ingesting",
-        ]:
-            return {
-                "success": True,
-                "job_id": job_id,
-                "status": "already_processing",
-                "message": "This file is already being processed",
-            }
-
-        # Initialize job status
-        _job_status[job_id] = {"status": "queued", "progress": 0}
+        # UTF-8 is validated incrementally; the full decode happens in the worker
+        decoder = codecs.getincrementaldecoder("utf-8")()
+
+        # Cheap shape check on the first few KB before spooling anything to disk:
+        # a Jira export starts with a comma-separated header row
+        head = await file.read(CSV_HEADER_SNIFF_BYTES)
+        decoder.decode(head)
+        if b"," not in head.split(b"\n", 1)[0]:
+            raise HTTPException(status_code=400, detail="File does not look like a CSV (missing header row)")
+
+        # Stream the upload to disk in chunks, hashing the raw bytes as we go
+        hasher = hashlib.blake2b(head, digest_size=16)
+        fd, csv_path = tempfile.mkstemp(suffix=".csv", dir=CSV_SPOOL_DIR)
+        os.close(fd)
+        # anyio runs each disk write in a worker thread so a slow disk can't stall the loop
+        async with await anyio.open_file(csv_path, "wb") as tmp:
+            await tmp.write(head)
+            while chunk := await file.read(CSV_UPLOAD_CHUNK_SIZE):
+                decoder.decode(chunk)
+                hasher.update(chunk)
+                await tmp.write(chunk)
+        decoder.decode(b"", final=True)
+
+        job_id = hasher.hexdigest()[:12]
+
+        # Check if same job already running. The check and the "queued" write are one
+        # critical section per job_id, so a double-submitted upload can't pass it twice.
+        lock = _upload_locks.setdefault(job_id, asyncio.Lock())
+        try:
+            async with lock:
+                if await job_store.get_status(job_id) in UPLOAD_IN_FLIGHT_STATUSES:
+                    os.unlink(csv_path)
+                    return {
+                        "success": True,
+                        "job_id": job_id,
+                        "status": "already_processing",
+                        "message": "This file is already being processed",
+                    }
 
-        # Queue background processing
-        background_tasks.add_task(process_jira_csv_background, job_id, csv_text, file.filename)
+                # Initialize job status
+                await job_store.set(job_id, {"status": "queued", "progress": 0})
+        finally:
+            # Once "queued" is written the status itself guards later duplicates
+            _upload_locks.pop(job_id, None)
+
+        arq = getattr(app.state, "arq", None)
+        if arq is not None:
+            # Out-of-process worker; progress still lands in the shared job store.
+            # arq's own job id dedupes a retry that races the status check above
+            # (workers keep no results, so a finished job never blocks a re-upload).
+            try:
+                queued = await arq.enqueue_job(
+                    "process_jira_csv_task", job_id, csv_path, file.filename, _job_id=f"jira-csv:{job_id}"
+                )
+            except Exception as e:
+                await job_store.set(job_id, {"status": "failed", "error": f"Could not queue CSV: {e}"})
+                raise HTTPException(
+                    status_code=503,
+                    detail="CSV ingest queue unavailable, retry later",
+                    headers={"Retry-After": str(JOB_QUEUE_RETRY_AFTER_SECONDS)},
+                ) from None
+            if queued is None:
+                # arq already holds a job with this id, so this upload will never run
+                await job_store.set(job_id, {"status": "failed", "error": "Duplicate of a queued job"})
+                raise HTTPException(status_code=409, detail="This file is already queued for processing")
+        else:
+            # Queue on the worker pool (bounded, unlike BackgroundTasks)
+            await _enqueue_job(
+                job_id,
+                background_tasks,
+                functools.partial(process_jira_csv_background, job_id, csv_path, file.filename),
+            )
 
         return {
             "success": True,
@@ -750,19 +1691,42 @@ async def upload_jira_csv(file: UploadFile = File(...), background_tasks: Backgr
             "message": "CSV upload queued for processing. Poll /upload/status/{job_id} for progress.",
         }
 
+    except HTTPException:
+        _discard_upload(csv_path)
+        raise
     except UnicodeDecodeError:
+        _discard_upload(csv_path)
         raise HTTPException(status_code=400, detail="Invalid CSV encoding. Please use UTF-8.")
     except Exception as e:
+        _discard_upload(csv_path)
         raise HTTPException(status_code=500, detail=f"Failed to queue CSV: {str(e)}")
 
 
-@app.get("/upload/status/{job_id}")
-async def get_upload_status(job_id: str):
-    """Get the status of a CSV upload job."""
-    if job_id not in _job_status:
+def _discard_upload(path: Optional[str]) -> None:
+    """Best-effort removal of a spooled upload that won't be processed."""
+    if path:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+@app.get("/jobs/{job_id}", response_class=OrjsonResponse)
+@app.get("/upload/status/{job_id}", response_class=OrjsonResponse)
+@app.get("/cognee/ingest/status/{job_id}", response_class=OrjsonResponse)
+@app.get("/api/sync/status/{job_id}", response_class=OrjsonResponse)
+async def get_job_status(job_id: str):
+    """
+    Get the status of a background job (upload, Cognee ingestion, sync).
+
+    All jobs share job_store, so the older per-feature status paths are
+    aliases of /jobs/{job_id}.
+    """
+    status = await job_store.get(job_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    return _job_status[job_id]
+    return status
 
 
 # ============================================================================
@@ -838,7 +1802,7 @@ async def process_document_background(job_id: str, file_content: bytes, filename
     from pathlib import Path
     
     try:
-        _job_status[job_id] = {"status": "parsing", "progress": 10, "filename": filename, "product_id": product_id}
+        await job_store.set(job_id, {"status": "parsing", "progress": 10, "filename": filename, "product_id": product_id})
         
         # Save to temp file for LlamaIndex to read
         file_ext = Path(filename).suffix.lower()
@@ -851,8 +1815,7 @@ async def process_document_background(job_id: str, file_content: bytes, filename
         
         try:
             # Step 1: Parse document with LlamaIndex
-            _job_status[job_id]["status"] = "extracting_text"
-            _job_status[job_id]["progress"] = 20
+            await job_store.update(job_id, status="extracting_text", progress=20)
             
             from llama_index.core import SimpleDirectoryReader
             
@@ -861,10 +1824,10 @@ async def process_document_background(job_id: str, file_content: bytes, filename
             documents = reader.load_data()
             
             if not documents:
-                _job_status[job_id] = {
+                await job_store.set(job_id, {
                     "status": "failed", 
                     "error": "Could not extract text from document. File may be empty or corrupted."
-                }
+                })
                 return
             
             # Combine all document text
@@ -872,8 +1835,7 @@ async def process_document_background(job_id: str, file_content: bytes, filename
             
             # If text extraction yielded very little, try OCR for PDFs
             if len(full_text.strip()) < 50 and file_ext == ".pdf":
-                _job_status[job_id]["status"] = "applying_ocr"
-                _job_status[job_id]["progress"] = 25
+                await job_store.update(job_id, status="applying_ocr", progress=25)
                 logger.info(f"Low text extraction ({len(full_text)} chars), attempting OCR...")
                 
                 ocr_text, ocr_conf = perform_ocr_on_pdf(tmp_path)
@@ -882,34 +1844,31 @@ async def process_document_background(job_id: str, file_content: bytes, filename
                     full_text = ocr_text
                     ocr_applied = True
                     ocr_confidence = ocr_conf
-                    _job_status[job_id]["ocr_applied"] = True
-                    _job_status[job_id]["ocr_confidence"] = ocr_conf
+                    await job_store.update(job_id, ocr_applied=True, ocr_confidence=ocr_conf)
                     logger.info(f"OCR successful: {len(full_text)} chars at {ocr_conf*100:.1f}% confidence")
                     
                     # Create a document from OCR text for downstream processing
                     from llama_index.core import Document
                     documents = [Document(text=full_text, metadata={"source": "ocr", "filename": filename})]
                 else:
-                    _job_status[job_id] = {
+                    await job_store.set(job_id, {
                         "status": "failed",
                         "error": "Document appears to be a scanned image. OCR could not extract readable text. Try a higher quality scan or a native PDF."
-                    }
+                    })
                     return
             elif len(full_text.strip()) < 50:
-                _job_status[job_id] = {
+                await job_store.set(job_id, {
                     "status": "failed",
                     "error": "Document contains very little text. Is it a scanned image? (OCR only available for PDFs)"
-                }
+                })
                 return
             
-            _job_status[job_id]["progress"] = 30
-            _job_status[job_id]["extracted_chars"] = len(full_text)
+            await job_store.update(job_id, progress=30, extracted_chars=len(full_text))
             
             # Step 2: Ingest into ChromaDB
-            _job_status[job_id]["status"] = "ingesting_chromadb"
-            _job_status[job_id]["progress"] = 40
+            await job_store.update(job_id, status="ingesting_chromadb", progress=40)
             
-            loader = get_lazy_document_loader()
+            loader = await asyncio.to_thread(get_lazy_document_loader)
             
             # Add metadata for better search attribution
             for doc in documents:
@@ -922,22 +1881,19 @@ async def process_document_background(job_id: str, file_content: bytes, filename
                 if product_name:
                     doc.metadata["product_name"] = product_name
             
-            chroma_count = loader.ingest_documents(documents)
-            _job_status[job_id]["chroma_ingested"] = chroma_count
-            _job_status[job_id]["progress"] = 60
+            # Embedding + upsert is blocking - run off the event loop
+            chroma_count = await asyncio.to_thread(loader.ingest_documents, documents)
+            await job_store.update(job_id, chroma_ingested=chroma_count, progress=60)
             
             # Step 3: Ingest into Cognee (knowledge graph)
             # NOTE: cognify() is DISABLED for document uploads - it's too heavy for web process
             # and causes 30-min timeout on Render. Data is still added to Cognee and will be
             # processed when the next webhook triggers cognify(), or via manual sync.
-            _job_status[job_id]["status"] = "ingesting_cognee"
-            _job_status[job_id]["progress"] = 70
+            await job_store.update(job_id, status="ingesting_cognee", progress=70)
             
             cognee_success = False
             try:
-                from ai_insights.cognee import get_cognee_lazy_loader
-                cognee_loader = get_cognee_lazy_loader()
-                client = await cognee_loader.get_client()
+                client = await _get_cognee()
                 
                 if client:
                     # Format document as natural text for better knowledge extraction
@@ -969,18 +1925,20 @@ Character Count: {len(full_text)}{' (truncated for processing)' if truncated els
                     # SKIP cognify() - too heavy for web process, causes Render timeout
                     # Knowledge graph relationships will be built on next webhook sync
                     # or via manual /api/sync/ingest endpoint
-                    _job_status[job_id]["progress"] = 85
+                    await job_store.update(job_id, progress=85)
                     
                     cognee_success = True
-                    _job_status[job_id]["cognee_ingested"] = True
-                    _job_status[job_id]["cognee_note"] = "Added to knowledge base. Relationships will build on next sync."
+                    await job_store.update(
+                        job_id,
+                        cognee_ingested=True,
+                        cognee_note="Added to knowledge base. Relationships will build on next sync.",
+                    )
             except Exception as cognee_error:
                 logger.warning(f"Cognee ingestion failed (non-fatal): {cognee_error}")
-                _job_status[job_id]["cognee_error"] = str(cognee_error)
+                await job_store.update(job_id, cognee_error=str(cognee_error))
             
             # Step 4: Upload to Supabase Storage (private folder)
-            _job_status[job_id]["status"] = "uploading_storage"
-            _job_status[job_id]["progress"] = 90
+            await job_store.update(job_id, status="uploading_storage", progress=90)
             
             storage_url = None
             storage_error = None
@@ -1044,8 +2002,9 @@ Character Count: {len(full_text)}{' (truncated for processing)' if truncated els
                 storage_error = "Supabase not configured"
             
             # Complete!
+            clear_semantic_caches()  # Cached answers predate this document
             ocr_msg = f" (OCR applied at {ocr_confidence*100:.0f}% confidence)" if ocr_applied else ""
-            _job_status[job_id] = {
+            await job_store.set(job_id, {
                 "status": "completed",
                 "progress": 100,
                 "filename": filename,
@@ -1060,7 +2019,7 @@ Character Count: {len(full_text)}{' (truncated for processing)' if truncated els
                 "storage_url": storage_url,
                 "storage_error": storage_error,
                 "message": f"Successfully ingested '{filename}'{ocr_msg} - {chroma_count} chunks to RAG" + (", added to knowledge base (relationships build on next sync)" if cognee_success else "") + (", stored in Supabase" if storage_url else "")
-            }
+            })
             
         finally:
             # Clean up temp file
@@ -1071,7 +2030,7 @@ Character Count: {len(full_text)}{' (truncated for processing)' if truncated els
                 
     except Exception as e:
         logger.error(f"Document processing failed: {e}")
-        _job_status[job_id] = {"status": "failed", "error": str(e), "filename": filename}
+        await job_store.set(job_id, {"status": "failed", "error": str(e), "filename": filename})
 
 
 @app.post("/upload/document", tags=["upload"], summary="Upload Document",
@@ -1091,7 +2050,6 @@ async def upload_document(
     - Returns job_id immediately. Poll /upload/status/{job_id} for progress.
     - Document is ingested into both ChromaDB (RAG) and Cognee (knowledge graph).
     """
-    import hashlib
     from pathlib import Path
     
     # Validate file extension
@@ -1115,11 +2073,15 @@ async def upload_document(
     if file_size == 0:
         raise HTTPException(status_code=400, detail="File is empty")
     
-    # Generate job ID
-    job_id = hashlib.md5(f"{file.filename}_{file_size}_{datetime.now().isoformat()}".encode()).hexdigest()[:12]
+    # Content-addressed job ID, so re-uploading the same document for the same
+    # product while it's still being processed is caught by the check below
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{file.filename}\x00{product_id or ''}\x00".encode())
+    hasher.update(content)
+    job_id = hasher.hexdigest()[:12]
     
     # Check if already processing
-    if job_id in _job_status and _job_status[job_id].get("status") in ["parsing", "extracting_text", "ingesting_chromadb", "ingesting_cognee", "building_knowledge"]:
+    if await job_store.get_status(job_id) in ["parsing", "extracting_text", "ingesting_chromadb", "ingesting_cognee", "building_knowledge"]:
         return {
             "success": True,
             "job_id": job_id,
@@ -1128,10 +2090,14 @@ async def upload_document(
         }
     
     # Initialize job
-    _job_status[job_id] = {"status": "queued", "progress": 0, "filename": file.filename, "product_id": product_id}
+    await job_store.set(job_id, {"status": "queued", "progress": 0, "filename": file.filename, "product_id": product_id})
     
-    # Queue background processing
-    background_tasks.add_task(process_document_background, job_id, content, file.filename, product_id, product_name)
+    # Queue on the worker pool (bounded, unlike BackgroundTasks)
+    await _enqueue_job(
+        job_id,
+        background_tasks,
+        functools.partial(process_document_background, job_id, content, file.filename, product_id, product_name),
+    )
     
     return {
         "success": True,
@@ -1167,7 +2133,7 @@ class UnifiedQueryResponse(BaseModel):
     error: Optional[str] = None
 
 
-@app.post("/ai/query", tags=["ai"], summary="Unified AI Query",
+@app.post("/ai/query", tags=["ai"], summary="Unified AI Query", response_class=OrjsonResponse,
           description="Production-grade AI query with hybrid intent classification, entity validation, and confidence scoring.")
 async def unified_query_v2(request: UnifiedQueryRequest):
     """
@@ -1197,36 +2163,50 @@ async def unified_query_v2(request: UnifiedQueryRequest):
         from ai_insights.models import UnifiedAIResponse
         from ai_insights.orchestration import get_production_orchestrator
 
+        # Semantic cache: skip orchestration (and its LLM calls) for repeated queries
+        cache = get_semantic_cache("ai_query")
+        cache_scope = (
+            orjson.dumps(request.context, option=orjson.OPT_SORT_KEYS, default=str).decode()
+            if request.context else ""
+        )
+        cache_key = cache.make_key(request.query, cache_scope)
+        cached = cache.get_exact(cache_key)
+        if cached is not None:
+            return OrjsonResponse(cached)
+
+        query_embedding = await _embed_query(request.query)
+        if query_embedding is not None:
+            cached = cache.get_similar(query_embedding, cache_scope)
+            if cached is not None:
+                return OrjsonResponse(cached)
+
         orchestrator = get_production_orchestrator()
-        result = await orchestrator.orchestrate(request.query, request.context)
+        result = await orchestrator.orchestrate(
+            request.query, request.context, query_vector=query_embedding
+        )
 
-        # Result is already UnifiedAIResponse, return with JSON-compatible types
-        response_dict = result.dict()
-        # Convert datetime to ISO string for JSON serialization
-        if isinstance(response_dict.get("timestamp"), datetime):
-            response_dict["timestamp"] = response_dict["timestamp"].isoformat()
-        return response_dict
+        # mode="json" serializes in pydantic-core (datetimes/enums to JSON types) and
+        # exclude_none drops the unset optional fields instead of sending nulls
+        response_dict = result.model_dump(mode="json", exclude_none=True)
+        if response_dict.get("success") and not response_dict.get("error"):
+            cache.put(cache_key, query_embedding, cache_scope, response_dict)
+        return OrjsonResponse(response_dict)
 
+    except HTTPException:
+        raise  # Shed with 429 when no vector store slot frees up, as /query does
     except Exception as e:
         from ai_insights.models import UnifiedAIResponse
 
         error_response = UnifiedAIResponse.create_error_response(
             query=request.query, error_message=f"Orchestration failed: {str(e)}"
         )
-        response_dict = error_response.dict()
-        # Convert datetime to ISO string for JSON serialization
-        if isinstance(response_dict.get("timestamp"), datetime):
-            response_dict["timestamp"] = response_dict["timestamp"].isoformat()
-        return response_dict
+        return OrjsonResponse(error_response.model_dump(mode="json", exclude_none=True))
 
 
 # ============================================================================
 # SSE STREAMING ENDPOINT - Race-Loop Pattern
 # ============================================================================
 
-from fastapi.responses import StreamingResponse
-import json
-
 
 class StreamQueryRequest(BaseModel):
     query: str
@@ -1272,11 +2252,9 @@ async def unified_query_stream(request: StreamQueryRequest):
     """
     async def event_generator():
         """Generate SSE events as each layer completes."""
-        import time
         start_time = time.time()
         
         try:
-            from ai_insights.cognee import get_cognee_lazy_loader
             from ai_insights.orchestration.intent_classifier import get_intent_classifier
             from ai_insights.retrieval import get_retrieval_pipeline
             from ai_insights.utils import get_generator
@@ -1284,7 +2262,10 @@ async def unified_query_stream(request: StreamQueryRequest):
             
             # Step 1: Intent Classification (fast, always first)
             intent_classifier = get_intent_classifier()
-            intent, intent_confidence, intent_reasoning = intent_classifier.classify(request.query)
+            # The LLM fallback is a blocking Groq call - keep it off the event loop
+            intent, intent_confidence, intent_reasoning = await asyncio.to_thread(
+                intent_classifier.classify, request.query
+            )
             
             intent_event = {
                 "type": "intent",
@@ -1295,10 +2276,10 @@ async def unified_query_stream(request: StreamQueryRequest):
                     "reasoning": intent_reasoning,
                 }
             }
-            yield f"data: {json.dumps(intent_event)}\n\n"
+            yield _sse(intent_event)
             
             # Step 2: Launch parallel queries using race-loop pattern
-            cognee_loader = get_cognee_lazy_loader()
+            cognee_loader = get_lazy_cognee_loader()
             retrieval = get_retrieval_pipeline()
             generator = get_generator()
             
@@ -1310,11 +2291,11 @@ async def unified_query_stream(request: StreamQueryRequest):
             
             # RAG needs to run in thread since it's sync
             async def run_rag():
-                chunks = await asyncio.to_thread(
-                    retrieval.retrieve, request.query, top_k=5
+                chunks = await _run_retrieval(
+                    retrieval.retrieve, query=request.query, top_k=5
                 )
-                answer_result = await asyncio.to_thread(
-                    generator.generate, request.query, chunks
+                answer_result = await _run_generator(
+                    generator.generate, query=request.query, retrieved_chunks=chunks
                 )
                 return {"chunks": chunks, "answer": answer_result}
             
@@ -1360,7 +2341,7 @@ async def unified_query_stream(request: StreamQueryRequest):
                                         ]
                                     }
                                 }
-                                yield f"data: {json.dumps(cognee_event)}\n\n"
+                                yield _sse(cognee_event)
                         
                         elif task_name == "rag":
                             # Validate RAG result using schema
@@ -1385,7 +2366,7 @@ async def unified_query_stream(request: StreamQueryRequest):
                                         ]
                                     }
                                 }
-                                yield f"data: {json.dumps(rag_event)}\n\n"
+                                yield _sse(rag_event)
                     
                     except Exception as task_error:
                         error_event = {
@@ -1397,7 +2378,7 @@ async def unified_query_stream(request: StreamQueryRequest):
                                 "error": str(task_error),
                             }
                         }
-                        yield f"data: {json.dumps(error_event)}\n\n"
+                        yield _sse(error_event)
             
             # Step 3: Merge results and yield final answer
             elapsed = time.time() - start_time
@@ -1454,7 +2435,7 @@ async def unified_query_stream(request: StreamQueryRequest):
                     }
                 }
             }
-            yield f"data: {json.dumps(merged_event)}\n\n"
+            yield _sse(merged_event)
             
             # Final completion event
             complete_event = {
@@ -1462,7 +2443,7 @@ async def unified_query_stream(request: StreamQueryRequest):
                 "timestamp": datetime.utcnow().isoformat(),
                 "elapsed_ms": int(elapsed * 1000),
             }
-            yield f"data: {json.dumps(complete_event)}\n\n"
+            yield _sse(complete_event)
             
         except Exception as e:
             error_event = {
@@ -1473,16 +2454,48 @@ async def unified_query_stream(request: StreamQueryRequest):
                     "error": str(e),
                 }
             }
-            yield f"data: {json.dumps(error_event)}\n\n"
+            yield _sse(error_event)
     
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",  # Disable nginx buffering
-        }
+    return StreamingResponse(event_generator(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.post("/portfolio-insight/stream", tags=["ai"], summary="Streaming Portfolio Insight (SSE)",
+          description="Stream a portfolio insight token by token using Server-Sent Events.")
+async def portfolio_insight_stream(
+    request: PortfolioInsightRequest, cache_control: Optional[str] = Header(None)
+):
+    """
+    Streaming variant of /portfolio-insight.
+
+    WHY: The LLM answer is the slow part of a portfolio insight; streaming it
+         as it's generated puts the first words on screen in a few hundred ms
+         instead of after the full completion.
+
+    EVENTS (same envelope as /ai/query/stream):
+    - "token": {"text": ...} answer deltas, in order
+    - "sources": Products used as context (after the answer)
+    - "error": Error event if something fails
+    - "complete": Stream completion marker
+    """
+    params = dict(_PORTFOLIO_PARAMS)
+    if request.filters:
+        for key, value in request.filters.items():
+            params[key] = f"eq.{value}"
+
+    try:
+        products = await fetch_from_supabase_cached(
+            "products", params=params, fresh=_no_cache(cache_control)
+        )
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch products: {str(e)}")
+
+    if not products:
+        raise HTTPException(status_code=404, detail="No products found matching criteria")
+
+    generator = get_lazy_generator()
+    return _stream_llm_events(
+        lambda: generator.stream_portfolio_insight(products=products, query=request.query),
+        format_sources=lambda chunks: [c["metadata"] for c in chunks],
     )
 
 
@@ -1576,9 +2589,7 @@ async def cognee_query(request: CogneeQueryRequest):
     NOTE: Cognee is lazy-loaded to minimize memory footprint.
     """
     try:
-        from ai_insights.cognee import get_cognee_lazy_loader
-
-        loader = get_cognee_lazy_loader()
+        loader = get_lazy_cognee_loader()
         raw_result = await loader.query(request.query, request.context)
 
         if raw_result is None:
@@ -1612,123 +2623,73 @@ async def cognee_query(request: CogneeQueryRequest):
         )
 
 
-@app.post("/cognee/ingest/products")
-async def cognee_ingest_products(background_tasks: BackgroundTasks):
-    """
-    Ingest product snapshot into Cognee knowledge graph.
+# kind -> (ingestion module, class, method, Supabase table, select params, job id prefix, label)
+_COGNEE_INGEST_KINDS = {
+    "products": (
+        "ingestion.product_snapshot", "ProductSnapshotIngestion", "ingest_product_snapshot",
+        "products", _PRODUCTS_PARAMS, "cognee_ingest_", "Product",
+    ),
+    "actions": (
+        "ingestion.governance_actions", "GovernanceActionIngestion", "ingest_batch_actions",
+        "actions", _SELECT_ALL_PARAMS, "cognee_actions_", "Actions",
+    ),
+}
 
-    This endpoint:
-    - Fetches current product data from Supabase
-    - Creates Product and RiskSignal entities
-    - Establishes relationships
-    - Preserves historical state
-    """
-    try:
-        # Fetch products from Supabase
-        products_data = await fetch_from_supabase(
-            "products", params={"select": "*,readiness:product_readiness(*),prediction:product_predictions(*)"}
-        )
 
-        # Queue ingestion as background task
-        job_id = f"cognee_ingest_{int(datetime.utcnow().timestamp())}"
-        _job_status[job_id] = {
-            "status": "queued",
-            "progress": 0,
-            "message": "Product ingestion queued",
-        }
-
-        async def ingest_products_background():
-            try:
-                from ingestion.product_snapshot import ProductSnapshotIngestion
-
-                _job_status[job_id]["status"] = "processing"
-                _job_status[job_id]["progress"] = 50
-
-                ingestion = ProductSnapshotIngestion()
-                stats = await ingestion.ingest_product_snapshot(products_data)
-
-                _job_status[job_id]["status"] = "completed"
-                _job_status[job_id]["progress"] = 100
-                _job_status[job_id]["stats"] = stats
+async def _cognee_ingest_background(job_id: str, kind: str, data: list[dict]):
+    """Run one Cognee ingestion job (see _COGNEE_INGEST_KINDS) and record its outcome."""
+    module, cls, method = _COGNEE_INGEST_KINDS[kind][:3]
+    try:
+        ingestion = getattr(importlib.import_module(module), cls)()
 
-            except Exception as e:
-                _job_status[job_id]["status"] = "failed"
-                _job_status[job_id]["error"] = str(e)
+        await job_store.update(job_id, status="processing", progress=50)
 
-        background_tasks.add_task(ingest_products_background)
+        stats = await getattr(ingestion, method)(data)
 
-        return {
-            "success": True,
-            "job_id": job_id,
-            "message": "Product ingestion queued. Poll /cognee/ingest/status/{job_id} for progress.",
-        }
+        await job_store.update(job_id, status="completed", progress=100, stats=stats)
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to queue ingestion: {str(e)}")
+        await job_store.update(job_id, status="failed", error=str(e))
 
 
-@app.post("/cognee/ingest/actions")
-async def cognee_ingest_actions(background_tasks: BackgroundTasks):
+@app.post("/cognee/ingest/{kind}")
+async def cognee_ingest(kind: Literal["products", "actions"], background_tasks: BackgroundTasks):
     """
-    Ingest governance actions into Cognee knowledge graph.
+    Ingest Supabase data into the Cognee knowledge graph.
 
-    This endpoint:
-    - Fetches actions from Supabase
-    - Creates GovernanceAction entities
-    - Links to RiskSignals
-    - Creates Outcome entities for completed actions
+    - products: Product and RiskSignal entities and their relationships,
+      preserving historical state
+    - actions: GovernanceAction entities linked to RiskSignals, plus Outcome
+      entities for completed actions
     """
+    _, _, _, table, params, prefix, label = _COGNEE_INGEST_KINDS[kind]
     try:
-        # Fetch actions from Supabase
-        actions_data = await fetch_from_supabase("actions", params={"select": "*"})
+        data = await fetch_from_supabase(table, params=params)
 
         # Queue ingestion as background task
-        job_id = f"cognee_actions_{int(datetime.utcnow().timestamp())}"
-        _job_status[job_id] = {
+        job_id = f"{prefix}{time.time_ns()}"
+        await job_store.set(job_id, {
             "status": "queued",
             "progress": 0,
-            "message": "Actions ingestion queued",
-        }
-
-        async def ingest_actions_background():
-            try:
-                from ingestion.governance_actions import GovernanceActionIngestion
-
-                _job_status[job_id]["status"] = "processing"
-                _job_status[job_id]["progress"] = 50
-
-                ingestion = GovernanceActionIngestion()
-                stats = await ingestion.ingest_batch_actions(actions_data)
-
-                _job_status[job_id]["status"] = "completed"
-                _job_status[job_id]["progress"] = 100
-                _job_status[job_id]["stats"] = stats
-
-            except Exception as e:
-                _job_status[job_id]["status"] = "failed"
-                _job_status[job_id]["error"] = str(e)
+            "message": f"{label} ingestion queued",
+        })
 
-        background_tasks.add_task(ingest_actions_background)
+        await _enqueue_job(
+            job_id, background_tasks, functools.partial(_cognee_ingest_background, job_id, kind, data)
+        )
 
         return {
             "success": True,
             "job_id": job_id,
-            "message": "Actions ingestion queued. Poll /cognee/ingest/status/{job_id} for progress.",
+            "message": f"{label} ingestion queued. Poll /jobs/{{job_id}} for progress.",
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to queue ingestion: {str(e)}")
 
 
-@app.get("/cognee/ingest/status/{job_id}")
-async def get_cognee_ingest_status(job_id: str):
-    """Get the status of a Cognee ingestion job."""
-    if job_id not in _job_status:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    return _job_status[job_id]
-
-
 # ============================================================================
 # ADMIN ENDPOINTS - Protected by API Key
 # ============================================================================
@@ -1777,11 +2738,313 @@ async def admin_reset_cognee(x_admin_key: str = Header(None)):
 # UNIFIED SYNC API - Syncs data to BOTH ChromaDB and Cognee
 # ============================================================================
 
+# Items per Cognee add_data call (ChromaDB/Cognee recommend 100-250 per batch)
+COGNEE_ADD_BATCH_SIZE = 100
+
+# Failed Cognee batches logged with a traceback per job; the rest are only counted
+COGNEE_ERROR_LOG_SAMPLE = 10
+
+
+async def _batched_add(
+    client,
+    items: list,
+    node_set: str,
+    batch_size: int = COGNEE_ADD_BATCH_SIZE,
+    error_stats: Optional[dict] = None,
+) -> int:
+    """
+    Add items to Cognee in batches, one batch at a time.
+
+    WHY: Per-item awaits pay N lock acquisitions and N transactions. Batching
+         amortizes that overhead. Batches go out sequentially because every
+         add_data call serializes on CogneeClient._add_data_lock (SQLite allows
+         one writer), so running them concurrently would overlap nothing.
+
+    Returns the number of items successfully added. A failing batch is logged
+    and skipped so one bad chunk doesn't abort the whole sync. Pass the same
+    `error_stats` dict across calls in a job to count failures per job; only the
+    first COGNEE_ERROR_LOG_SAMPLE failures are logged with a traceback.
+    """
+    stats = error_stats if error_stats is not None else {}
+    added = 0
+    for index, start in enumerate(range(0, len(items), batch_size)):
+        chunk = items[start:start + batch_size]
+        try:
+            await client.add_data(chunk, node_set=node_set)
+        except Exception as e:
+            stats["count"] = stats.get("count", 0) + 1
+            stats["last"] = f"{node_set} batch {index}: {e}"
+            if stats["count"] <= COGNEE_ERROR_LOG_SAMPLE:
+                logger.warning(
+                    "Cognee batch add failed (%s, batch %d): %s", node_set, index, e, exc_info=e
+                )
+        else:
+            added += len(chunk)
+    return added
+
+
+async def _record_cognee_errors(job_id: str, error_stats: dict) -> None:
+    """Store a job's Cognee error counter and log the last error if logs were sampled."""
+    count = error_stats.get("count", 0)
+    if not count:
+        return
+    if count > COGNEE_ERROR_LOG_SAMPLE:
+        logger.warning(
+            "%d Cognee batch errors in job %s (%d not logged); last: %s",
+            count, job_id, count - COGNEE_ERROR_LOG_SAMPLE, error_stats["last"],
+        )
+    await job_store.update(job_id, cognee_errors=count, cognee_last_error=error_stats["last"])
+
+
+def _build_action_docs(actions: list, start: int = 0) -> list[dict]:
+    """Convert governance actions into ChromaDB documents (CPU-only, safe to run in a thread)."""
+    return [
+        {
+            "id": action.get("id", f"action_{i}"),
+            "text": f"Action: {action.get('title', '')}. {action.get('description', '')}",
+            "metadata": {"source": "actions", "action_id": action.get("id")}
+        }
+        for i, action in enumerate(actions, start=start)
+    ]
+
+
+def _build_feedback_payloads(feedback: list) -> list[dict]:
+    """Enrich feedback with product name and sentiment label for Cognee (CPU-only)."""
+    return [
+        {
+            "type": "feedback",
+            "product_name": (item.get("product") or {}).get("name", "Unknown"),
+            "theme": item.get("theme", "general"),
+            "content": item.get("raw_text", ""),
+            "sentiment": "positive" if (score := item.get("sentiment_score") or 0) > 0.3
+            else "negative" if score < -0.3 else "neutral",
+            "sentiment_score": score,
+            "impact_level": item.get("impact_level", "MEDIUM"),
+            "source": item.get("source", "unknown"),
+            "created_at": str(item.get("created_at", "")),
+        }
+        for item in feedback
+    ]
+
+
+def _build_action_payloads(actions: list) -> list[dict]:
+    """Enrich actions with product name for Cognee (CPU-only)."""
+    return [
+        {
+            "type": "action",
+            "product_name": (item.get("product") or {}).get("name", "Unknown"),
+            "action_type": item.get("action_type", "general"),
+            "description": item.get("description", ""),
+            "status": item.get("status", "pending"),
+            "assigned_to": item.get("assigned_to", "unassigned"),
+            "created_at": str(item.get("created_at", "")),
+        }
+        for item in actions
+    ]
+
+
+# Debounced trailing cognify() - one graph build amortizes all recent ingests
+COGNIFY_DEBOUNCE_SECONDS = 30
+_cognify_deadline: float = 0.0
+_cognify_task: Optional[asyncio.Task] = None
+
+
+async def _run_debounced_cognify():
+    """Wait until ingests go quiet for COGNIFY_DEBOUNCE_SECONDS, then run cognify() once."""
+    while True:
+        while (delay := _cognify_deadline - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        scheduled_for = _cognify_deadline
+        
+        client = await _get_cognee()
+        if client is None:
+            logger.warning("Skipping scheduled cognify: Cognee client unavailable")
+            return
+        try:
+            await client.cognify()
+            logger.info("Scheduled cognify completed")
+        except Exception as e:
+            # Cognify may fail on duplicate data, that's OK
+            logger.warning(f"Cognify warning (data may already exist): {e}")
+        
+        # Ingests that landed while cognify ran pushed the deadline - build again for them
+        if _cognify_deadline == scheduled_for:
+            return
+
+
+def _schedule_cognify() -> None:
+    """
+    Request a knowledge graph build after the current burst of ingests.
+    
+    WHY: cognify() rebuilds over all data and is the heaviest step. Running it
+         per sync request repeats O(graph) work; each call here just pushes the
+         deadline back, so N back-to-back syncs trigger a single build.
+    """
+    global _cognify_deadline, _cognify_task
+    _cognify_deadline = time.monotonic() + COGNIFY_DEBOUNCE_SECONDS
+    if _cognify_task is None or _cognify_task.done():
+        _cognify_task = asyncio.create_task(_run_debounced_cognify())
+
+
+# Pages held in memory at once during unified sync (bounded producer/consumer queue)
+SYNC_MAX_INFLIGHT_PAGES = 2
+
+
 class SyncRequest(BaseModel):
     """Request model for unified sync endpoint."""
-    source: str = "products"  # products, feedback, actions
-    run_cognify: bool = True  # Whether to run cognify() after ingestion
+    source: Literal["products", "feedback", "actions"] = "products"
+    run_cognify: bool = True  # Whether to schedule a (debounced) cognify() after ingestion
     product_id: Optional[str] = None  # Optional filter for feedback
+    batch_size: int = COGNEE_ADD_BATCH_SIZE  # Items per Cognee add_data call
+
+
+async def _sync_job(job_id: str, request: SyncRequest):
+    """Background task to sync data to both stores."""
+    try:
+        # Step 1: Resolve the Supabase source
+        await job_store.update(job_id, status="fetching", progress=10)
+        
+        if request.source == "products":
+            table = "products"
+            params = _PRODUCTS_PARAMS
+        elif request.source == "feedback":
+            table = "product_feedback"
+            params = dict(_SELECT_ALL_PARAMS)
+            if request.product_id:
+                params["product_id"] = f"eq.{request.product_id}"
+        else:  # actions
+            table = "governance_actions"
+            params = _SELECT_ALL_PARAMS
+        
+        # Cheap HEAD count first - skip the heavy fetch entirely for empty sources
+        try:
+            total_rows = await count_from_supabase(table, params)
+        except Exception as e:
+            logger.debug(f"Supabase row count unavailable for {table}: {e}")
+            total_rows = None
+        
+        if total_rows == 0:
+            await job_store.update(job_id, status="completed", message="No data found to sync")
+            return
+        if total_rows is not None:
+            await job_store.update(job_id, records_total=total_rows)
+        
+        # Steps 2+3: Stream pages into ChromaDB (RAG) and Cognee (Knowledge Graph).
+        # Each page goes to both sinks concurrently, and the next page downloads
+        # while earlier ones ingest. SYNC_MAX_INFLIGHT_PAGES bounds the pages held
+        # in memory, so peak RSS is O(page size) instead of O(table).
+        totals = {"records": 0, "chroma": 0, "cognee": 0}
+        sink_errors = {}
+        cognee_errors = {}
+        
+        try:
+            client = await _get_cognee()
+        except Exception as e:
+            client = None
+            sink_errors["cognee"] = str(e)
+        page_slots = asyncio.Semaphore(SYNC_MAX_INFLIGHT_PAGES)
+        
+        def _build_page(page, start):
+            """Parse a page once into (ChromaDB documents, Cognee payloads)."""
+            loader = get_lazy_document_loader()
+            
+            if request.source == "products":
+                return loader.load_product_payloads(page)
+            if request.source == "feedback":
+                return loader.load_feedback_data(page), page
+            return _build_action_docs(page, start), page
+        
+        async def _ingest_chroma(documents):
+            # ingest_documents is blocking (embedding + upsert) - run off the event loop
+            chroma_count = await asyncio.to_thread(get_lazy_document_loader().ingest_documents, documents)
+            totals["chroma"] += chroma_count
+        
+        async def _ingest_cognee(payloads):
+            if client:
+                cognee_count = await _batched_add(
+                    client, payloads, request.source,
+                    batch_size=request.batch_size, error_stats=cognee_errors,
+                )
+                totals["cognee"] += cognee_count
+        
+        async def _ingest_page(page, start):
+            try:
+                try:
+                    # Parsing is pure CPU - keep it off the event loop so status polls stay responsive
+                    documents, payloads = await asyncio.to_thread(_build_page, page, start)
+                except Exception as e:
+                    sink_errors.setdefault("chroma", str(e))
+                    sink_errors.setdefault("cognee", str(e))
+                    return
+                
+                results = await asyncio.gather(
+                    _ingest_chroma(documents),
+                    _ingest_cognee(payloads),
+                    return_exceptions=True,
+                )
+                for sink, result in zip(("chroma", "cognee"), results):
+                    if isinstance(result, Exception):
+                        sink_errors.setdefault(sink, str(result))
+            finally:
+                page_slots.release()
+        
+        page_tasks = []
+        try:
+            async for page in fetch_from_supabase_paged(table, params):
+                await page_slots.acquire()
+                if not page_tasks:
+                    await job_store.update(
+                        job_id,
+                        status="ingesting",
+                        progress=20,
+                        chroma_status="processing",
+                        cognee_status="processing",
+                    )
+                page_tasks.append(asyncio.create_task(_ingest_page(page, totals["records"])))
+                totals["records"] += len(page)
+                await job_store.update(job_id, records_found=totals["records"])
+            
+            await asyncio.gather(*page_tasks)
+        finally:
+            # A failed fetch must not leave page ingests writing after the job is marked failed
+            pending = [task for task in page_tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        await _record_cognee_errors(job_id, cognee_errors)
+        
+        if not totals["records"]:
+            await job_store.update(job_id, status="completed", message="No data found to sync")
+            return
+        
+        if "chroma" in sink_errors:
+            await job_store.update(job_id, chroma_status=f"failed: {sink_errors['chroma']}")
+        else:
+            await job_store.update(job_id, chroma_status="completed", chroma_ingested=totals["chroma"])
+        
+        if "cognee" in sink_errors:
+            await job_store.update(job_id, cognee_status=f"failed: {sink_errors['cognee']}")
+        elif client:
+            await job_store.update(job_id, cognee_status="completed", cognee_ingested=totals["cognee"])
+        else:
+            await job_store.update(job_id, cognee_status="unavailable")
+        await job_store.update(job_id, progress=75)
+        
+        # Step 4: Schedule a debounced cognify() if requested (one build per burst of syncs)
+        if request.run_cognify:
+            _schedule_cognify()
+            await job_store.update(job_id, cognify_status="scheduled")
+        
+        clear_semantic_caches()  # Cached answers predate the synced rows
+        await job_store.update(
+            job_id,
+            status="completed",
+            progress=100,
+            timestamp=datetime.utcnow().isoformat(),
+        )
+        
+    except Exception as e:
+        await job_store.update(job_id, status="failed", error=str(e))
 
 
 @app.post("/api/sync/ingest")
@@ -1796,7 +3059,8 @@ async def unified_sync_ingest(
     1. Fetches data from Supabase
     2. Ingests into ChromaDB for fast RAG retrieval
     3. Ingests into Cognee for knowledge graph queries
-    4. Optionally runs cognify() to build relationships
+    4. Optionally schedules cognify() to build relationships (debounced, so
+       several syncs in a row share one graph build)
     
     Example:
         curl -X POST https://your-app.onrender.com/api/sync/ingest \\
@@ -1805,136 +3069,19 @@ async def unified_sync_ingest(
     """
     # Admin key check disabled to allow AI queries without authentication
     
-    job_id = f"sync_{request.source}_{int(datetime.utcnow().timestamp())}"
+    job_id = f"sync_{request.source}_{time.time_ns()}"
     
-    _job_status[job_id] = {
+    await job_store.set(job_id, {
         "status": "queued",
         "progress": 0,
         "source": request.source,
         "chroma_status": "pending",
         "cognee_status": "pending",
         "cognify_status": "pending" if request.run_cognify else "skipped",
-    }
-    
-    async def sync_background():
-        """Background task to sync data to both stores."""
-        try:
-            from ai_insights.cognee import get_cognee_lazy_loader
-            
-            # Step 1: Fetch data from Supabase
-            _job_status[job_id]["status"] = "fetching"
-            _job_status[job_id]["progress"] = 10
-            
-            if request.source == "products":
-                data = await fetch_from_supabase(
-                    "products",
-                    params={"select": "*,readiness:product_readiness(*),prediction:product_predictions(*)"}
-                )
-            elif request.source == "feedback":
-                params = {"select": "*"}
-                if request.product_id:
-                    params["product_id"] = f"eq.{request.product_id}"
-                data = await fetch_from_supabase("product_feedback", params=params)
-            elif request.source == "actions":
-                data = await fetch_from_supabase("governance_actions", params={"select": "*"})
-            else:
-                _job_status[job_id]["status"] = "failed"
-                _job_status[job_id]["error"] = f"Unknown source: {request.source}"
-                return
-            
-            if not data:
-                _job_status[job_id]["status"] = "completed"
-                _job_status[job_id]["message"] = "No data found to sync"
-                return
-            
-            _job_status[job_id]["progress"] = 20
-            _job_status[job_id]["records_found"] = len(data)
-            
-            # Step 2: Ingest into ChromaDB (RAG)
-            _job_status[job_id]["status"] = "ingesting_chroma"
-            _job_status[job_id]["chroma_status"] = "processing"
-            
-            try:
-                loader = get_lazy_document_loader()
-                
-                if request.source == "products":
-                    documents = loader.load_product_data(data)
-                elif request.source == "feedback":
-                    documents = loader.load_feedback_data(data)
-                else:
-                    # Convert actions to documents
-                    documents = [
-                        {
-                            "id": action.get("id", f"action_{i}"),
-                            "text": f"Action: {action.get('title', '')}. {action.get('description', '')}",
-                            "metadata": {"source": "actions", "action_id": action.get("id")}
-                        }
-                        for i, action in enumerate(data)
-                    ]
-                
-                chroma_count = loader.ingest_documents(documents)
-                _job_status[job_id]["chroma_status"] = "completed"
-                _job_status[job_id]["chroma_ingested"] = chroma_count
-                _job_status[job_id]["progress"] = 50
-                
-            except Exception as e:
-                _job_status[job_id]["chroma_status"] = f"failed: {str(e)}"
-            
-            # Step 3: Ingest into Cognee (Knowledge Graph)
-            _job_status[job_id]["status"] = "ingesting_cognee"
-            _job_status[job_id]["cognee_status"] = "processing"
-            
-            try:
-                cognee_loader = get_cognee_lazy_loader()
-                client = await cognee_loader.get_client()
-                
-                if client:
-                    cognee_count = 0
-                    for item in data:
-                        try:
-                            await client.add_data(item, node_set=request.source)
-                            cognee_count += 1
-                        except Exception as item_error:
-                            print(f"Cognee item error: {item_error}")
-                    
-                    _job_status[job_id]["cognee_status"] = "completed"
-                    _job_status[job_id]["cognee_ingested"] = cognee_count
-                else:
-                    _job_status[job_id]["cognee_status"] = "unavailable"
-                
-                _job_status[job_id]["progress"] = 75
-                
-            except Exception as e:
-                _job_status[job_id]["cognee_status"] = f"failed: {str(e)}"
-            
-            # Step 4: Run cognify() if requested
-            if request.run_cognify:
-                _job_status[job_id]["status"] = "cognifying"
-                _job_status[job_id]["cognify_status"] = "processing"
-                
-                try:
-                    cognee_loader = get_cognee_lazy_loader()
-                    client = await cognee_loader.get_client()
-                    
-                    if client:
-                        await client.cognify()
-                        _job_status[job_id]["cognify_status"] = "completed"
-                    else:
-                        _job_status[job_id]["cognify_status"] = "skipped (client unavailable)"
-                        
-                except Exception as e:
-                    _job_status[job_id]["cognify_status"] = f"failed: {str(e)}"
-            
-            _job_status[job_id]["status"] = "completed"
-            _job_status[job_id]["progress"] = 100
-            _job_status[job_id]["timestamp"] = datetime.utcnow().isoformat()
-            
-        except Exception as e:
-            _job_status[job_id]["status"] = "failed"
-            _job_status[job_id]["error"] = str(e)
+    })
     
-    # Queue background task
-    background_tasks.add_task(sync_background)
+    # Queue on the worker pool
+    await _enqueue_job(job_id, background_tasks, functools.partial(_sync_job, job_id, request))
     
     return {
         "success": True,
@@ -1945,13 +3092,144 @@ async def unified_sync_ingest(
     }
 
 
-@app.get("/api/sync/status/{job_id}")
-async def get_sync_status(job_id: str):
-    """Get the status of a sync job."""
-    if job_id not in _job_status:
-        raise HTTPException(status_code=404, detail="Job not found")
+async def _webhook_sync_job(job_id: str):
+    """
+    Sync ALL sources (products, feedback, actions) on webhook trigger.
     
-    return _job_status[job_id]
+    OPTIMIZATION: Uses asyncio.gather for parallel data fetching and for
+                  the per-source ingest fan-out, reducing total sync time by ~3x.
+    """
+    global _last_webhook_done
+    
+    # Coalesce: if another webhook sync holds the lock, this run is redundant
+    if _webhook_lock.locked():
+        await job_store.update(job_id, status="coalesced", progress=100)
+        return
+    
+    async with _webhook_lock:
+        try:
+            loader = get_lazy_document_loader()
+            client = await _get_cognee()
+        
+            sync_results = {
+                "products": 0,
+                "feedback": 0,
+                "actions": 0,
+            }
+        
+            # === PARALLEL FETCH: Get all data sources concurrently ===
+            await job_store.update(job_id, status="fetching_data_parallel", progress=10)
+        
+            # Fetch all data in parallel using asyncio.gather
+            fetch_results = await asyncio.gather(
+                fetch_from_supabase("products", params=_PRODUCTS_PARAMS),
+                fetch_from_supabase("product_feedback", params=_FEEDBACK_PARAMS),
+                fetch_from_supabase("product_actions", params=_ACTIONS_PARAMS),
+                return_exceptions=True  # Don't fail if one source errors
+            )
+        
+            # Unpack results, handling any errors
+            products = fetch_results[0] if not isinstance(fetch_results[0], Exception) else []
+            feedback = fetch_results[1] if not isinstance(fetch_results[1], Exception) else []
+            actions = fetch_results[2] if not isinstance(fetch_results[2], Exception) else []
+        
+            # Log any fetch errors
+            for i, (name, result) in enumerate([("products", fetch_results[0]), 
+                                                  ("feedback", fetch_results[1]), 
+                                                  ("actions", fetch_results[2])]):
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to fetch {name}: {result}")
+        
+            await job_store.update(
+                job_id,
+                progress=25,
+                records_fetched={
+                    "products": len(products),
+                    "feedback": len(feedback),
+                    "actions": len(actions)
+                },
+            )
+        
+            # === PARALLEL INGEST: Sources are independent, so sync them concurrently ===
+            await job_store.update(job_id, status="syncing_sources_parallel", progress=30)
+            cognee_errors = {}
+        
+            async def _sync_products():
+                if not products:
+                    return
+                # Parse once, then fan the same records out to ChromaDB and Cognee.
+                # ChromaDB ingest is blocking (embed + upsert) so it runs off the event loop;
+                # Cognee duplicates are handled inside add_data.
+                documents, payloads = await asyncio.to_thread(loader.load_product_payloads, products)
+                sinks = [asyncio.to_thread(loader.ingest_documents, documents)]
+                if client:
+                    sinks.append(_batched_add(client, payloads, "products", error_stats=cognee_errors))
+                await asyncio.gather(*sinks)
+            
+                sync_results["products"] = len(products)
+        
+            async def _sync_feedback():
+                if not feedback:
+                    return
+                # Cognee - add feedback as knowledge (batched)
+                if client:
+                    # Enrichment is pure CPU - build all payloads in a thread before any add
+                    feedback_payloads = await asyncio.to_thread(_build_feedback_payloads, feedback)
+                    await _batched_add(client, feedback_payloads, "feedback", error_stats=cognee_errors)
+            
+                sync_results["feedback"] = len(feedback)
+        
+            async def _sync_actions():
+                if not actions:
+                    return
+                # Cognee - add actions as knowledge (batched)
+                if client:
+                    action_payloads = await asyncio.to_thread(_build_action_payloads, actions)
+                    await _batched_add(client, action_payloads, "actions", error_stats=cognee_errors)
+            
+                sync_results["actions"] = len(actions)
+        
+            ingest_results = await asyncio.gather(
+                _sync_products(),
+                _sync_feedback(),
+                _sync_actions(),
+                return_exceptions=True,  # One failing source shouldn't abort the others
+            )
+        
+            sync_errors = {
+                name: str(result)
+                for name, result in zip(("products", "feedback", "actions"), ingest_results)
+                if isinstance(result, Exception)
+            }
+            for name, error in sync_errors.items():
+                logger.warning(f"Failed to sync {name}: {error}")
+            if sync_errors:
+                await job_store.update(job_id, sync_errors=sync_errors)
+            await _record_cognee_errors(job_id, cognee_errors)
+        
+            await job_store.update(job_id, progress=80)
+        
+            # === 4. BUILD KNOWLEDGE GRAPH (debounced trailing cognify) ===
+            if client:
+                _schedule_cognify()
+                await job_store.update(job_id, cognify_status="scheduled", progress=90)
+        
+            clear_semantic_caches()  # Cached answers predate the synced rows
+            await job_store.update(
+                job_id,
+                status="completed",
+                progress=100,
+                products_synced=sync_results["products"],
+                feedback_synced=sync_results["feedback"],
+                actions_synced=sync_results["actions"],
+            )
+            logger.info(f"Webhook sync completed: {sync_results}")
+        
+        except Exception as e:
+            await job_store.update(job_id, status="failed", error=str(e))
+            logger.error(f"Webhook sync failed: {e}")
+        finally:
+            _last_webhook_done = time.time()
 
 
 @app.post("/api/sync/webhook", tags=["sync"], summary="Supabase Webhook",
@@ -1971,201 +3249,47 @@ async def sync_webhook(
     3. Set URL to https://your-app.onrender.com/api/sync/webhook
     
     ⚠️ DEBOUNCING: Webhook calls are debounced to prevent rapid re-syncs.
-    Multiple calls within 60 seconds will be ignored.
+    Multiple calls within 60 seconds will be ignored, as are calls while a
+    sync is running or within 10 seconds of one finishing.
     """
-    global _last_webhook_sync, _webhook_sync_in_progress
+    global _last_webhook_sync
     
-    import time
     current_time = time.time()
     
+    # Supabase data changed - drop cached reads even if the sync itself is skipped
+    clear_supabase_cache()
+    
     # Check if sync is already in progress
-    if _webhook_sync_in_progress:
+    if _webhook_lock.locked():
         logger.info("Webhook sync already in progress, skipping")
         return {"status": "skipped", "reason": "sync_in_progress"}
     
-    # Check cooldown period
+    # Check cooldown period (since last start) and debounce (since last finish)
     time_since_last_sync = current_time - _last_webhook_sync
     if time_since_last_sync < _webhook_sync_cooldown:
         remaining = int(_webhook_sync_cooldown - time_since_last_sync)
         logger.info(f"Webhook sync on cooldown, {remaining}s remaining")
         return {"status": "skipped", "reason": "cooldown", "retry_after": remaining}
     
-    # Mark sync as in progress and update timestamp
-    _webhook_sync_in_progress = True
+    time_since_last_done = current_time - _last_webhook_done
+    if time_since_last_done < WEBHOOK_DEBOUNCE_SECONDS:
+        remaining = int(WEBHOOK_DEBOUNCE_SECONDS - time_since_last_done)
+        logger.info(f"Webhook sync debounced, {remaining}s remaining")
+        return {"status": "skipped", "reason": "debounced", "retry_after": remaining}
+    
+    # Update timestamp synchronously so triggers before the task starts hit the cooldown
     _last_webhook_sync = current_time
     
     # Trigger full sync
-    job_id = f"webhook_sync_{int(datetime.utcnow().timestamp())}"
+    job_id = f"webhook_sync_{time.time_ns()}"
     
-    _job_status[job_id] = {
+    await job_store.set(job_id, {
         "status": "queued",
         "triggered_by": "webhook",
         "progress": 0,
-    }
-    
-    async def webhook_sync():
-        """
-        Sync ALL sources (products, feedback, actions) on webhook trigger.
-        
-        OPTIMIZATION: Uses asyncio.gather for parallel data fetching,
-                      reducing total sync time by ~3x.
-        """
-        try:
-            from ai_insights.cognee import get_cognee_lazy_loader
-            
-            loader = get_lazy_document_loader()
-            cognee_loader = get_cognee_lazy_loader()
-            client = await cognee_loader.get_client()
-            
-            sync_results = {
-                "products": 0,
-                "feedback": 0,
-                "actions": 0,
-            }
-            
-            # === PARALLEL FETCH: Get all data sources concurrently ===
-            _job_status[job_id]["status"] = "fetching_data_parallel"
-            _job_status[job_id]["progress"] = 10
-            
-            # Fetch all data in parallel using asyncio.gather
-            fetch_results = await asyncio.gather(
-                fetch_from_supabase(
-                    "products",
-                    params={"select": "*,readiness:product_readiness(*),prediction:product_predictions(*)"}
-                ),
-                fetch_from_supabase(
-                    "product_feedback",
-                    params={"select": "*,product:products(name)"}
-                ),
-                fetch_from_supabase(
-                    "product_actions",
-                    params={"select": "*,product:products(name)"}
-                ),
-                return_exceptions=True  # Don't fail if one source errors
-            )
-            
-            # Unpack results, handling any errors
-            products = fetch_results[0] if not isinstance(fetch_results[0], Exception) else []
-            feedback = fetch_results[1] if not isinstance(fetch_results[1], Exception) else []
-            actions = fetch_results[2] if not isinstance(fetch_results[2], Exception) else []
-            
-            # Log any fetch errors
-            for i, (name, result) in enumerate([("products", fetch_results[0]), 
-                                                  ("feedback", fetch_results[1]), 
-                                                  ("actions", fetch_results[2])]):
-                if isinstance(result, Exception):
-                    logger.warning(f"Failed to fetch {name}: {result}")
-            
-            _job_status[job_id]["progress"] = 25
-            _job_status[job_id]["records_fetched"] = {
-                "products": len(products),
-                "feedback": len(feedback),
-                "actions": len(actions)
-            }
-            
-            # === 1. SYNC PRODUCTS ===
-            _job_status[job_id]["status"] = "syncing_products"
-            _job_status[job_id]["progress"] = 30
-            
-            if products:
-                # ChromaDB
-                documents = loader.load_product_data(products)
-                loader.ingest_documents(documents)
-                
-                # Cognee - add with error handling for duplicates
-                if client:
-                    for product in products:
-                        try:
-                            await client.add_data(product, node_set="products")
-                        except Exception as e:
-                            # Log but continue - duplicate data is OK
-                            logger.debug(f"Cognee add_data skipped (likely duplicate): {e}")
-                
-                sync_results["products"] = len(products)
-            
-            # === 2. SYNC FEEDBACK ===
-            _job_status[job_id]["status"] = "syncing_feedback"
-            _job_status[job_id]["progress"] = 50
-            
-            if feedback:
-                # Cognee - add feedback as knowledge (with error handling)
-                if client:
-                    for item in feedback:
-                        try:
-                            # Derive sentiment label from score
-                            score = item.get("sentiment_score", 0) or 0
-                            sentiment = "positive" if score > 0.3 else "negative" if score < -0.3 else "neutral"
-                            
-                            # Enrich feedback with product name for better context
-                            feedback_text = {
-                                "type": "feedback",
-                                "product_name": item.get("product", {}).get("name", "Unknown") if item.get("product") else "Unknown",
-                                "theme": item.get("theme", "general"),
-                                "content": item.get("raw_text", ""),
-                                "sentiment": sentiment,
-                                "sentiment_score": score,
-                                "impact_level": item.get("impact_level", "MEDIUM"),
-                                "source": item.get("source", "unknown"),
-                                "created_at": str(item.get("created_at", "")),
-                            }
-                            await client.add_data(feedback_text, node_set="feedback")
-                        except Exception as e:
-                            logger.debug(f"Cognee feedback add skipped (likely duplicate): {e}")
-                
-                sync_results["feedback"] = len(feedback)
-            
-            # === 3. SYNC ACTIONS ===
-            _job_status[job_id]["status"] = "syncing_actions"
-            _job_status[job_id]["progress"] = 70
-            
-            if actions:
-                # Cognee - add actions as knowledge (with error handling)
-                if client:
-                    for item in actions:
-                        try:
-                            action_text = {
-                                "type": "action",
-                                "product_name": item.get("product", {}).get("name", "Unknown") if item.get("product") else "Unknown",
-                                "action_type": item.get("action_type", "general"),
-                                "description": item.get("description", ""),
-                                "status": item.get("status", "pending"),
-                                "assigned_to": item.get("assigned_to", "unassigned"),
-                                "created_at": str(item.get("created_at", "")),
-                            }
-                            await client.add_data(action_text, node_set="actions")
-                        except Exception as e:
-                            logger.debug(f"Cognee action add skipped (likely duplicate): {e}")
-                
-                sync_results["actions"] = len(actions)
-            
-            # === 4. BUILD KNOWLEDGE GRAPH ===
-            _job_status[job_id]["status"] = "building_knowledge_graph"
-            _job_status[job_id]["progress"] = 90
-            
-            if client:
-                try:
-                    await client.cognify()
-                except Exception as e:
-                    # Cognify may fail on duplicate data, that's OK
-                    logger.warning(f"Cognify warning (data may already exist): {e}")
-            
-            _job_status[job_id]["status"] = "completed"
-            _job_status[job_id]["progress"] = 100
-            _job_status[job_id]["products_synced"] = sync_results["products"]
-            _job_status[job_id]["feedback_synced"] = sync_results["feedback"]
-            _job_status[job_id]["actions_synced"] = sync_results["actions"]
-            logger.info(f"Webhook sync completed: {sync_results}")
-            
-        except Exception as e:
-            _job_status[job_id]["status"] = "failed"
-            _job_status[job_id]["error"] = str(e)
-            logger.error(f"Webhook sync failed: {e}")
-        finally:
-            # Always clear the in-progress flag
-            global _webhook_sync_in_progress
-            _webhook_sync_in_progress = False
+    })
     
-    background_tasks.add_task(webhook_sync)
+    await _enqueue_job(job_id, background_tasks, functools.partial(_webhook_sync_job, job_id))
     
     return {
         "success": True,
@@ -2195,11 +3319,15 @@ if __name__ == "__main__":
     port = int(os.environ.get("PORT", API_PORT))
     logger.info(f"Starting AI Insights server on {API_HOST}:{port}")
 
-    # Configure uvicorn with graceful shutdown
+    # Configure uvicorn with graceful shutdown. uvloop/httptools are C implementations
+    # of the event loop and HTTP parser; fall back to the pure-Python ones when they
+    # aren't installed (uvloop doesn't support Windows).
     config = uvicorn.Config(
         app,
         host=API_HOST,
         port=port,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
         log_level="info",
         access_log=True,
         timeout_keep_alive=5,
@@ -7,6 +7,7 @@ WHY: cognify() is too heavy to run in the query path (30+ minutes).
 SECURITY: Protected by API key to prevent abuse.
 """
 
+import hmac
 import os
 from datetime import datetime
 from typing import Any
@@ -28,7 +29,8 @@ async def verify_admin_key(x_admin_key: str = Header(None)) -> bool:
     if not x_admin_key:
         raise HTTPException(status_code=401, detail="Missing X-Admin-Key header")
 
-    if x_admin_key != expected_key:
+    # Constant-time compare so response timing doesn't leak how much of the key matched
+    if not hmac.compare_digest(x_admin_key.encode(), expected_key.encode()):
         raise HTTPException(status_code=403, detail="Invalid admin key")
 
     return True
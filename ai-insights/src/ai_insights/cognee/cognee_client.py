@@ -25,16 +25,32 @@ If you still see issues, increase COGNEE_COGNIFY_RETRIES to 5 or higher.
 
 import asyncio
 import hashlib
-import json
 import os
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any, Optional
 
 import cognee
+import orjson
 from cognee import SearchType
 
 
+def _to_json(item: dict) -> str:
+    """
+    Render a dict as the indented JSON text Cognee ingests.
+
+    WHY: Every entity/relationship write serializes its payload; orjson does
+         this several times faster than the stdlib encoder on large dicts.
+         Non-string keys and unknown types are stringified rather than failing
+         a whole batched add.
+    """
+    return orjson.dumps(
+        item, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str
+    ).decode()
+
+
 class CogneeClient:
     """Client for interacting with Cognee knowledge graph."""
 
@@ -43,8 +59,11 @@ class CogneeClient:
     _config_applied = False
 
     # Query cache for repeated queries
-    _query_cache: dict = {}
+    _query_cache: OrderedDict[str, dict] = OrderedDict()  # LRU order
     _cache_ttl = 300  # 5 minutes
+    # Guards the check-then-mutate sequences on _query_cache for callers off the
+    # event loop thread; held only for dict operations, never across an await
+    _cache_lock = threading.Lock()
 
     # Concurrency control to prevent SQLite "database is locked" errors
     _cognify_lock = asyncio.Lock()
@@ -174,13 +193,20 @@ class CogneeClient:
 
         Handles duplicate data gracefully - if data already exists, returns success.
         Uses locking to prevent SQLite "database is locked" errors during concurrent writes.
+
+        ``data`` may also be a list of items, which is passed to Cognee as a single
+        batched add call (one lock acquisition and one transaction for the whole batch).
+        If the batch hits a duplicate, its items are retried one by one: the failed
+        transaction stored none of them, including the ones that are new.
         """
         if not self.initialized:
             await self.initialize()
 
         # Convert dict to JSON string - Cognee doesn't support raw dict type
         if isinstance(data, dict):
-            data = json.dumps(data, indent=2)
+            data = _to_json(data)
+        elif isinstance(data, list):
+            data = [_to_json(item) if isinstance(item, dict) else item for item in data]
 
         kwargs = {}
         if user_id:
@@ -197,14 +223,21 @@ class CogneeClient:
                 error_str = str(e).lower()
                 # Handle duplicate data gracefully - data already exists is OK
                 if "unique constraint" in error_str or "integrity" in error_str or "duplicate" in error_str:
-                    print(f"✓ Data already exists in Cognee (skipping duplicate)")
-                    return "already_exists"
+                    if not (isinstance(data, list) and len(data) > 1):
+                        print(f"✓ Data already exists in Cognee (skipping duplicate)")
+                        return "already_exists"
+                    print(f"⚠️ Duplicate in a batch of {len(data)} items, retrying item by item")
                 # Handle database locked errors
-                if "database is locked" in error_str:
+                elif "database is locked" in error_str:
                     print(f"⚠️ Cognee database locked during add_data, retrying...")
                     raise
-                # Re-raise other errors
-                raise
+                else:
+                    # Re-raise other errors
+                    raise
+
+        # Outside the lock: each item takes it again (asyncio.Lock isn't reentrant)
+        results = [await self.add_data(item, user_id=user_id, node_set=node_set) for item in data]
+        return str(results)
 
     async def add_entity(
         self,
@@ -324,38 +357,45 @@ class CogneeClient:
             return "unknown_state"
 
     def _get_cache_key(self, query_text: str, context: Optional[dict]) -> str:
-        """Generate cache key for query."""
-        context_str = str(sorted(context.items())) if context else ""
-        return hashlib.md5(f"{query_text}:{context_str}".encode()).hexdigest()
+        """
+        Generate cache key for query.
+
+        WHY: Keys only index the in-process cache, so md5 buys nothing;
+             blake2b is faster and matches the semantic cache's exact tier.
+        """
+        context_bytes = (
+            orjson.dumps(context, option=orjson.OPT_SORT_KEYS, default=str) if context else b""
+        )
+        return hashlib.blake2b(
+            query_text.encode() + b":" + context_bytes, digest_size=16
+        ).hexdigest()
 
     def _get_cached_result(self, cache_key: str) -> Optional[dict]:
         """Get cached result if valid."""
-        if cache_key in CogneeClient._query_cache:
-            cached = CogneeClient._query_cache[cache_key]
-            if time.time() - cached["timestamp"] < self._cache_ttl:
-                print(f"✓ Cache hit for query")
-                return cached["result"]
-            else:
+        with CogneeClient._cache_lock:
+            cached = CogneeClient._query_cache.get(cache_key)
+            if cached is None:
+                return None
+            if time.time() - cached["timestamp"] >= self._cache_ttl:
                 # Expired, remove it
                 del CogneeClient._query_cache[cache_key]
-        return None
+                return None
+            CogneeClient._query_cache.move_to_end(cache_key)
+        print(f"✓ Cache hit for query")
+        return cached["result"]
 
     def _cache_result(self, cache_key: str, result: dict):
         """Cache query result."""
-        # Limit cache size to prevent memory bloat
-        if len(CogneeClient._query_cache) > 100:
-            # Remove oldest entries
-            oldest_keys = sorted(
-                CogneeClient._query_cache.keys(),
-                key=lambda k: CogneeClient._query_cache[k]["timestamp"]
-            )[:20]
-            for key in oldest_keys:
-                del CogneeClient._query_cache[key]
-        
-        CogneeClient._query_cache[cache_key] = {
-            "result": result,
-            "timestamp": time.time()
-        }
+        # Limit cache size to prevent memory bloat: evict least recently used
+        with CogneeClient._cache_lock:
+            CogneeClient._query_cache.pop(cache_key, None)
+            while len(CogneeClient._query_cache) >= 100:
+                CogneeClient._query_cache.popitem(last=False)
+
+            CogneeClient._query_cache[cache_key] = {
+                "result": result,
+                "timestamp": time.time()
+            }
 
     async def query(
         self, 
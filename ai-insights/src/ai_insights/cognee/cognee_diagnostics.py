@@ -11,11 +11,14 @@ OPTIMIZATIONS (Professional Plan):
 
 import hashlib
 import os
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any, Optional
 
 import cognee
+import orjson
 from cognee import SearchType
 
 
@@ -27,8 +30,11 @@ class CogneeClient:
     _env_configured = False
     
     # Query cache for repeated queries
-    _query_cache: dict = {}
+    _query_cache: OrderedDict[str, dict] = OrderedDict()  # LRU order
     _cache_ttl = 300  # 5 minutes
+    # Guards the check-then-mutate sequences on _query_cache for callers off the
+    # event loop thread; held only for dict operations, never across an await
+    _cache_lock = threading.Lock()
 
     def __init__(self):
         """Initialize Cognee connection."""
@@ -147,37 +153,39 @@ class CogneeClient:
 
     def _get_cache_key(self, query_text: str, context: Optional[dict]) -> str:
         """Generate cache key for query."""
-        context_str = str(sorted(context.items())) if context else ""
-        return hashlib.md5(f"{query_text}:{context_str}".encode()).hexdigest()
+        context_bytes = (
+            orjson.dumps(context, option=orjson.OPT_SORT_KEYS, default=str) if context else b""
+        )
+        return hashlib.blake2b(
+            query_text.encode() + b":" + context_bytes, digest_size=16
+        ).hexdigest()
 
     def _get_cached_result(self, cache_key: str) -> Optional[dict]:
         """Get cached result if valid."""
-        if cache_key in CogneeClient._query_cache:
-            cached = CogneeClient._query_cache[cache_key]
-            if time.time() - cached["timestamp"] < self._cache_ttl:
-                print(f"✓ Cache hit for query")
-                return cached["result"]
-            else:
+        with CogneeClient._cache_lock:
+            cached = CogneeClient._query_cache.get(cache_key)
+            if cached is None:
+                return None
+            if time.time() - cached["timestamp"] >= self._cache_ttl:
                 # Expired, remove it
                 del CogneeClient._query_cache[cache_key]
-        return None
+                return None
+            CogneeClient._query_cache.move_to_end(cache_key)
+        print(f"✓ Cache hit for query")
+        return cached["result"]
 
     def _cache_result(self, cache_key: str, result: dict):
         """Cache query result."""
-        # Limit cache size to prevent memory bloat
-        if len(CogneeClient._query_cache) > 100:
-            # Remove oldest entries
-            oldest_keys = sorted(
-                CogneeClient._query_cache.keys(),
-                key=lambda k: CogneeClient._query_cache[k]["timestamp"]
-            )[:20]
-            for key in oldest_keys:
-                del CogneeClient._query_cache[key]
-        
-        CogneeClient._query_cache[cache_key] = {
-            "result": result,
-            "timestamp": time.time()
-        }
+        # Limit cache size to prevent memory bloat: evict least recently used
+        with CogneeClient._cache_lock:
+            CogneeClient._query_cache.pop(cache_key, None)
+            while len(CogneeClient._query_cache) >= 100:
+                CogneeClient._query_cache.popitem(last=False)
+
+            CogneeClient._query_cache[cache_key] = {
+                "result": result,
+                "timestamp": time.time()
+            }
 
     async def query(
         self, 
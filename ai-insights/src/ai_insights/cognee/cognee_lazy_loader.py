@@ -10,10 +10,14 @@ OPTIMIZATIONS (Professional Plan):
 
 import asyncio
 import hashlib
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any, Optional
 
+import orjson
+
 
 class CogneeLazyLoader:
     """
@@ -35,8 +39,11 @@ class CogneeLazyLoader:
         self._lock = asyncio.Lock()
         
         # Query cache
-        self._query_cache: dict = {}
+        self._query_cache: OrderedDict[str, dict] = OrderedDict()  # LRU order
         self._cache_ttl = 300  # 5 minutes
+        # Guards the check-then-mutate sequences on _query_cache for callers off the
+        # event loop thread; held only for dict operations, never across an await
+        self._cache_lock = threading.Lock()
         self._cache_hits = 0
         self._cache_misses = 0
         
@@ -99,37 +106,39 @@ class CogneeLazyLoader:
 
     def _get_cache_key(self, query_text: str, context: Optional[dict]) -> str:
         """Generate cache key for query."""
-        context_str = str(sorted(context.items())) if context else ""
-        return hashlib.md5(f"{query_text}:{context_str}".encode()).hexdigest()
+        context_bytes = (
+            orjson.dumps(context, option=orjson.OPT_SORT_KEYS, default=str) if context else b""
+        )
+        return hashlib.blake2b(
+            query_text.encode() + b":" + context_bytes, digest_size=16
+        ).hexdigest()
 
     def _check_cache(self, cache_key: str) -> Optional[dict]:
         """Check if query result is cached and valid."""
-        if cache_key in self._query_cache:
-            cached = self._query_cache[cache_key]
-            if time.time() - cached["timestamp"] < self._cache_ttl:
-                self._cache_hits += 1
-                return cached["result"]
-            else:
+        with self._cache_lock:
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                if time.time() - cached["timestamp"] < self._cache_ttl:
+                    self._cache_hits += 1
+                    self._query_cache.move_to_end(cache_key)
+                    return cached["result"]
                 del self._query_cache[cache_key]
-        
-        self._cache_misses += 1
-        return None
+
+            self._cache_misses += 1
+            return None
 
     def _store_cache(self, cache_key: str, result: dict):
         """Store query result in cache."""
-        # Limit cache size
-        if len(self._query_cache) > 100:
-            oldest = sorted(
-                self._query_cache.keys(),
-                key=lambda k: self._query_cache[k]["timestamp"]
-            )[:20]
-            for key in oldest:
-                del self._query_cache[key]
-        
-        self._query_cache[cache_key] = {
-            "result": result,
-            "timestamp": time.time()
-        }
+        # Limit cache size: evict least recently used
+        with self._cache_lock:
+            self._query_cache.pop(cache_key, None)
+            while len(self._query_cache) >= 100:
+                self._query_cache.popitem(last=False)
+
+            self._query_cache[cache_key] = {
+                "result": result,
+                "timestamp": time.time()
+            }
 
     def _track_query_time(self, query_time: float):
         """Track query time for performance monitoring."""
@@ -236,7 +245,8 @@ class CogneeLazyLoader:
 
     def clear_cache(self):
         """Clear the query cache."""
-        self._query_cache.clear()
+        with self._cache_lock:
+            self._query_cache.clear()
         print("✓ Query cache cleared")
 
     def get_status(self) -> dict[str, Any]:
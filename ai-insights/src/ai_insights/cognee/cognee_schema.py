@@ -7,7 +7,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # Enums for type safety
@@ -131,8 +131,7 @@ class ProductEntity(BaseModel):
     confidence_score: float = Field(ge=0.0, le=1.0, default=1.0)
     data_freshness: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class PortfolioEntity(BaseModel):
@@ -146,8 +145,7 @@ class PortfolioEntity(BaseModel):
     product_count: int
     confidence_score: float = Field(ge=0.0, le=1.0, default=1.0)
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class RiskSignalEntity(BaseModel):
@@ -164,8 +162,7 @@ class RiskSignalEntity(BaseModel):
     confidence_score: float = Field(ge=0.0, le=1.0, default=1.0)
     data_source: str
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class DependencyEntity(BaseModel):
@@ -181,8 +178,7 @@ class DependencyEntity(BaseModel):
     impact_severity: ImpactSeverity
     confidence_score: float = Field(ge=0.0, le=1.0, default=1.0)
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class GovernanceActionEntity(BaseModel):
@@ -201,8 +197,7 @@ class GovernanceActionEntity(BaseModel):
     status: ActionStatus
     confidence_score: float = Field(ge=0.0, le=1.0, default=1.0)
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class DecisionEntity(BaseModel):
@@ -217,8 +212,7 @@ class DecisionEntity(BaseModel):
     expected_outcome: str
     confidence_score: float = Field(ge=0.0, le=1.0, default=1.0)
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class OutcomeEntity(BaseModel):
@@ -232,8 +226,7 @@ class OutcomeEntity(BaseModel):
     variance_pct: float
     confidence_score: float = Field(ge=0.0, le=1.0, default=1.0)
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class RevenueSignalEntity(BaseModel):
@@ -260,8 +253,7 @@ class FeedbackSignalEntity(BaseModel):
     received_at: datetime
     confidence_score: float = Field(ge=0.0, le=1.0, default=1.0)
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class TimeWindowEntity(BaseModel):
@@ -273,8 +265,7 @@ class TimeWindowEntity(BaseModel):
     end_date: datetime
     label: str
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
 # Relationship Models
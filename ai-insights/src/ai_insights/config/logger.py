@@ -1,11 +1,20 @@
 """
 Structured Logging Configuration
 Provides consistent logging across the AI insights module.
+
+WHY: Console output goes through a QueueHandler to one background writer
+     thread. A logging call only formats the line and enqueues it; the stdout
+     write (which blocks when a container log driver falls behind) never runs
+     on the event loop or a request thread.
 """
 
+import atexit
 import logging
+import os
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 
@@ -38,6 +47,36 @@ class StructuredFormatter(logging.Formatter):
         return formatted
 
 
+# Lines are fully formatted (exception included) before they are queued, since
+# QueueHandler drops exc_info; the writer thread only prints them
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(logging.Formatter("%(message)s"))
+_listener: Optional[QueueListener] = None
+
+
+def _start_listener() -> None:
+    global _listener
+    _listener = QueueListener(_log_queue, _console_handler)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    """Flush queued lines and stop the writer thread."""
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+_start_listener()
+atexit.register(_stop_listener)
+if hasattr(os, "register_at_fork"):
+    # Threads don't survive fork (gunicorn --preload): drain before forking so
+    # lines aren't duplicated, then give parent and child a writer each
+    os.register_at_fork(
+        before=_stop_listener, after_in_parent=_start_listener, after_in_child=_start_listener
+    )
+
+
 def setup_logger(
     name: str, level: Optional[str] = None, log_file: Optional[str] = None
 ) -> logging.Logger:
@@ -60,7 +99,7 @@ def setup_logger(
     log_level = getattr(logging, level or "INFO")
     logger.setLevel(log_level)
 
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = QueueHandler(_log_queue)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(StructuredFormatter())
     logger.addHandler(console_handler)
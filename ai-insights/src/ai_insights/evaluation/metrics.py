@@ -43,12 +43,16 @@ class EvaluationMetrics:
         """Initialize Prometheus metrics if available."""
         try:
             from prometheus_client import Counter, Histogram, Gauge
+
+            # Register with the app registry that /metrics exports
+            from ai_insights.utils.metrics import REGISTRY
             
             # Overall quality score distribution
             self._metrics["quality_score"] = Histogram(
                 "ai_answer_quality_score",
                 "Distribution of AI answer quality scores",
                 buckets=[0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0],
+                registry=REGISTRY,
             )
             
             # Response latency
@@ -56,34 +60,41 @@ class EvaluationMetrics:
                 "ai_answer_latency_seconds",
                 "AI answer generation latency in seconds",
                 buckets=[0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0],
+                registry=REGISTRY,
             )
             
             # Quality by dimension
             self._metrics["relevance"] = Gauge(
                 "ai_answer_relevance_score",
                 "Current average relevance score (rolling)",
+                registry=REGISTRY,
             )
             self._metrics["groundedness"] = Gauge(
                 "ai_answer_groundedness_score",
                 "Current average groundedness score (rolling)",
+                registry=REGISTRY,
             )
             self._metrics["completeness"] = Gauge(
                 "ai_answer_completeness_score",
                 "Current average completeness score (rolling)",
+                registry=REGISTRY,
             )
             self._metrics["coherence"] = Gauge(
                 "ai_answer_coherence_score",
                 "Current average coherence score (rolling)",
+                registry=REGISTRY,
             )
             
             # Human feedback counters
             self._metrics["feedback_positive"] = Counter(
                 "ai_human_feedback_positive_total",
                 "Total positive human feedback (thumbs up)",
+                registry=REGISTRY,
             )
             self._metrics["feedback_negative"] = Counter(
                 "ai_human_feedback_negative_total",
                 "Total negative human feedback (thumbs down)",
+                registry=REGISTRY,
             )
             
             # Error counter
@@ -91,6 +102,7 @@ class EvaluationMetrics:
                 "ai_evaluation_errors_total",
                 "Total evaluation errors",
                 ["error_type"],
+                registry=REGISTRY,
             )
             
             # Query counter by intent
@@ -98,6 +110,7 @@ class EvaluationMetrics:
                 "ai_queries_total",
                 "Total AI queries by intent type",
                 ["intent"],
+                registry=REGISTRY,
             )
             
             self._prometheus_available = True
@@ -11,7 +11,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SourceType(str, Enum):
@@ -56,8 +56,7 @@ class Source(BaseModel):
     time_range: Optional[str] = None  # Temporal context
     verified: bool = False  # Has this been fact-checked?
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class ReasoningStep(BaseModel):
@@ -167,8 +166,7 @@ class UnifiedAIResponse(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     error: Optional[str] = None
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True)
 
     @classmethod
     def create_error_response(
@@ -8,12 +8,20 @@ WHY: Keyword-only classification is brittle and fails on phrasing variations.
 """
 
 import os
+import re
 from datetime import datetime
 from enum import Enum
 from typing import Optional
 
 from groq import Groq
 
+from ai_insights.utils.generator import LLM_MAX_RETRIES, llm_slots
+
+try:
+    import ahocorasick  # optional: pyahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 class QueryIntent(str, Enum):
     """Query intent types for routing decisions."""
@@ -25,6 +33,61 @@ class QueryIntent(str, Enum):
     UNKNOWN = "unknown"  # Ambiguous, needs LLM classification
 
 
+class _KeywordMatcher:
+    """
+    Scores a query against several keyword lists in one scan.
+
+    WHY: Heuristic classification runs on every query. With pyahocorasick
+         installed all keywords are found in a single automaton walk over
+         the query; otherwise one precompiled regex alternation scans it in C
+         instead of a Python-level substring check per keyword.
+
+    A score is the number of distinct keywords of that list found in the query.
+    """
+
+    def __init__(self, keywords_by_label: dict[str, list[str]]):
+        self._labels = tuple(keywords_by_label)
+        self._keyword_labels: dict[str, tuple[str, ...]] = {}
+        for label, keywords in keywords_by_label.items():
+            for keyword in keywords:
+                self._keyword_labels[keyword] = self._keyword_labels.get(keyword, ()) + (label,)
+
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self._keyword_labels:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            # Zero-width lookahead so overlapping keywords are all seen. Longest
+            # first, so each position reports its longest keyword; any shorter
+            # keyword starting at the same position is one of its prefixes.
+            ordered = sorted(self._keyword_labels, key=len, reverse=True)
+            self._pattern = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+            self._prefixes = {
+                keyword: tuple(k for k in self._keyword_labels if k != keyword and keyword.startswith(k))
+                for keyword in self._keyword_labels
+            }
+
+    def scores(self, text: str) -> dict[str, int]:
+        """Count distinct keyword matches per label in (already lowercased) text."""
+        if self._automaton is not None:
+            found = {keyword for _, keyword in self._automaton.iter(text)}
+        else:
+            found = set()
+            for match in self._pattern.finditer(text):
+                keyword = match.group(1)
+                if keyword not in found:
+                    found.add(keyword)
+                    found.update(self._prefixes[keyword])
+
+        scores = dict.fromkeys(self._labels, 0)
+        for keyword in found:
+            for label in self._keyword_labels[keyword]:
+                scores[label] += 1
+        return scores
+
+
 class IntentClassifier:
     """
     Hybrid intent classifier with heuristics + LLM fallback.
@@ -111,8 +174,14 @@ class IntentClassifier:
         """Initialize classifier with Groq client for LLM fallback."""
         # Read API key at runtime, not import time
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
-        self.groq_client = Groq(api_key=self.api_key) if self.api_key else None
+        self.groq_client = Groq(api_key=self.api_key, max_retries=LLM_MAX_RETRIES) if self.api_key else None
         self.classification_history = []  # For debugging and calibration
+        self._keywords = _KeywordMatcher({
+            "historical": self.HISTORICAL_KEYWORDS,
+            "causal": self.CAUSAL_KEYWORDS,
+            "factual": self.FACTUAL_KEYWORDS,
+            "mixed": self.MIXED_KEYWORDS,
+        })
 
     def classify(self, query: str) -> tuple[QueryIntent, float, str]:
         """
@@ -148,11 +217,12 @@ class IntentClassifier:
         WHY: Handles 80% of queries instantly without LLM call.
              Saves latency and API costs.
         """
-        # Count keyword matches for each intent
-        historical_score = sum(1 for kw in self.HISTORICAL_KEYWORDS if kw in query_lower)
-        causal_score = sum(1 for kw in self.CAUSAL_KEYWORDS if kw in query_lower)
-        factual_score = sum(1 for kw in self.FACTUAL_KEYWORDS if kw in query_lower)
-        mixed_score = sum(1 for kw in self.MIXED_KEYWORDS if kw in query_lower)
+        # Count keyword matches for each intent (one scan for all lists)
+        scores = self._keywords.scores(query_lower)
+        historical_score = scores["historical"]
+        causal_score = scores["causal"]
+        factual_score = scores["factual"]
+        mixed_score = scores["mixed"]
 
         # Calculate total matches
         total_matches = historical_score + causal_score + factual_score + mixed_score
@@ -218,12 +288,13 @@ Format: INTENT|CONFIDENCE|REASONING
 Example: HISTORICAL|0.85|Query asks about past event"""
 
             # Call Groq LLM with updated model
-            response = self.groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",  # Updated to current production model
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,  # Low temperature for consistent classification
-                max_tokens=100,
-            )
+            with llm_slots:
+                response = self.groq_client.chat.completions.create(
+                    model="llama-3.3-70b-versatile",  # Updated to current production model
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.1,  # Low temperature for consistent classification
+                    max_tokens=100,
+                )
 
             # Parse response
             result = response.choices[0].message.content.strip()
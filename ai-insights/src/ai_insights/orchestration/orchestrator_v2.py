@@ -23,6 +23,8 @@ import time
 from datetime import datetime
 from typing import Any, Optional
 
+import numpy as np
+
 from ai_insights.cognee import get_cognee_lazy_loader
 from ai_insights.config import get_logger
 from ai_insights.models import (
@@ -59,6 +61,7 @@ class SharedContext:
         self.validation_errors: list[str] = []
         self.rag_findings: list[dict[str, Any]] = []  # For feedback to Cognee
         self.cognee_sources: list[dict[str, Any]] = []  # Store Cognee sources for fallback
+        self.query_vector: Optional[np.ndarray] = None  # Precomputed query embedding for RAG
 
     def add_entity_id(self, entity_id: str, entity_type: str, validate: bool = True):
         """
@@ -146,6 +149,9 @@ class ProductionOrchestrator:
     CONFIDENCE_THRESHOLD_LOW = 0.5       # Consider switching primary
     CONFIDENCE_THRESHOLD_VERY_LOW = 0.3  # Degraded mode
 
+    # Cognee context is optional enrichment for RAG answers; don't wait longer than this
+    COGNEE_CONTEXT_TIMEOUT_SECONDS = 5.0
+
     # When to use fallback vs fail
     FALLBACK_THRESHOLD = 0.3
 
@@ -157,20 +163,29 @@ class ProductionOrchestrator:
         self.entity_grounder = get_entity_grounder()
 
     async def orchestrate(
-        self, query: str, context: Optional[dict[str, Any]] = None
+        self,
+        query: str,
+        context: Optional[dict[str, Any]] = None,
+        query_vector: Optional[np.ndarray] = None,
     ) -> UnifiedAIResponse:
         """
         Main orchestration method with full error handling.
 
         WHY: This is the single entry point. Must handle all edge cases
              and always return a valid response.
+
+        query_vector is the query's embedding when the caller already computed
+        it (the API's semantic cache); RAG retrieval reuses it.
         """
         start_time = time.time()
         self.logger.info("Starting orchestration for query", extra={"query": query[:100]})
 
         try:
-            # Step 1: Classify intent with confidence
-            intent, intent_confidence, intent_reasoning = self.intent_classifier.classify(query)
+            # Step 1: Classify intent with confidence. The LLM fallback is a blocking
+            # Groq call that may wait for an llm_slots permit - keep it off the event loop
+            intent, intent_confidence, intent_reasoning = await asyncio.to_thread(
+                self.intent_classifier.classify, query
+            )
             self.logger.info(
                 "Intent classified",
                 extra={
@@ -182,6 +197,7 @@ class ProductionOrchestrator:
 
             # Step 2: Create validated shared context
             shared_ctx = SharedContext()
+            shared_ctx.query_vector = query_vector
 
             # Step 3: Initialize reasoning trace
             reasoning_trace = [
@@ -473,6 +489,10 @@ class ProductionOrchestrator:
         WHY: Factual queries need current documents and data.
              RAG is authoritative for current state.
              Cognee provides historical context.
+
+        OPTIMIZATION: Retrieval doesn't depend on the Cognee result, so both
+                      run concurrently; Cognee context is time-boxed and
+                      skipped if the graph is slow.
         """
         reasoning_trace.append(
             ReasoningStep(
@@ -484,11 +504,14 @@ class ProductionOrchestrator:
         )
 
         try:
-            # First, get relevant context from Cognee
-            cognee_context = await self._get_cognee_context(query, context)
+            # Cognee context and RAG in parallel (entities are attached to the response afterwards)
+            cognee_context, rag_result = await asyncio.gather(
+                self._get_cognee_context(query, context),
+                self._get_rag_context(query, shared_ctx),
+            )
 
             if cognee_context:
-                # Extract entities for RAG filtering
+                # Extract entities for response grounding
                 for source in cognee_context.get("sources", []):
                     shared_ctx.add_entity_id(
                         source.get("entity_id", ""), source.get("entity_type", ""), validate=True
@@ -508,9 +531,6 @@ class ProductionOrchestrator:
                     )
                 )
 
-            # Query RAG with entity filtering
-            rag_result = await self._get_rag_context(query, shared_ctx)
-
             reasoning_trace.append(
                 ReasoningStep(
                     step=len(reasoning_trace) + 1,
@@ -662,6 +682,7 @@ class ProductionOrchestrator:
                 retrieval.retrieve,
                 query,
                 top_k=5,
+                query_vector=shared_ctx.query_vector,
             )
 
             # Offload sync LLM generation to a background thread
@@ -709,10 +730,17 @@ class ProductionOrchestrator:
     async def _get_cognee_context(
         self, query: str, context: Optional[dict[str, Any]]
     ) -> Optional[dict[str, Any]]:
-        """Get relevant context from Cognee for RAG enrichment."""
+        """Get relevant context from Cognee for RAG enrichment (None if unavailable or slow)."""
         try:
-            result = await self.cognee_loader.query(query, context)
-            return result
+            return await asyncio.wait_for(
+                self.cognee_loader.query(query, context), self.COGNEE_CONTEXT_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                "Cognee context timed out - answering without it",
+                extra={"timeout_s": self.COGNEE_CONTEXT_TIMEOUT_SECONDS},
+            )
+            return None
         except Exception:
             return None
 
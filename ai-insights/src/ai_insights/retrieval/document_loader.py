@@ -5,6 +5,7 @@ import os
 from pathlib import Path
 from typing import Any, Optional
 
+import numpy as np
 from llama_index.core import Document, SimpleDirectoryReader
 from llama_index.core.node_parser import SentenceSplitter
 
@@ -68,69 +69,91 @@ class DocumentLoader:
             metadata=metadata or {},
         )
 
+    def _render_product(self, product: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        """Render a Supabase product row into (text, metadata)."""
+        # Create rich text representation of product
+        text_parts = [
+            f"Product: {product.get('name', 'Unknown')}",
+            f"Type: {product.get('product_type', 'Unknown')}",
+            f"Region: {product.get('region', 'Unknown')}",
+            f"Lifecycle Stage: {product.get('lifecycle_stage', 'Unknown')}",
+            f"Owner: {product.get('owner_email', 'Unknown')}",
+        ]
+
+        if product.get("revenue_target"):
+            text_parts.append(f"Revenue Target: ${product['revenue_target']:,.0f}")
+
+        if product.get("launch_date"):
+            text_parts.append(f"Launch Date: {product['launch_date']}")
+
+        if product.get("success_metric"):
+            text_parts.append(f"Success Metric: {product['success_metric']}")
+
+        if product.get("gating_status"):
+            text_parts.append(f"Gating Status: {product['gating_status']}")
+
+        # Add readiness data
+        readiness = product.get("readiness", [])
+        if readiness and len(readiness) > 0:
+            r = readiness[0] if isinstance(readiness, list) else readiness
+            text_parts.append(f"Readiness Score: {r.get('overall_score', 'N/A')}%")
+            text_parts.append(f"Risk Band: {r.get('risk_band', 'N/A')}")
+
+        # Add prediction data
+        prediction = product.get("prediction", [])
+        if prediction and len(prediction) > 0:
+            p = prediction[0] if isinstance(prediction, list) else prediction
+            text_parts.append(f"Revenue Probability: {p.get('revenue_probability', 'N/A')}%")
+            text_parts.append(f"Timeline Probability: {p.get('timeline_probability', 'N/A')}%")
+
+        # Add compliance data
+        compliance = product.get("compliance", [])
+        if compliance and len(compliance) > 0:
+            c = compliance[0] if isinstance(compliance, list) else compliance
+            text_parts.append(f"Compliance Status: {c.get('status', 'N/A')}")
+
+        text = "\n".join(text_parts)
+
+        metadata = {
+            "source": "supabase",
+            "product_id": product.get("id"),
+            "product_name": product.get("name"),
+            "product_type": product.get("product_type"),
+            "region": product.get("region"),
+            "lifecycle_stage": product.get("lifecycle_stage"),
+        }
+        return text, metadata
+
     def load_product_data(self, products: list[dict[str, Any]]) -> list[Document]:
         """Convert product data from Supabase into documents."""
         documents = []
 
         for product in products:
-            # Create rich text representation of product
-            text_parts = [
-                f"Product: {product.get('name', 'Unknown')}",
-                f"Type: {product.get('product_type', 'Unknown')}",
-                f"Region: {product.get('region', 'Unknown')}",
-                f"Lifecycle Stage: {product.get('lifecycle_stage', 'Unknown')}",
-                f"Owner: {product.get('owner_email', 'Unknown')}",
-            ]
-
-            if product.get("revenue_target"):
-                text_parts.append(f"Revenue Target: ${product['revenue_target']:,.0f}")
-
-            if product.get("launch_date"):
-                text_parts.append(f"Launch Date: {product['launch_date']}")
-
-            if product.get("success_metric"):
-                text_parts.append(f"Success Metric: {product['success_metric']}")
-
-            if product.get("gating_status"):
-                text_parts.append(f"Gating Status: {product['gating_status']}")
+            text, metadata = self._render_product(product)
+            documents.append(Document(text=text, metadata=metadata))
 
-            # Add readiness data
-            readiness = product.get("readiness", [])
-            if readiness and len(readiness) > 0:
-                r = readiness[0] if isinstance(readiness, list) else readiness
-                text_parts.append(f"Readiness Score: {r.get('overall_score', 'N/A')}%")
-                text_parts.append(f"Risk Band: {r.get('risk_band', 'N/A')}")
-
-            # Add prediction data
-            prediction = product.get("prediction", [])
-            if prediction and len(prediction) > 0:
-                p = prediction[0] if isinstance(prediction, list) else prediction
-                text_parts.append(f"Revenue Probability: {p.get('revenue_probability', 'N/A')}%")
-                text_parts.append(f"Timeline Probability: {p.get('timeline_probability', 'N/A')}%")
+        print(f"Created {len(documents)} documents from product data")
+        return documents
 
-            # Add compliance data
-            compliance = product.get("compliance", [])
-            if compliance and len(compliance) > 0:
-                c = compliance[0] if isinstance(compliance, list) else compliance
-                text_parts.append(f"Compliance Status: {c.get('status', 'N/A')}")
+    def load_product_payloads(
+        self, products: list[dict[str, Any]]
+    ) -> tuple[list[Document], list[dict[str, Any]]]:
+        """
+        Convert product data into ChromaDB documents and Cognee payloads in one pass.
 
-            text = "\n".join(text_parts)
+        Both sinks get the same rendered text and metadata, so products are
+        parsed once per sync and the two stores stay consistent.
+        """
+        documents = []
+        payloads = []
 
-            doc = Document(
-                text=text,
-                metadata={
-                    "source": "supabase",
-                    "product_id": product.get("id"),
-                    "product_name": product.get("name"),
-                    "product_type": product.get("product_type"),
-                    "region": product.get("region"),
-                    "lifecycle_stage": product.get("lifecycle_stage"),
-                },
-            )
-            documents.append(doc)
+        for product in products:
+            text, metadata = self._render_product(product)
+            documents.append(Document(text=text, metadata=metadata))
+            payloads.append({"type": "product", **metadata, "content": text})
 
         print(f"Created {len(documents)} documents from product data")
-        return documents
+        return documents, payloads
 
     def load_feedback_data(self, feedback: list[dict[str, Any]]) -> list[Document]:
         """Convert feedback data into documents."""
@@ -198,17 +221,47 @@ class DocumentLoader:
         if not chunks:
             return 0
 
+        # Re-uploads repeat most chunks verbatim: skip chunks already stored unchanged
+        self.vector_store.create_collection()
+        unchanged, vectors = self.vector_store.stored_chunks(
+            [c["text"] for c in chunks],
+            [c["doc_id"] for c in chunks],
+            [c["chunk_id"] for c in chunks],
+            [c["metadata"] for c in chunks],
+        )
+        # Identical documents in one batch share an ID; Chroma rejects repeated IDs in one upsert
+        seen = set()
+        pending = []
+        for i, chunk in enumerate(chunks):
+            key = (chunk["doc_id"], chunk["chunk_id"])
+            if i not in unchanged and key not in seen:
+                seen.add(key)
+                pending.append(chunk)
+        chunks = pending
+        if not chunks:
+            print(f"All {len(unchanged)} chunks already in vector store")
+            return len(unchanged)
+
         # Extract texts for embedding
         texts = [c["text"] for c in chunks]
         doc_ids = [c["doc_id"] for c in chunks]
         chunk_ids = [c["chunk_id"] for c in chunks]
         metadata = [c["metadata"] for c in chunks]
 
-        # Generate embeddings
-        float_embeddings, binary_embeddings = self.embeddings.embed_and_quantize(texts)
+        # Embed each distinct text once and fan the vectors out to every chunk sharing it;
+        # texts already stored under the same ID (only metadata changed) reuse their vector
+        unique_texts = list(dict.fromkeys(texts))
+        missing = [text for text in unique_texts if text not in vectors]
+        if missing:
+            new_float, _ = self.embeddings.embed_and_quantize(missing)
+            vectors.update(zip(missing, new_float))
+        unique_float = np.stack([vectors[text] for text in unique_texts])
+        unique_binary = self.embeddings.quantize_to_binary(unique_float)
+        row = {text: i for i, text in enumerate(unique_texts)}
+        rows = [row[text] for text in texts]
+        float_embeddings, binary_embeddings = unique_float[rows], unique_binary[rows]
 
         # Store in vector database
-        self.vector_store.create_collection()
         ids = self.vector_store.insert(
             texts=texts,
             float_embeddings=float_embeddings,
@@ -218,8 +271,15 @@ class DocumentLoader:
             metadata=metadata,
         )
 
-        print(f"Ingested {len(ids)} chunks into vector store")
-        return len(ids)
+        print(f"Ingested {len(ids)} chunks into vector store ({len(unchanged)} unchanged)")
+        return len(ids) + len(unchanged)
+
+    def ingest_records(self, records: list[dict[str, Any]]) -> int:
+        """Ingest pre-parsed `{"id", "text", "metadata"}` records (e.g. Jira tickets)."""
+        documents = [
+            Document(text=r["text"], metadata=r["metadata"], doc_id=r["id"]) for r in records
+        ]
+        return self.ingest_documents(documents)
 
     def ingest_from_directory(self, path: Optional[str] = None) -> int:
         """Load and ingest all documents from a directory."""
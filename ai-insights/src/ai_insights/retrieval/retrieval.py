@@ -12,6 +12,8 @@ WHY: Bi-encoders are fast but less accurate. Cross-encoders are accurate
 
 from typing import Any, Optional
 
+import numpy as np
+
 from ai_insights.config.config import TOP_K
 from ai_insights.retrieval.embeddings import get_embeddings
 from ai_insights.retrieval.vector_store import get_vector_store
@@ -42,6 +44,7 @@ class RetrievalPipeline:
         top_k: Optional[int] = None,
         use_hybrid: bool = False,  # Not used in Lite mode
         use_reranking: Optional[bool] = None,
+        query_vector: Optional[np.ndarray] = None,
     ) -> list[dict[str, Any]]:
         """
         Retrieve relevant documents for a query with optional reranking.
@@ -51,6 +54,8 @@ class RetrievalPipeline:
             top_k: Number of final results to return
             use_hybrid: Ignored in Lite mode (uses cosine similarity)
             use_reranking: Override default reranking setting
+            query_vector: The query's float32 embedding, if the caller already
+                computed it (e.g. for the semantic cache); skips re-embedding
 
         Returns:
             List of relevant document chunks with metadata
@@ -62,46 +67,87 @@ class RetrievalPipeline:
         k = top_k or self.top_k
         should_rerank = use_reranking if use_reranking is not None else self.use_reranking
 
-        # Generate embeddings for query
-        float_emb, _ = self.embeddings.embed_and_quantize(query)
+        # Generate the query embedding; search only uses floats, so skip quantization
+        if query_vector is None:
+            query_vector = self.embeddings.embed_text(query)[0]
 
         # Stage 1: Fast bi-encoder search
         # Retrieve more candidates if reranking is enabled
         search_k = k * self.RERANK_CANDIDATE_MULTIPLIER if should_rerank else k
 
         results = self.vector_store.search(
-            query_vector=float_emb[0],
+            query_vector=query_vector,
             top_k=search_k,
         )
 
-        # Stage 2: Cross-encoder reranking (if enabled and available)
+        return self._rerank(query, results, k, should_rerank)
+
+    def retrieve_batch(
+        self,
+        queries: list[str],
+        top_k: Optional[int] = None,
+        use_reranking: Optional[bool] = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Retrieve for several queries with one embedding pass and one vector search.
+
+        WHY: Encoding N queries as one (N, D) batch and sending them in one
+             collection query amortizes the model call and the store round
+             trip; per-query retrieve() pays both N times.
+
+        Returns:
+            One result list per query, in input order
+        """
+        if not queries:
+            return []
+
+        k = top_k or self.top_k
+        should_rerank = use_reranking if use_reranking is not None else self.use_reranking
+        search_k = k * self.RERANK_CANDIDATE_MULTIPLIER if should_rerank else k
+
+        # Only the float vectors are searched, so skip binary quantization
+        float_emb = self.embeddings.embed_text(queries)
+        batch = self.vector_store.search_batch(float_emb, top_k=search_k)
+
+        return [
+            self._rerank(query, results, k, should_rerank)
+            for query, results in zip(queries, batch)
+        ]
+
+    def _rerank(
+        self, query: str, results: list[dict[str, Any]], k: int, should_rerank: bool
+    ) -> list[dict[str, Any]]:
+        """Stage 2: Cross-encoder reranking (if enabled and available), else top-k."""
         if should_rerank and self.reranker.is_available() and len(results) > 1:
-            results = self.reranker.rerank(
+            return self.reranker.rerank(
                 query=query,
                 documents=results,
                 top_n=k,
                 text_key="text",
             )
-        else:
-            results = results[:k]
-
-        return results
+        return results[:k]
 
     def retrieve_for_product(
         self,
         product_id: str,
         query: str,
         top_k: Optional[int] = None,
+        query_vector: Optional[np.ndarray] = None,
     ) -> list[dict[str, Any]]:
         """Retrieve documents filtered by product ID."""
-        results = self.retrieve(query, top_k)
+        results = self.retrieve(query, top_k, query_vector=query_vector)
 
-        # Filter results by product_id
-        filtered = [r for r in results if r.get("metadata", {}).get("product_id") == product_id]
+        # Partition by product_id in one pass (no dict-equality membership scans)
+        filtered = []
+        general = []
+        for r in results:
+            if r.get("metadata", {}).get("product_id") == product_id:
+                filtered.append(r)
+            else:
+                general.append(r)
 
         # If not enough product-specific results, include general ones
         if len(filtered) < (top_k or self.top_k):
-            general = [r for r in results if r not in filtered]
             filtered.extend(general[: ((top_k or self.top_k) - len(filtered))])
 
         return filtered
@@ -115,10 +161,16 @@ class RetrievalPipeline:
         """Retrieve documents filtered by theme (e.g., feedback theme)."""
         results = self.retrieve(query, top_k)
 
-        # Filter results by theme
-        filtered = [
-            r for r in results if r.get("metadata", {}).get("theme", "").lower() == theme.lower()
-        ]
+        # Filter results by theme; stored chunks carry a pre-lowercased theme_lc
+        theme_lc = theme.lower()
+        filtered = []
+        for r in results:
+            meta = r.get("metadata", {})
+            stored = meta.get("theme_lc")
+            if stored is None:
+                stored = (meta.get("theme") or "").lower()
+            if stored == theme_lc:
+                filtered.append(r)
 
         return filtered if filtered else results
 
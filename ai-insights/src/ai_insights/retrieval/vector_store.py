@@ -53,19 +53,8 @@ class ChromaVectorStore:
         if self.collection is None:
             return []
 
-        # Generate unique IDs
-        ids = [f"{doc_id}_{chunk_id}" for doc_id, chunk_id in zip(doc_ids, chunk_ids)]
-
-        # Prepare metadata (ChromaDB requires flat metadata)
-        flat_metadata = []
-        for i, meta in enumerate(metadata):
-            flat_meta = {
-                "doc_id": doc_ids[i],
-                "chunk_id": chunk_ids[i],
-                "source": str(meta.get("source", "")),
-                "product_id": str(meta.get("product_id", "")),
-            }
-            flat_metadata.append(flat_meta)
+        ids = self._ids(doc_ids, chunk_ids)
+        flat_metadata = self._flat_metadata(doc_ids, chunk_ids, metadata)
 
         self.collection.upsert(
             ids=ids,
@@ -76,6 +65,76 @@ class ChromaVectorStore:
 
         return ids
 
+    def stored_chunks(
+        self,
+        texts: list[str],
+        doc_ids: list[str],
+        chunk_ids: list[int],
+        metadata: list[dict[str, Any]],
+    ) -> tuple[set[int], dict[str, np.ndarray]]:
+        """
+        What the store already holds for these chunks, from one read by ID.
+
+        Returns:
+            (positions of chunks stored with identical text and metadata,
+             stored vectors of chunks whose text is unchanged, keyed by text)
+
+        WHY: Re-uploading an export (Jira CSVs especially) repeats most chunks
+             verbatim under the same content-derived IDs, so the loader can
+             skip embedding those. A chunk whose metadata changed (e.g. a
+             document re-linked to another product) still has to be upserted,
+             but its embedding depends only on the text, so the stored vector
+             can be reused. Both answers come from the same collection.get.
+        """
+        if self.collection is None or not texts:
+            return set(), {}
+
+        ids = self._ids(doc_ids, chunk_ids)
+        stored = self.collection.get(ids=ids, include=["documents", "metadatas", "embeddings"])
+        stored_by_id = {
+            id_: (text, meta)
+            for id_, text, meta in zip(stored["ids"], stored["documents"], stored["metadatas"])
+        }
+        flat_metadata = self._flat_metadata(doc_ids, chunk_ids, metadata)
+        unchanged = {
+            i
+            for i, id_ in enumerate(ids)
+            if stored_by_id.get(id_) == (texts[i], flat_metadata[i])
+        }
+
+        vectors = {}
+        if stored.get("embeddings") is not None:
+            wanted = set(texts)
+            vectors = {
+                text: np.asarray(embedding, dtype=np.float32)
+                for text, embedding in zip(stored["documents"], stored["embeddings"])
+                if text in wanted
+            }
+        return unchanged, vectors
+
+    @staticmethod
+    def _ids(doc_ids: list[str], chunk_ids: list[int]) -> list[str]:
+        return [f"{doc_id}_{chunk_id}" for doc_id, chunk_id in zip(doc_ids, chunk_ids)]
+
+    @staticmethod
+    def _flat_metadata(
+        doc_ids: list[str], chunk_ids: list[int], metadata: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        # ChromaDB requires flat metadata
+        flat = []
+        for doc_id, chunk_id, meta in zip(doc_ids, chunk_ids, metadata):
+            entry = {
+                "doc_id": doc_id,
+                "chunk_id": chunk_id,
+                "source": str(meta.get("source", "")),
+                "product_id": str(meta.get("product_id", "")),
+            }
+            # Lowercased once here so theme filtering compares stored strings as-is
+            if meta.get("theme"):
+                entry["theme_lc"] = str(meta["theme"]).lower()
+            flat.append(entry)
+        return flat
+
     def search(
         self,
         query_vector: np.ndarray,
@@ -91,27 +150,54 @@ class ChromaVectorStore:
             include=["documents", "metadatas", "distances"],
         )
 
+        if not results or not results["ids"]:
+            return []
+        return self._hits(results, 0)
+
+    def search_batch(self, query_vectors: np.ndarray, top_k: int = 5) -> list[list[dict[str, Any]]]:
+        """
+        Search for several query vectors in one collection query.
+
+        WHY: Chroma answers a list of query embeddings in one call, so N queries
+             cost one round trip instead of N. Results come back per query, in
+             input order.
+        """
+        if self.collection is None or len(query_vectors) == 0:
+            return [[] for _ in range(len(query_vectors))]
+
+        results = self.collection.query(
+            query_embeddings=np.asarray(query_vectors, dtype=np.float32).tolist(),
+            n_results=top_k,
+            include=["documents", "metadatas", "distances"],
+        )
+
+        if not results or not results["ids"]:
+            return [[] for _ in range(len(query_vectors))]
+        return [self._hits(results, row) for row in range(len(results["ids"]))]
+
+    @staticmethod
+    def _hits(results: dict[str, Any], row: int) -> list[dict[str, Any]]:
+        """Convert one query row of a Chroma result into hit dicts."""
         hits = []
-        if results and results["ids"] and len(results["ids"]) > 0:
-            for i, doc_id in enumerate(results["ids"][0]):
-                hits.append(
-                    {
-                        "id": doc_id,
-                        "score": 1 - (results["distances"][0][i] if results["distances"] else 0),
-                        "doc_id": (
-                            results["metadatas"][0][i].get("doc_id")
-                            if results["metadatas"]
-                            else None
-                        ),
-                        "chunk_id": (
-                            results["metadatas"][0][i].get("chunk_id")
-                            if results["metadatas"]
-                            else None
-                        ),
-                        "text": results["documents"][0][i] if results["documents"] else None,
-                        "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                    }
-                )
+        for i, doc_id in enumerate(results["ids"][row]):
+            hits.append(
+                {
+                    "id": doc_id,
+                    "score": 1 - (results["distances"][row][i] if results["distances"] else 0),
+                    "doc_id": (
+                        results["metadatas"][row][i].get("doc_id")
+                        if results["metadatas"]
+                        else None
+                    ),
+                    "chunk_id": (
+                        results["metadatas"][row][i].get("chunk_id")
+                        if results["metadatas"]
+                        else None
+                    ),
+                    "text": results["documents"][row][i] if results["documents"] else None,
+                    "metadata": results["metadatas"][row][i] if results["metadatas"] else {},
+                }
+            )
 
         return hits
 
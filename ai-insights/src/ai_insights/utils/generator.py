@@ -1,12 +1,32 @@
 """LLM Generation Module using Groq"""
 
 import os
+import threading
+from collections.abc import Iterator
 from typing import Any, Optional
 
 from groq import Groq
 
 from ai_insights.config.config import GROQ_API_KEY, GROQ_MODEL
 
+# Process-wide cap on in-flight Groq requests. The API also sheds load per request
+# (main._slot, sized by the same variable), but orchestrator and intent-classifier
+# calls only pass through here. Blocking: acquire it only on worker threads, never
+# on the event loop thread.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+llm_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+
+# The Groq SDK retries 429s/5xx with exponential backoff, honoring Retry-After
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+# Question asked per product insight type ({name} is the product name)
+INSIGHT_PROMPTS = {
+    "summary": "Provide a brief executive summary of the product: {name}",
+    "risks": "What are the key risks and concerns for the product: {name}?",
+    "opportunities": "What opportunities exist for the product: {name}?",
+    "recommendations": "What are the top 3 recommendations for the product: {name}?",
+    "competitive": "How does the product {name} compare to market alternatives?",
+}
 
 class InsightGenerator:
     """Generate insights using Groq's fast inference with Kimi-K2 or Llama models."""
@@ -18,7 +38,7 @@ class InsightGenerator:
     ):
         # Read API key at runtime, not import time
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
-        self.client = Groq(api_key=self.api_key) if self.api_key else None
+        self.client = Groq(api_key=self.api_key, max_retries=LLM_MAX_RETRIES) if self.api_key else None
         self.model = model
 
     def _build_context(self, retrieved_chunks: list[dict[str, Any]]) -> str:
@@ -91,12 +111,13 @@ Please provide a helpful, accurate response based on the context above.""",
         messages = self._build_prompt(query, context, system_prompt)
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
+            with llm_slots:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
 
             insight = response.choices[0].message.content
 
@@ -109,14 +130,7 @@ Please provide a helpful, accurate response based on the context above.""",
                     "completion_tokens": response.usage.completion_tokens,
                     "total_tokens": response.usage.total_tokens,
                 },
-                "sources": [
-                    {
-                        "text": c.get("text", "")[:200] + "...",
-                        "metadata": c.get("metadata", {}),
-                        "score": c.get("score", c.get("distance", 0)),
-                    }
-                    for c in retrieved_chunks
-                ],
+                "sources": self.format_sources(retrieved_chunks),
             }
 
         except Exception as e:
@@ -132,15 +146,8 @@ Please provide a helpful, accurate response based on the context above.""",
         insight_type: str = "summary",
     ) -> dict[str, Any]:
         """Generate specific insight types for a product."""
-        prompts = {
-            "summary": f"Provide a brief executive summary of the product: {product_data.get('name', 'Unknown')}",
-            "risks": f"What are the key risks and concerns for the product: {product_data.get('name', 'Unknown')}?",
-            "opportunities": f"What opportunities exist for the product: {product_data.get('name', 'Unknown')}?",
-            "recommendations": f"What are the top 3 recommendations for the product: {product_data.get('name', 'Unknown')}?",
-            "competitive": f"How does the product {product_data.get('name', 'Unknown')} compare to market alternatives?",
-        }
-
-        query = prompts.get(insight_type, prompts["summary"])
+        template = INSIGHT_PROMPTS.get(insight_type, INSIGHT_PROMPTS["summary"])
+        query = template.format(name=product_data.get("name", "Unknown"))
 
         # Create a pseudo-chunk from product data
         product_context = [
@@ -152,12 +159,74 @@ Please provide a helpful, accurate response based on the context above.""",
 
         return self.generate(query, product_context)
 
+    @staticmethod
+    def format_sources(retrieved_chunks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Source citations for an answer (truncated text, metadata, score)."""
+        return [
+            {
+                "text": c.get("text", "")[:200] + "...",
+                "metadata": c.get("metadata", {}),
+                "score": c.get("score", c.get("distance", 0)),
+            }
+            for c in retrieved_chunks
+        ]
+
+    def stream(
+        self,
+        query: str,
+        retrieved_chunks: list[dict[str, Any]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+    ) -> Iterator[str]:
+        """
+        Stream an insight as text deltas (Groq `stream=True`).
+
+        Raises:
+            RuntimeError: If the Groq API key is not configured.
+        """
+        if not self.client:
+            raise RuntimeError("Groq API key not configured")
+
+        context = self._build_context(retrieved_chunks)
+        messages = self._build_prompt(query, context, system_prompt)
+
+        # Only the request is held to a slot; reading the stream isn't a new call
+        with llm_slots:
+            completion = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+            )
+        for chunk in completion:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
     def generate_portfolio_insight(
         self,
         products: list[dict[str, Any]],
         query: str,
     ) -> dict[str, Any]:
         """Generate insights across multiple products."""
+        product_chunks, system_prompt = self._portfolio_context(products)
+        return self.generate(query, product_chunks, system_prompt=system_prompt)
+
+    def stream_portfolio_insight(
+        self,
+        products: list[dict[str, Any]],
+        query: str,
+    ) -> tuple[list[dict[str, Any]], Iterator[str]]:
+        """Streaming variant of generate_portfolio_insight: (context chunks, text deltas)."""
+        product_chunks, system_prompt = self._portfolio_context(products)
+        return product_chunks, self.stream(query, product_chunks, system_prompt=system_prompt)
+
+    def _portfolio_context(
+        self, products: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], str]:
+        """Build portfolio context chunks and system prompt."""
         # Create context from all products
         product_chunks = []
         for p in products[:10]:  # Limit to 10 products for context window
@@ -177,7 +246,7 @@ Focus on:
 - Stage progression patterns
 - Regional coverage"""
 
-        return self.generate(query, product_chunks, system_prompt=system_prompt)
+        return product_chunks, system_prompt
 
 
 # Singleton instance
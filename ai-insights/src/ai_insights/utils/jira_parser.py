@@ -2,15 +2,64 @@
 
 import csv
 import hashlib
+import os
+from collections.abc import Iterable
+from itertools import repeat
 from datetime import datetime
 from io import StringIO
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
+try:
+    import pyarrow as pa  # optional: multi-threaded C CSV reader for uploads
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = pa_csv = None
 
-def parse_jira_csv(csv_content: str) -> list[dict[str, Any]]:
+# Field -> accepted column names, in priority order (Jira exports vary).
+# Order matches the unpacking in _ticket_document.
+_JIRA_COLUMNS = (
+    ("Issue key", "Key", "issue_key"),
+    ("Summary", "summary"),
+    ("Status", "status"),
+    ("Assignee", "assignee"),
+    ("Reporter", "reporter"),
+    ("Created", "created"),
+    ("Updated", "updated"),
+    ("Due Date", "Due date", "duedate"),
+    ("Resolved", "resolved", "Resolution Date"),
+    ("Epic Name", "Epic Link", "epic_name", "Parent"),
+    ("Sprint", "sprint"),
+    ("Labels", "labels"),
+    ("Priority", "priority"),
+    ("Issue Type", "Issue type", "issuetype"),
+    ("Description", "description"),
+)
+
+
+def _resolve_column(header: list[str], *possible_names: str) -> Optional[int]:
+    """
+    Index of the first matching column: exact name, then case-insensitive.
+
+    Repeated column names resolve to the last occurrence, as a DictReader row would.
+    """
+    for name in possible_names:
+        # Try exact match
+        if name in header:
+            return len(header) - 1 - header[::-1].index(name)
+        # Try case-insensitive
+        for key in header:
+            if key.lower() == name.lower():
+                return len(header) - 1 - header[::-1].index(key)
+    return None
+
+
+def parse_jira_csv(csv_content: Union[str, Iterable[str]]) -> list[dict[str, Any]]:
     """
     Parse Jira CSV export and convert to document chunks for RAG ingestion.
 
+    Accepts the CSV text or any iterable of lines (e.g. an open file), so large
+    exports can be parsed without holding the whole file as one string.
+
     Expected columns (flexible - handles missing columns):
     - Issue key, Summary, Status, Assignee, Reporter
     - Created, Updated, Due Date, Resolved
@@ -18,58 +67,69 @@ def parse_jira_csv(csv_content: str) -> list[dict[str, Any]]:
     - Priority, Issue Type, Description
     """
     documents = []
-    reader = csv.DictReader(StringIO(csv_content))
-
-    # Normalize column names (Jira exports vary)
-    def get_field(row: dict, *possible_names: str) -> Optional[str]:
-        for name in possible_names:
-            # Try exact match
-            if name in row:
-                return row[name]
-            # Try case-insensitive
-            for key in row.keys():
-                if key.lower() == name.lower():
-                    return row[key]
-        return None
+    reader = csv.reader(StringIO(csv_content) if isinstance(csv_content, str) else csv_content)
+    header = next(reader, None)
+    if header is None:
+        return documents
+
+    # Resolve every field to a column index once from the header, instead of
+    # matching column names (case-insensitively) on every row.
+    indices = [_resolve_column(header, *names) for names in _JIRA_COLUMNS]
+    now = datetime.now()
 
     for row in reader:
-        # Extract fields with fallbacks
-        issue_key = get_field(row, "Issue key", "Key", "issue_key")
-        summary = get_field(row, "Summary", "summary")
-        status = get_field(row, "Status", "status")
-        assignee = get_field(row, "Assignee", "assignee")
-        reporter = get_field(row, "Reporter", "reporter")
-        created = get_field(row, "Created", "created")
-        updated = get_field(row, "Updated", "updated")
-        due_date = get_field(row, "Due Date", "Due date", "duedate")
-        resolved = get_field(row, "Resolved", "resolved", "Resolution Date")
-        epic_name = get_field(row, "Epic Name", "Epic Link", "epic_name", "Parent")
-        sprint = get_field(row, "Sprint", "sprint")
-        labels = get_field(row, "Labels", "labels")
-        priority = get_field(row, "Priority", "priority")
-        issue_type = get_field(row, "Issue Type", "Issue type", "issuetype")
-        description = get_field(row, "Description", "description")
-
-        if not issue_key or not summary:
-            continue  # Skip invalid rows
-
-        # Calculate days in current status
-        days_in_status = None
-        if updated:
-            try:
-                # Handle various date formats
-                for fmt in ["%Y-%m-%d %H:%M", "%d/%b/%y %I:%M %p", "%Y-%m-%dT%H:%M:%S"]:
-                    try:
-                        updated_dt = datetime.strptime(updated.split(".")[0], fmt)
-                        days_in_status = (datetime.now() - updated_dt).days
-                        break
-                    except ValueError:
-                        continue
-            except Exception:
-                pass
+        if not row:
+            continue  # Blank line
+        n = len(row)
+        document = _ticket_document(
+            [row[i] if i is not None and i < n else None for i in indices], now
+        )
+        if document is not None:
+            documents.append(document)
+
+    return documents
+
+
+def _ticket_document(fields: list[Optional[str]], now: datetime) -> Optional[dict[str, Any]]:
+    """Build one ticket document from field values in _JIRA_COLUMNS order (None if invalid)."""
+    (
+        issue_key,
+        summary,
+        status,
+        assignee,
+        reporter,
+        created,
+        updated,
+        due_date,
+        resolved,
+        epic_name,
+        sprint,
+        labels,
+        priority,
+        issue_type,
+        description,
+    ) = fields
+
+    if not issue_key or not summary:
+        return None  # Skip invalid rows
 
-        # Build document text for RAG
-        doc_text = f"""Jira Ticket: {issue_key}
+    # Calculate days in current status
+    days_in_status = None
+    if updated:
+        try:
+            # Handle various date formats
+            for fmt in ["%Y-%m-%d %H:%M", "%d/%b/%y %I:%M %p", "%Y-%m-%dT%H:%M:%S"]:
+                try:
+                    updated_dt = datetime.strptime(updated.split(".")[0], fmt)
+                    days_in_status = (now - updated_dt).days
+                    break
+                except ValueError:
+                    continue
+        except Exception:
+            pass
+
+    # Build document text for RAG
+    doc_text = f"""Jira Ticket: {issue_key}
 Summary: {summary}
 Status: {status or 'Unknown'}
 Type: {issue_type or 'Task'}
@@ -86,28 +146,24 @@ Resolved: {resolved or 'Not resolved'}
 Days in current status: {days_in_status if days_in_status is not None else 'Unknown'}
 Description: {(description or 'No description')[:500]}"""
 
-        # Generate unique ID based on content hash
-        doc_id = hashlib.md5(f"{issue_key}_{updated or created}".encode()).hexdigest()[:16]
-
-        documents.append(
-            {
-                "id": doc_id,
-                "text": doc_text,
-                "metadata": {
-                    "source": "jira",
-                    "issue_key": issue_key,
-                    "status": status,
-                    "epic_name": epic_name,
-                    "sprint": sprint,
-                    "assignee": assignee,
-                    "priority": priority,
-                    "issue_type": issue_type,
-                    "days_in_status": days_in_status,
-                },
-            }
-        )
+    # Generate unique ID based on content hash
+    doc_id = hashlib.md5(f"{issue_key}_{updated or created}".encode()).hexdigest()[:16]
 
-    return documents
+    return {
+        "id": doc_id,
+        "text": doc_text,
+        "metadata": {
+            "source": "jira",
+            "issue_key": issue_key,
+            "status": status,
+            "epic_name": epic_name,
+            "sprint": sprint,
+            "assignee": assignee,
+            "priority": priority,
+            "issue_type": issue_type,
+            "days_in_status": days_in_status,
+        },
+    }
 
 
 def match_products(documents: list[dict], product_names: list[str]) -> list[dict]:
@@ -150,3 +206,77 @@ def get_ingestion_summary(documents: list[dict]) -> dict[str, Any]:
         "by_status": statuses,
         "by_epic": epics,
     }
+
+
+def _parse_jira_csv_arrow(csv_path: str) -> Optional[list[dict[str, Any]]]:
+    """
+    Parse a CSV file with Arrow's multi-threaded C reader, column by column.
+
+    WHY: The csv module tokenizes cell by cell in the interpreter; Arrow parses
+         blocks in parallel in C and only the ~15 ticket columns are converted.
+
+    Returns None when Arrow can't take the file as-is (ragged rows, invalid
+    UTF-8, repeated column names), so the caller falls back to csv.reader,
+    which tolerates those and raises the same errors as before.
+    """
+    try:
+        with open(csv_path, encoding="utf-8", newline="") as f:
+            header = next(csv.reader(f), None)
+    except UnicodeDecodeError:
+        return None
+    if header is None:
+        return []
+    if len(set(header)) != len(header):
+        return None
+
+    indices = [_resolve_column(header, *names) for names in _JIRA_COLUMNS]
+    names = [header[i] if i is not None else None for i in indices]
+    wanted = list(dict.fromkeys(name for name in names if name is not None))
+    if not wanted:
+        return []
+
+    try:
+        table = pa_csv.read_csv(
+            csv_path,
+            read_options=pa_csv.ReadOptions(use_threads=True, block_size=1 << 20),
+            # Jira descriptions span lines inside quotes
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=wanted,
+                column_types={name: pa.string() for name in wanted},
+                strings_can_be_null=False,
+                quoted_strings_can_be_null=False,
+            ),
+        )
+    except pa.ArrowInvalid:
+        return None
+
+    columns = {name: table.column(name).to_pylist() for name in wanted}
+    now = datetime.now()
+    documents = []
+    for fields in zip(*(columns[name] if name is not None else repeat(None) for name in names)):
+        document = _ticket_document(list(fields), now)
+        if document is not None:
+            documents.append(document)
+    return documents
+
+
+def parse_jira_csv_file(csv_path: str) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """
+    Read, parse and summarize a spooled CSV upload, then remove the file.
+
+    Module-level (picklable) so it can run in a process pool worker.
+    """
+    try:
+        documents = _parse_jira_csv_arrow(csv_path) if pa_csv is not None else None
+        if documents is None:
+            # Stream rows from disk; the OS pages the file in as the reader advances
+            with open(csv_path, encoding="utf-8", newline="", buffering=1 << 20) as f:
+                # Read-ahead advice is per open file, so it goes on the descriptor we scan with
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                documents = parse_jira_csv(f)
+    finally:
+        os.unlink(csv_path)
+
+    return documents, get_ingestion_summary(documents)
@@ -0,0 +1,107 @@
+"""
+Background Job Queue
+Bounded queue drained by a fixed pool of long-lived worker coroutines.
+
+WHY: FastAPI BackgroundTasks run each job right after its response on the
+     request's own task, with no limit on how many run at once. A burst of sync
+     requests then starts a burst of full syncs that all compete for the event
+     loop. A bounded queue + fixed worker pool caps concurrent jobs, and a full
+     queue is reported to the caller (503) instead of piling up work.
+
+Usage:
+    from ai_insights.utils.job_queue import get_job_queue
+
+    queue = get_job_queue()
+    await queue.start()             # on app startup
+    queue.submit(sync_job)          # raises asyncio.QueueFull when saturated
+    await queue.stop()              # on app shutdown
+"""
+
+import asyncio
+import os
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+from ai_insights.config import get_logger
+
+logger = get_logger(__name__)
+
+JOB_QUEUE_MAXSIZE = int(os.getenv("JOB_QUEUE_MAXSIZE", "100"))
+JOB_QUEUE_WORKERS = int(os.getenv("JOB_QUEUE_WORKERS", str(os.cpu_count() or 2)))
+
+Job = Callable[[], Awaitable[None]]
+
+
+class JobQueue:
+    """Bounded job queue with a persistent worker pool."""
+
+    def __init__(self, maxsize: int = JOB_QUEUE_MAXSIZE, workers: int = JOB_QUEUE_WORKERS):
+        self._maxsize = maxsize
+        self._num_workers = max(1, workers)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        """True while the worker pool is accepting jobs."""
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        """Start the worker pool (idempotent)."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self._maxsize)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self._num_workers)
+        ]
+        logger.info(f"Job queue started: {self._num_workers} workers, maxsize {self._maxsize}")
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued jobs that haven't started are dropped."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._queue = None
+
+    def submit(self, job: Job) -> None:
+        """
+        Queue a job (a zero-arg coroutine function) for a worker.
+
+        Raises:
+            RuntimeError: If the pool isn't running.
+            asyncio.QueueFull: If the queue is at capacity.
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+        self._queue.put_nowait(job)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await job()
+            except Exception as e:
+                # Jobs record their own failures; this only guards the worker
+                logger.error(f"Job worker {index}: unhandled job error: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+
+# Global queue instance
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get or create the global job queue."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
+
+
+def reset_job_queue():
+    """Reset the global job queue (for testing)."""
+    global _job_queue
+    _job_queue = None
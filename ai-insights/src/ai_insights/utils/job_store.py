@@ -0,0 +1,264 @@
+"""
+Job Status Store
+Tracks background job progress (uploads, syncs, Cognee ingestion).
+
+WHY: An in-process dict is invisible to other uvicorn workers and is lost on
+     restart/autoscale. When REDIS_URL is set, job status lives in Redis with a
+     TTL so every worker sees the same jobs and stale jobs expire on their own.
+     Without REDIS_URL we fall back to an in-memory store (single worker, dev).
+
+The Redis store is wrapped in a 1s read cache (CachedJobStore) because
+clients poll job status heavily.
+
+Usage:
+    from ai_insights.utils.job_store import get_job_store
+
+    job_store = get_job_store()
+    await job_store.set(job_id, {"status": "queued", "progress": 0})
+    await job_store.update(job_id, status="processing", progress=50)
+    status = await job_store.get(job_id)  # None if unknown/expired
+    state = await job_store.get_status(job_id)  # just the "status" field
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Protocol
+
+import orjson
+
+from ai_insights.config import get_logger
+
+logger = get_logger(__name__)
+
+# Jobs expire 24h after their last update
+JOB_TTL_SECONDS = 24 * 60 * 60
+
+# In-memory store cap; the least recently written jobs are dropped first
+MAX_IN_MEMORY_JOBS = 10_000
+
+# Status reads are served from a local cache for this long (clients poll status)
+STATUS_CACHE_TTL_SECONDS = 1.0
+STATUS_CACHE_MAX_ENTRIES = 1024
+
+
+class JobStore(Protocol):
+    """Interface shared by all job status backends."""
+
+    async def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        """Return the job status dict, or None if the job is unknown."""
+        ...
+
+    async def get_status(self, job_id: str) -> Optional[str]:
+        """Return just the job's "status" field (cheap idempotency checks)."""
+        ...
+
+    async def set(self, job_id: str, status: dict[str, Any]) -> None:
+        """Replace the job status with `status`."""
+        ...
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        """Merge `fields` into the existing job status."""
+        ...
+
+    async def close(self) -> None:
+        """Release backend connections (called on shutdown)."""
+        ...
+
+
+class InMemoryJobStore:
+    """
+    Process-local job store (default when REDIS_URL is unset).
+
+    Jobs expire `ttl_seconds` after their last write, like the Redis store,
+    and at most `max_jobs` are kept, so a long-running single-worker process
+    doesn't accumulate every job (or bursts of them) in memory.
+    """
+
+    def __init__(self, ttl_seconds: float = JOB_TTL_SECONDS, max_jobs: int = MAX_IN_MEMORY_JOBS):
+        self._ttl = ttl_seconds
+        self._max_jobs = max_jobs
+        # Ordered by last write, so expired jobs are always at the front
+        self._jobs: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    async def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        status = self._live(job_id)
+        return dict(status) if status is not None else None
+
+    async def get_status(self, job_id: str) -> Optional[str]:
+        status = self._live(job_id)
+        return status.get("status") if status is not None else None
+
+    async def set(self, job_id: str, status: dict[str, Any]) -> None:
+        self._write(job_id, dict(status))
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        status = self._live(job_id) or {}
+        status.update(fields)
+        self._write(job_id, status)
+
+    async def close(self) -> None:
+        pass
+
+    def _live(self, job_id: str) -> Optional[dict[str, Any]]:
+        entry = self._jobs.get(job_id)
+        if entry is None or time.monotonic() - entry[0] > self._ttl:
+            return None
+        return entry[1]
+
+    def _write(self, job_id: str, status: dict[str, Any]) -> None:
+        now = time.monotonic()
+        self._jobs[job_id] = (now, status)
+        self._jobs.move_to_end(job_id)
+        # Writes are frequent, so pruning here keeps the dict bounded without a sweeper task
+        while self._jobs:
+            oldest, (written_at, _) = next(iter(self._jobs.items()))
+            if now - written_at <= self._ttl and len(self._jobs) <= self._max_jobs:
+                break
+            del self._jobs[oldest]
+
+
+class RedisJobStore:
+    """
+    Redis-backed job store shared across workers.
+
+    Each job is a Redis hash (one field per status key, orjson-encoded values) so
+    concurrent updates to different keys of the same job never overwrite each
+    other. Every write refreshes the TTL in the same pipeline round-trip.
+    """
+
+    def __init__(self, redis_url: str, ttl_seconds: int = JOB_TTL_SECONDS, prefix: str = "job:"):
+        import redis.asyncio as redis
+
+        self._redis = redis.Redis.from_url(redis_url)
+        self._ttl = ttl_seconds
+        self._prefix = prefix
+
+    def _key(self, job_id: str) -> str:
+        return f"{self._prefix}{job_id}"
+
+    async def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        raw = await self._redis.hgetall(self._key(job_id))
+        if not raw:
+            return None
+        return {
+            (k.decode() if isinstance(k, bytes) else k): orjson.loads(v)
+            for k, v in raw.items()
+        }
+
+    async def get_status(self, job_id: str) -> Optional[str]:
+        # Single-field HGET instead of HGETALL - uploads check this on every submit
+        raw = await self._redis.hget(self._key(job_id), "status")
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, job_id: str, status: dict[str, Any]) -> None:
+        key = self._key(job_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            if status:
+                pipe.hset(key, mapping={k: orjson.dumps(v) for k, v in status.items()})
+            pipe.expire(key, self._ttl)
+            await pipe.execute()
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        if not fields:
+            return
+        key = self._key(job_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={k: orjson.dumps(v) for k, v in fields.items()})
+            pipe.expire(key, self._ttl)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class CachedJobStore:
+    """
+    Micro-TTL LRU read cache in front of a shared job store.
+
+    WHY: Clients poll /status endpoints every second or so; without a cache
+         every poll is a Redis round trip. Local writes invalidate their entry
+         immediately, and writes from other workers show up within the TTL,
+         which is imperceptible to a progress bar.
+    """
+
+    def __init__(
+        self,
+        inner: JobStore,
+        ttl_seconds: float = STATUS_CACHE_TTL_SECONDS,
+        max_entries: int = STATUS_CACHE_MAX_ENTRIES,
+    ):
+        self._inner = inner
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._cache: OrderedDict[str, tuple[float, Optional[dict[str, Any]]]] = OrderedDict()
+
+    async def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        cached = self._cache.get(job_id)
+        if cached is not None and time.monotonic() - cached[0] < self._ttl:
+            self._cache.move_to_end(job_id)
+            status = cached[1]
+            return dict(status) if status is not None else None
+
+        status = await self._inner.get(job_id)
+        self._cache[job_id] = (time.monotonic(), status)
+        self._cache.move_to_end(job_id)
+        if len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+        return dict(status) if status is not None else None
+
+    async def get_status(self, job_id: str) -> Optional[str]:
+        # Not cached: duplicate-submit checks must see other workers' writes immediately
+        return await self._inner.get_status(job_id)
+
+    async def set(self, job_id: str, status: dict[str, Any]) -> None:
+        await self._inner.set(job_id, status)
+        # Invalidate after the write so a read racing the write can't re-cache stale data
+        self._cache.pop(job_id, None)
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        await self._inner.update(job_id, **fields)
+        self._cache.pop(job_id, None)
+
+    async def close(self) -> None:
+        self._cache.clear()
+        await self._inner.close()
+
+
+# Global store instance
+_job_store: Optional[JobStore] = None
+
+
+def get_job_store() -> JobStore:
+    """Get or create the global job store (Redis if REDIS_URL is set, else in-memory)."""
+    global _job_store
+    if _job_store is None:
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url:
+            try:
+                _job_store = CachedJobStore(RedisJobStore(redis_url))
+                logger.info("Job store: Redis")
+            except ImportError:
+                logger.warning("REDIS_URL set but redis package not installed - using in-memory job store")
+                _job_store = InMemoryJobStore()
+        else:
+            _job_store = InMemoryJobStore()
+        if isinstance(_job_store, InMemoryJobStore) and int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+            logger.warning(
+                "In-memory job store with multiple workers - job status is per worker. "
+                "Set REDIS_URL to share it."
+            )
+    return _job_store
+
+
+async def close_job_store():
+    """Close the global job store's connections (called on shutdown)."""
+    if _job_store is not None:
+        await _job_store.close()
+
+
+def reset_job_store():
+    """Reset the global job store (for testing)."""
+    global _job_store
+    _job_store = None
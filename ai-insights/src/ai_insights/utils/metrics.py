@@ -1,21 +1,34 @@
 """
 Prometheus Metrics for AI Insights
 Production monitoring and observability.
+
+All metrics live in REGISTRY rather than prometheus_client's default registry,
+so /metrics exports only application metrics. The default registry also carries
+the process/platform/GC collectors, which re-read /proc and interpreter state on
+every scrape.
 """
 
 import time
 from functools import wraps
 from typing import Callable
 
-from prometheus_client import Counter, Gauge, Histogram, Info
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, Info
+
+REGISTRY = CollectorRegistry()
 
 # Query Metrics
 query_total = Counter(
-    "ai_insights_queries_total", "Total number of AI queries processed", ["intent", "source_type"]
+    "ai_insights_queries_total",
+    "Total number of AI queries processed",
+    ["intent", "source_type"],
+    registry=REGISTRY,
 )
 
 query_errors_total = Counter(
-    "ai_insights_query_errors_total", "Total number of query errors", ["error_type"]
+    "ai_insights_query_errors_total",
+    "Total number of query errors",
+    ["error_type"],
+    registry=REGISTRY,
 )
 
 query_duration_seconds = Histogram(
@@ -23,6 +36,7 @@ query_duration_seconds = Histogram(
     "Query processing duration in seconds",
     ["intent", "source_type"],
     buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0],
+    registry=REGISTRY,
 )
 
 query_confidence = Histogram(
@@ -30,43 +44,80 @@ query_confidence = Histogram(
     "Query response confidence scores",
     ["intent", "source_type"],
     buckets=[0.0, 0.2, 0.4, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0],
+    registry=REGISTRY,
 )
 
 # Cognee Metrics
 cognee_queries_total = Counter(
-    "ai_insights_cognee_queries_total", "Total number of Cognee queries", ["status"]
+    "ai_insights_cognee_queries_total",
+    "Total number of Cognee queries",
+    ["status"],
+    registry=REGISTRY,
 )
 
 cognee_availability = Gauge(
-    "ai_insights_cognee_available", "Cognee availability status (1=available, 0=unavailable)"
+    "ai_insights_cognee_available",
+    "Cognee availability status (1=available, 0=unavailable)",
+    registry=REGISTRY,
 )
 
 cognee_query_duration_seconds = Histogram(
     "ai_insights_cognee_query_duration_seconds",
     "Cognee query duration in seconds",
     buckets=[0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+    registry=REGISTRY,
 )
 
 # RAG Metrics
 rag_queries_total = Counter(
-    "ai_insights_rag_queries_total", "Total number of RAG queries", ["status"]
+    "ai_insights_rag_queries_total",
+    "Total number of RAG queries",
+    ["status"],
+    registry=REGISTRY,
 )
 
 rag_query_duration_seconds = Histogram(
     "ai_insights_rag_query_duration_seconds",
     "RAG query duration in seconds",
     buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0],
+    registry=REGISTRY,
 )
 
 rag_sources_retrieved = Histogram(
     "ai_insights_rag_sources_retrieved",
     "Number of sources retrieved per query",
     buckets=[0, 1, 2, 3, 5, 10, 20],
+    registry=REGISTRY,
+)
+
+# Per-stage latency of the /query pipeline
+rag_retrieve_duration_seconds = Histogram(
+    "ai_insights_rag_retrieve_duration_seconds",
+    "Retrieval (embed + vector search + rerank) duration in seconds",
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+    registry=REGISTRY,
+)
+
+llm_generate_duration_seconds = Histogram(
+    "ai_insights_llm_generate_duration_seconds",
+    "LLM generation duration in seconds (excludes waiting for a concurrency slot)",
+    buckets=[0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0],
+    registry=REGISTRY,
+)
+
+semantic_cache_hit_ratio = Gauge(
+    "ai_insights_semantic_cache_hit_ratio",
+    "Semantic query cache hit ratio since process start",
+    ["cache"],
+    registry=REGISTRY,
 )
 
 # Intent Classification Metrics
 intent_classification_total = Counter(
-    "ai_insights_intent_classification_total", "Total intent classifications", ["intent", "method"]
+    "ai_insights_intent_classification_total",
+    "Total intent classifications",
+    ["intent", "method"],
+    registry=REGISTRY,
 )
 
 intent_classification_confidence = Histogram(
@@ -74,11 +125,13 @@ intent_classification_confidence = Histogram(
     "Intent classification confidence",
     ["intent"],
     buckets=[0.0, 0.3, 0.5, 0.7, 0.8, 0.9, 1.0],
+    registry=REGISTRY,
 )
 
 llm_fallback_total = Counter(
     "ai_insights_llm_fallback_total",
     "Number of times LLM fallback was used for intent classification",
+    registry=REGISTRY,
 )
 
 # Fallback Metrics
@@ -86,13 +139,14 @@ fallback_total = Counter(
     "ai_insights_fallback_total",
     "Total number of fallbacks",
     ["from_source", "to_source", "reason"],
+    registry=REGISTRY,
 )
 
 # System Info
-system_info = Info("ai_insights_system", "System information")
+system_info = Info("ai_insights_system", "System information", registry=REGISTRY)
 
 # Active Requests
-active_requests = Gauge("ai_insights_active_requests", "Number of currently active requests")
+active_requests = Gauge("ai_insights_active_requests", "Number of currently active requests", registry=REGISTRY)
 
 
 def track_query_metrics(func: Callable) -> Callable:
@@ -0,0 +1,197 @@
+"""
+Semantic Query Cache
+Two-tier cache for query answers: exact match first, then embedding similarity.
+
+WHY: Query traffic is heavily skewed - a small set of questions (and light
+     rephrasings of them) dominates. Each miss costs embedding + retrieval + an
+     LLM call; a hit skips all of it. Exact repeats are caught by a hash lookup,
+     and near-duplicates by a cosine-similarity scan over recent query embeddings.
+
+DESIGN (GPTCache-style tiers):
+1. Exact tier: LRU dict keyed by blake2b(scope + normalized query)
+2. Semantic tier: ring buffer of unit-norm float16 embeddings [capacity, dim];
+   one matrix-vector product finds the closest cached query in the same scope.
+   Hits above `threshold` (default 0.97) return that query's answer.
+
+Entries expire after `ttl_seconds` so answers pick up newly ingested data.
+
+Usage:
+    from ai_insights.utils.semantic_cache import get_semantic_cache
+
+    cache = get_semantic_cache("query")
+    key = cache.make_key(query, scope)
+    hit = cache.get_exact(key) or cache.get_similar(embedding, scope)
+    ...
+    cache.put(key, embedding, scope, response)
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+
+from ai_insights.utils.metrics import semantic_cache_hit_ratio
+
+SEMANTIC_CACHE_MAXSIZE = int(os.getenv("SEMANTIC_CACHE_MAXSIZE", "1024"))
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+SEMANTIC_CACHE_TTL_SECONDS = float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "600"))
+
+
+class SemanticCache:
+    """Exact + embedding-similarity LRU cache for query responses."""
+
+    def __init__(
+        self,
+        maxsize: int = SEMANTIC_CACHE_MAXSIZE,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        ttl_seconds: float = SEMANTIC_CACHE_TTL_SECONDS,
+    ):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+
+        # Exact tier: key -> (stored_at, response, ring slot or None)
+        self._entries: OrderedDict[str, tuple[float, Any, Optional[int]]] = OrderedDict()
+
+        # Semantic tier: ring buffer of embeddings, allocated on first put (dim unknown until then)
+        self._vectors: Optional[np.ndarray] = None
+        self._slot_keys: list[Optional[str]] = [None] * maxsize
+        self._slot_scopes = np.full(maxsize, -1, dtype=np.int32)  # -1 = empty slot
+        self._scope_ids: dict[str, int] = {}
+        self._next_slot = 0
+
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query: str, scope: str = "") -> str:
+        """Hash a query (case/whitespace-normalized) together with its scope."""
+        normalized = " ".join(query.lower().split())
+        return hashlib.blake2b(f"{scope}\x00{normalized}".encode(), digest_size=16).hexdigest()
+
+    def get_exact(self, key: str) -> Optional[Any]:
+        """Return the cached response for an exact key, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > self.ttl_seconds:
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def get_similar(self, embedding: np.ndarray, scope: str = "") -> Optional[Any]:
+        """Return the response of the most similar cached query in `scope`, or None."""
+        if self._vectors is None or not self._entries:
+            self.misses += 1
+            return None
+
+        query = self._normalize(embedding)
+        if query.shape[0] != self._vectors.shape[1]:
+            self.misses += 1
+            return None
+
+        scope_id = self._scope_ids.get(scope)
+        if scope_id is None:
+            self.misses += 1
+            return None
+
+        sims = self._vectors.astype(np.float32) @ query
+        # Only compare against live slots in the same scope
+        sims[self._slot_scopes != scope_id] = -1.0
+
+        best = int(np.argmax(sims))
+        if sims[best] < self.threshold:
+            self.misses += 1
+            return None
+
+        response = self.get_exact(self._slot_keys[best])
+        if response is None:
+            self.misses += 1
+            return None
+        self.semantic_hits += 1
+        return response
+
+    def put(self, key: str, embedding: Optional[np.ndarray], scope: str, response: Any) -> None:
+        """Cache a response under its exact key and (if given) its embedding."""
+        if key in self._entries:
+            self._evict(key)
+
+        slot = None
+        if embedding is not None:
+            vector = self._normalize(embedding)
+            if self._vectors is None:
+                self._vectors = np.zeros((self.maxsize, vector.shape[0]), dtype=np.float16)
+            if vector.shape[0] == self._vectors.shape[1]:
+                slot = self._next_slot
+                self._next_slot = (slot + 1) % self.maxsize
+                # Overwriting a ring slot drops the semantic link of the older entry
+                old_key = self._slot_keys[slot]
+                if old_key is not None and old_key in self._entries:
+                    stored_at, old_response, _ = self._entries[old_key]
+                    self._entries[old_key] = (stored_at, old_response, None)
+                self._vectors[slot] = vector
+                self._slot_keys[slot] = key
+                self._slot_scopes[slot] = self._scope_ids.setdefault(scope, len(self._scope_ids))
+
+        self._entries[key] = (time.monotonic(), response, slot)
+        while len(self._entries) > self.maxsize:
+            self._evict(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Drop all cached responses (e.g. after a large ingest)."""
+        self._entries.clear()
+        self._slot_keys = [None] * self.maxsize
+        self._slot_scopes.fill(-1)
+
+    def stats(self) -> dict[str, Any]:
+        """Cache hit/miss counters."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+    def _evict(self, key: str) -> None:
+        _, _, slot = self._entries.pop(key)
+        if slot is not None and self._slot_keys[slot] == key:
+            self._slot_keys[slot] = None
+            self._slot_scopes[slot] = -1
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+# Global cache instances, one per endpoint
+_semantic_caches: dict[str, SemanticCache] = {}
+
+
+def get_semantic_cache(name: str) -> SemanticCache:
+    """Get or create the named semantic cache."""
+    if name not in _semantic_caches:
+        cache = _semantic_caches[name] = SemanticCache()
+        # Evaluated at scrape time, so lookups don't pay for the metric
+        semantic_cache_hit_ratio.labels(cache=name).set_function(lambda: cache.stats()["hit_rate"])
+    return _semantic_caches[name]
+
+
+def clear_semantic_caches():
+    """Drop every cached answer (after ingest, so answers reflect new data)."""
+    for cache in _semantic_caches.values():
+        cache.clear()
+
+
+def reset_semantic_caches():
+    """Reset all semantic caches (for testing)."""
+    _semantic_caches.clear()
@@ -4,7 +4,7 @@ Prevents injection attacks and validates user input.
 """
 
 import re
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
 from fastapi import HTTPException, status
 from pydantic import BaseModel, Field, ValidationError, field_validator
@@ -74,20 +74,15 @@ class QueryRequest(BaseModel):
         return v
 
 
+# Insight types accepted at every API boundary; one per generator.INSIGHT_PROMPTS entry
+InsightType = Literal["summary", "risks", "opportunities", "recommendations", "competitive"]
+
+
 class ProductInsightRequest(BaseModel):
     """Validated product insight request."""
 
     product_id: str = Field(..., pattern=r"^[a-zA-Z0-9\-_]{1,100}$")
-    insight_type: str = Field(..., pattern=r"^(summary|risks|opportunities|recommendations)$")
-
-    @field_validator("insight_type")
-    @classmethod
-    def validate_insight_type(cls, v: str) -> str:
-        """Validate insight type."""
-        allowed_types = ["summary", "risks", "opportunities", "recommendations"]
-        if v not in allowed_types:
-            raise ValueError(f"insight_type must be one of: {', '.join(allowed_types)}")
-        return v
+    insight_type: InsightType
 
 
 class PortfolioInsightRequest(BaseModel):
@@ -136,18 +131,9 @@ class PortfolioInsightRequest(BaseModel):
 class IngestRequest(BaseModel):
     """Validated ingest request."""
 
-    source: str = Field(..., pattern=r"^(products|feedback|documents)$")
+    source: Literal["products", "feedback", "documents"]
     product_id: Optional[str] = Field(None, pattern=r"^[a-zA-Z0-9\-_]{1,100}$")
 
-    @field_validator("source")
-    @classmethod
-    def validate_source(cls, v: str) -> str:
-        """Validate source type."""
-        allowed_sources = ["products", "feedback", "documents"]
-        if v not in allowed_sources:
-            raise ValueError(f"source must be one of: {', '.join(allowed_sources)}")
-        return v
-
 
 class CogneeQueryRequest(BaseModel):
     """Validated Cognee query request."""
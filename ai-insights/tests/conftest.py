@@ -12,6 +12,9 @@ import os
 import sys
 from unittest.mock import MagicMock, AsyncMock
 
+# Parse CSV uploads in a thread: a spawned process pool can't see the mocks below
+os.environ.setdefault("CSV_PARSE_WORKERS", "0")
+
 # ============================================================================
 # MODULE-LEVEL MOCKING (runs BEFORE any test imports)
 # ============================================================================
@@ -150,6 +153,21 @@ from unittest.mock import patch
 
 import pytest
 
+# ============================================================================
+# CACHE ISOLATION
+# ============================================================================
+
+
+@pytest.fixture(autouse=True)
+def reset_query_caches():
+    """Clear semantic query caches so cached answers never leak between tests."""
+    from ai_insights.utils.semantic_cache import reset_semantic_caches
+
+    reset_semantic_caches()
+    yield
+    reset_semantic_caches()
+
+
 # ============================================================================
 # ENVIRONMENT FIXTURES
 # ============================================================================
@@ -316,9 +334,9 @@ def mock_orchestrator() -> MagicMock:
     mock = MagicMock()
     mock.orchestrate = AsyncMock()
 
-    # Create a mock response object with dict() method
+    # Create a mock response object with model_dump() method
     mock_response = MagicMock()
-    mock_response.dict.return_value = {
+    mock_response.model_dump.return_value = {
         "success": True,
         "query": "test query",
         "answer": "Orchestrated answer",
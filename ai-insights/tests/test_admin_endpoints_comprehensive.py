@@ -85,6 +85,18 @@ class TestVerifyAdminKey:
             assert exc_info.value.status_code == 403
             assert "Invalid" in exc_info.value.detail
 
+    @pytest.mark.asyncio
+    async def test_verify_admin_key_prefix_rejected(self):
+        """A prefix of the real key should be rejected (non-ASCII keys supported)."""
+        from ai_insights.admin_endpoints import verify_admin_key
+
+        with patch.dict(os.environ, {"ADMIN_API_KEY": "clé-secrète"}):
+            assert await verify_admin_key(x_admin_key="clé-secrète") is True
+            with pytest.raises(HTTPException) as exc_info:
+                await verify_admin_key(x_admin_key="clé")
+
+            assert exc_info.value.status_code == 403
+
 
 class TestTriggerCognify:
     """Test cognify trigger endpoint."""
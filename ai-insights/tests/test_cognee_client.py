@@ -200,6 +200,73 @@ class TestCogneeClientAddData:
         call_kwargs = mock_cognee.add.call_args[1]
         assert call_kwargs.get("node_set") == "products"
 
+    @pytest.mark.asyncio
+    @patch('ai_insights.cognee.cognee_client.cognee')
+    async def test_add_data_batch_serializes_dicts(self, mock_cognee):
+        """Should pass a list payload to Cognee in one call, JSON-encoding dicts."""
+        from ai_insights.cognee.cognee_client import CogneeClient
+        
+        mock_cognee.add = AsyncMock(return_value="success")
+        
+        client = CogneeClient()
+        client.initialized = True
+        CogneeClient._class_initialized = True
+        
+        await client.add_data([{"id": "p1"}, "plain text"], node_set="products")
+        
+        mock_cognee.add.assert_called_once()
+        payload = mock_cognee.add.call_args[0][0]
+        assert isinstance(payload, list)
+        assert '"id": "p1"' in payload[0]
+        assert payload[1] == "plain text"
+
+    @pytest.mark.asyncio
+    @patch('ai_insights.cognee.cognee_client.cognee')
+    async def test_add_data_serializes_non_json_values(self, mock_cognee):
+        """Should stringify datetimes and non-string keys instead of failing."""
+        from datetime import datetime
+
+        from ai_insights.cognee.cognee_client import CogneeClient
+
+        mock_cognee.add = AsyncMock(return_value="success")
+
+        client = CogneeClient()
+        client.initialized = True
+        CogneeClient._class_initialized = True
+
+        await client.add_data({"when": datetime(2024, 1, 2), 1: "one"})
+
+        payload = mock_cognee.add.call_args[0][0]
+        assert '"when": "2024-01-02T00:00:00"' in payload
+        assert '"1": "one"' in payload
+
+    @pytest.mark.asyncio
+    @patch('ai_insights.cognee.cognee_client.cognee')
+    async def test_add_data_batch_duplicate_retries_items(self, mock_cognee):
+        """A duplicate in a batch should not drop the batch's new items."""
+        from ai_insights.cognee.cognee_client import CogneeClient
+
+        stored = {"old"}
+
+        async def add(data, **kwargs):
+            items = data if isinstance(data, list) else [data]
+            if stored.intersection(items):
+                raise Exception("UNIQUE constraint failed: data.id")
+            stored.update(items)
+            return "success"
+
+        mock_cognee.add = AsyncMock(side_effect=add)
+
+        client = CogneeClient()
+        client.initialized = True
+        CogneeClient._class_initialized = True
+
+        await client.add_data(["new-1", "old", "new-2"], node_set="products")
+
+        assert stored == {"old", "new-1", "new-2"}
+        assert mock_cognee.add.await_count == 4
+        assert mock_cognee.add.call_args[1]["node_set"] == "products"
+
 
 class TestCogneeClientCognify:
     """Test cognify method."""
@@ -313,6 +380,44 @@ class TestCogneeClientCaching:
         # Should have removed oldest entries
         assert len(CogneeClient._query_cache) <= 101
 
+    def test_cache_result_evicts_least_recently_used(self):
+        """Should evict the least recently used entry, keeping recent hits."""
+        from ai_insights.cognee.cognee_client import CogneeClient
+
+        client = CogneeClient()
+        CogneeClient._query_cache.clear()
+
+        for i in range(100):
+            client._cache_result(f"key_{i}", {"data": i})
+
+        assert client._get_cached_result("key_0") == {"data": 0}
+        client._cache_result("new_key", {"data": "new"})
+
+        assert len(CogneeClient._query_cache) == 100
+        assert "key_0" in CogneeClient._query_cache
+        assert "key_1" not in CogneeClient._query_cache
+        assert "new_key" in CogneeClient._query_cache
+
+    def test_cache_safe_under_concurrent_threads(self):
+        """Concurrent reads, writes and evictions from threads should not raise."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from ai_insights.cognee.cognee_client import CogneeClient
+
+        client = CogneeClient()
+        CogneeClient._query_cache.clear()
+
+        def hammer(worker):
+            for i in range(500):
+                key = f"key_{(worker * 7 + i) % 150}"
+                client._cache_result(key, {"data": i})
+                client._get_cached_result(key)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(hammer, range(8)))
+
+        assert len(CogneeClient._query_cache) <= 100
+
 
 class TestCogneeClientQuery:
     """Test query methods."""
@@ -318,6 +318,26 @@ class TestCaching:
         
         assert len(loader._query_cache) <= 101
 
+    def test_cache_safe_under_concurrent_threads(self):
+        """Concurrent reads, writes and evictions from threads should not raise."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from ai_insights.cognee.cognee_lazy_loader import CogneeLazyLoader
+
+        loader = CogneeLazyLoader()
+
+        def hammer(worker):
+            for i in range(500):
+                key = f"key_{(worker * 7 + i) % 150}"
+                loader._store_cache(key, {"data": i})
+                loader._check_cache(key)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(hammer, range(8)))
+
+        assert len(loader._query_cache) <= 100
+        assert loader._cache_hits + loader._cache_misses == 8 * 500
+
 
 class TestPerformanceTracking:
     """Test performance tracking functionality."""
@@ -349,6 +349,24 @@ class TestLoadProductData:
 
         assert docs == []
 
+    @patch("ai_insights.retrieval.document_loader.get_embeddings")
+    @patch("ai_insights.retrieval.document_loader.get_vector_store")
+    def test_load_product_payloads_matches_documents(self, mock_vector_store, mock_embeddings):
+        """Cognee payloads should carry the same text and metadata as the documents."""
+        from ai_insights.retrieval.document_loader import DocumentLoader
+
+        loader = DocumentLoader()
+
+        products = [{"id": "prod_001", "name": "PayLink", "region": "EU"}]
+
+        docs, payloads = loader.load_product_payloads(products)
+
+        assert len(docs) == len(payloads) == 1
+        assert payloads[0]["type"] == "product"
+        assert payloads[0]["content"] == docs[0].text
+        assert payloads[0]["product_id"] == docs[0].metadata["product_id"] == "prod_001"
+        assert docs[0].text == loader.load_product_data(products)[0].text
+
 
 class TestLoadFeedbackData:
     """Test converting feedback data to documents."""
@@ -505,6 +523,7 @@ class TestIngestDocuments:
 
         mock_vs_instance = MagicMock()
         mock_vs_instance.insert.return_value = ["id1", "id2", "id3", "id4", "id5"]
+        mock_vs_instance.stored_chunks.return_value = (set(), {})
         mock_vector_store.return_value = mock_vs_instance
 
         loader = DocumentLoader()
@@ -520,6 +539,92 @@ class TestIngestDocuments:
         mock_emb_instance.embed_and_quantize.assert_called()
         mock_vs_instance.insert.assert_called()
 
+    @patch("ai_insights.retrieval.document_loader.get_embeddings")
+    @patch("ai_insights.retrieval.document_loader.get_vector_store")
+    def test_ingest_skips_unchanged_and_embeds_duplicates_once(self, mock_vector_store, mock_embeddings):
+        """Stored-unchanged chunks are skipped; repeated texts are embedded once and fanned out."""
+        import numpy as np
+        from llama_index.core import Document
+
+        from ai_insights.retrieval.document_loader import DocumentLoader
+
+        loader = DocumentLoader()
+        loader.embeddings = MagicMock()
+        loader.embeddings.embed_and_quantize.side_effect = lambda texts: (
+            np.arange(len(texts), dtype=np.float32).reshape(-1, 1),
+            np.zeros((len(texts), 1), dtype=np.uint8),
+        )
+        loader.vector_store = MagicMock()
+        loader.vector_store.stored_chunks.return_value = ({0}, {})
+        loader.vector_store.insert.side_effect = lambda **kw: [f"{d}_0" for d in kw["doc_ids"]]
+
+        docs = [
+            Document(text="Stored", metadata={"file_path": "a.txt"}),
+            Document(text="Dup", metadata={"file_path": "b.txt"}),
+            Document(text="Dup", metadata={"file_path": "c.txt"}),
+            Document(text="Dup", metadata={"file_path": "c.txt"}),  # Same ID as the one above
+        ]
+
+        count = loader.ingest_documents(docs)
+
+        assert count == 3
+        loader.embeddings.embed_and_quantize.assert_called_once_with(["Dup"])
+        insert = loader.vector_store.insert.call_args.kwargs
+        assert len(set(insert["doc_ids"])) == 2
+        assert insert["float_embeddings"].tolist() == [[0.0], [0.0]]
+
+    @patch("ai_insights.retrieval.document_loader.get_embeddings")
+    @patch("ai_insights.retrieval.document_loader.get_vector_store")
+    def test_ingest_reuses_stored_vectors_for_unchanged_text(self, mock_vector_store, mock_embeddings):
+        """Chunks whose text is already stored should reuse that vector; only new text is embedded."""
+        import numpy as np
+        from llama_index.core import Document
+
+        from ai_insights.retrieval.document_loader import DocumentLoader
+
+        loader = DocumentLoader()
+        loader.embeddings = MagicMock()
+        loader.embeddings.embed_and_quantize.side_effect = lambda texts: (
+            np.full((len(texts), 1), 2.0, dtype=np.float32),
+            np.zeros((len(texts), 1), dtype=np.uint8),
+        )
+        loader.vector_store = MagicMock()
+        loader.vector_store.stored_chunks.return_value = (
+            set(), {"Relinked": np.array([1.0], dtype=np.float32)}
+        )
+        loader.vector_store.insert.side_effect = lambda **kw: kw["doc_ids"]
+
+        docs = [
+            Document(text="Relinked", metadata={"file_path": "a.txt", "product_id": "new"}),
+            Document(text="Fresh", metadata={"file_path": "b.txt"}),
+        ]
+
+        assert loader.ingest_documents(docs) == 2
+        loader.embeddings.embed_and_quantize.assert_called_once_with(["Fresh"])
+        assert loader.vector_store.insert.call_args.kwargs["float_embeddings"].tolist() == [[1.0], [2.0]]
+
+    @patch("ai_insights.retrieval.document_loader.get_embeddings")
+    @patch("ai_insights.retrieval.document_loader.get_vector_store")
+    def test_ingest_records_builds_documents(self, mock_vector_store, mock_embeddings):
+        """Should wrap id/text/metadata records as Documents for the pipeline."""
+        from ai_insights.retrieval.document_loader import DocumentLoader
+
+        loader = DocumentLoader()
+
+        with patch.object(loader, "ingest_documents", return_value=2) as mock_ingest:
+            count = loader.ingest_records(
+                [
+                    {"id": "JIRA-1", "text": "First", "metadata": {"status": "Open"}},
+                    {"id": "JIRA-2", "text": "Second", "metadata": {"status": "Done"}},
+                ]
+            )
+
+        assert count == 2
+        documents = mock_ingest.call_args[0][0]
+        assert [d.doc_id for d in documents] == ["JIRA-1", "JIRA-2"]
+        assert documents[1].text == "Second"
+        assert documents[0].metadata == {"status": "Open"}
+
 
 class TestIngestFromDirectory:
     """Test directory ingestion."""
@@ -45,7 +45,7 @@ def mock_heavy_modules():
     mock_orchestration = MagicMock()
     mock_orchestrator = AsyncMock()
     mock_orchestrator.orchestrate = AsyncMock(return_value=MagicMock(
-        dict=MagicMock(return_value={"success": True, "answer": "mocked"})
+        model_dump=MagicMock(return_value={"success": True, "answer": "mocked"})
     ))
     mock_orchestration.get_production_orchestrator = MagicMock(return_value=mock_orchestrator)
     
@@ -218,6 +218,19 @@ class TestDocumentProductLinking:
         assert response.status_code == 200
         assert response.json()["success"] is True
 
+    def test_job_id_is_content_addressed(self, client):
+        """Same document + product gives the same job ID; another product doesn't."""
+        def upload(product_id):
+            return client.post(
+                "/upload/document",
+                files={"file": ("same.pdf", b"%PDF same", "application/pdf")},
+                params={"product_id": product_id}
+            ).json()["job_id"]
+
+        first = upload("prod-1")
+        assert upload("prod-1") == first
+        assert upload("prod-2") != first
+
 
 # ============================================================================
 # JOB STATUS TESTS
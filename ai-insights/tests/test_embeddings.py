@@ -91,6 +91,20 @@ class TestEmbedText:
         call_args = mock_model.encode.call_args
         assert isinstance(call_args[0][0], list)
 
+    @patch("ai_insights.retrieval.embeddings.SentenceTransformer")
+    def test_embed_text_uses_batched_encode(self, mock_st):
+        """Lists should be encoded in a single batched call."""
+        from ai_insights.retrieval.embeddings import EMBEDDING_BATCH_SIZE, BinaryEmbeddings
+
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.random.rand(100, 384).astype(np.float32)
+        mock_st.return_value = mock_model
+
+        BinaryEmbeddings().embed_text([f"Text {i}" for i in range(100)])
+
+        mock_model.encode.assert_called_once()
+        assert mock_model.encode.call_args.kwargs["batch_size"] == EMBEDDING_BATCH_SIZE
+
 
 class TestQuantizeToBinary:
     """Test binary quantization."""
@@ -158,6 +172,22 @@ class TestQuantizeToBinary:
         assert binary.shape == (5, 48)
         assert binary.dtype == np.uint8
 
+    @patch("ai_insights.retrieval.embeddings.SentenceTransformer")
+    def test_quantize_matches_bitwise_packing(self, mock_st):
+        """Vectorized packing should match MSB-first per-bit packing."""
+        from ai_insights.retrieval.embeddings import BinaryEmbeddings
+
+        embeddings = BinaryEmbeddings()
+        embeddings.dim = 384
+
+        float_emb = np.random.randn(4, 384).astype(np.float32)
+        bits = (float_emb > 0).astype(np.uint8)
+        expected = np.zeros((4, 48), dtype=np.uint8)
+        for bit_idx in range(384):
+            expected[:, bit_idx // 8] |= bits[:, bit_idx] << (7 - bit_idx % 8)
+
+        np.testing.assert_array_equal(embeddings.quantize_to_binary(float_emb), expected)
+
 
 class TestEmbedAndQuantize:
     """Test combined embed and quantize operation."""
@@ -282,6 +312,41 @@ class TestBatchHammingDistance:
 
         assert isinstance(distances, np.ndarray)
 
+    @patch("ai_insights.retrieval.embeddings.SentenceTransformer")
+    def test_batch_hamming_matches_bit_count(self, mock_st):
+        """Word and lookup-table popcounts should match counting unpacked bits on 384-bit codes."""
+        from ai_insights.retrieval.embeddings import BinaryEmbeddings
+
+        embeddings = BinaryEmbeddings()
+        rng = np.random.default_rng(0)
+        query = rng.integers(0, 256, 48, dtype=np.uint8)
+        corpus = rng.integers(0, 256, (100, 48), dtype=np.uint8)
+
+        distances = embeddings.batch_hamming_distance(query, corpus)
+
+        expected = np.unpackbits(np.bitwise_xor(query, corpus), axis=1).sum(axis=1)
+        assert distances.tolist() == expected.tolist()
+        assert embeddings.hamming_distance(query, corpus[0]) == expected[0]
+        with patch("ai_insights.retrieval.embeddings._HAS_BITWISE_COUNT", False):
+            assert embeddings.batch_hamming_distance(query, corpus).tolist() == expected.tolist()
+
+
+    @patch("ai_insights.retrieval.embeddings.SentenceTransformer")
+    def test_batch_hamming_uses_simsimd_when_installed(self, mock_st):
+        """With simsimd available the batched scan should go through its b8 Hamming kernel."""
+        from ai_insights.retrieval.embeddings import BinaryEmbeddings
+
+        fake_simsimd = MagicMock()
+        fake_simsimd.cdist.return_value = np.array([[0.0, 16.0]])
+        embeddings = BinaryEmbeddings()
+        query = np.array([255, 0], dtype=np.uint8)
+        corpus = np.array([[255, 0], [0, 255]], dtype=np.uint8)
+
+        with patch("ai_insights.retrieval.embeddings.simsimd", fake_simsimd):
+            distances = embeddings.batch_hamming_distance(query, corpus)
+
+        assert distances.tolist() == [0, 16]
+        assert fake_simsimd.cdist.call_args.kwargs == {"metric": "hamming", "dtype": "b8"}
 
 class TestGetEmbeddings:
     """Test singleton factory function."""
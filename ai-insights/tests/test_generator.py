@@ -6,6 +6,7 @@ Tests the actual implementation:
 - generate() method
 - generate_product_insight() method
 - generate_portfolio_insight() method
+- stream() / stream_portfolio_insight() methods
 - get_generator() singleton function
 """
 
@@ -21,11 +22,11 @@ class TestInsightGeneratorInit:
     def test_init_with_api_key(self):
         """Should initialize with API key."""
         with patch("ai_insights.utils.generator.Groq") as mock_groq:
-            from ai_insights.utils.generator import InsightGenerator
+            from ai_insights.utils.generator import LLM_MAX_RETRIES, InsightGenerator
 
             generator = InsightGenerator(api_key="test-key", model="test-model")
 
-            mock_groq.assert_called_once_with(api_key="test-key")
+            mock_groq.assert_called_once_with(api_key="test-key", max_retries=LLM_MAX_RETRIES)
             assert generator.model == "test-model"
 
     def test_init_without_api_key(self):
@@ -160,6 +161,31 @@ class TestGenerate:
             assert result["usage"]["total_tokens"] == 150
             assert len(result["sources"]) == 1
 
+    def test_generate_holds_llm_slot_during_request(self):
+        """The Groq request should run while holding a process-wide LLM slot."""
+        import threading
+
+        slots = threading.BoundedSemaphore(1)
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.side_effect = lambda **kw: self.assert_slot_taken(slots)
+
+        with (
+            patch("ai_insights.utils.generator.Groq", return_value=mock_client),
+            patch("ai_insights.utils.generator.llm_slots", slots),
+        ):
+            from ai_insights.utils.generator import InsightGenerator
+
+            result = InsightGenerator(api_key="test-key").generate(query="q", retrieved_chunks=[])
+
+        # A failed in-slot check would surface as success=False (generate catches errors)
+        assert result["success"] is True
+        assert slots.acquire(blocking=False)
+
+    @staticmethod
+    def assert_slot_taken(slots):
+        assert not slots.acquire(blocking=False)
+        return MagicMock()
+
     def test_generate_without_client(self):
         """Should return error when client not configured."""
         with patch("ai_insights.utils.generator.Groq"):
@@ -506,3 +532,49 @@ class TestSourcesTruncation:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestStreamInsight:
+    """Test streaming generation."""
+
+    def test_stream_yields_non_empty_deltas(self):
+        """Should request a streamed completion and yield only text deltas."""
+        def chunk(content):
+            c = MagicMock()
+            c.choices = [MagicMock()]
+            c.choices[0].delta.content = content
+            return c
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value = iter([chunk("Port"), chunk(None), chunk("folio")])
+
+        with patch("ai_insights.utils.generator.Groq", return_value=mock_client):
+            from ai_insights.utils.generator import InsightGenerator
+
+            generator = InsightGenerator(api_key="test-key")
+            chunks, deltas = generator.stream_portfolio_insight([{"id": "1", "name": "P1"}], "Query")
+
+            assert list(deltas) == ["Port", "folio"]
+            assert chunks[0]["metadata"] == {"source": "portfolio", "product_id": "1"}
+            call_kwargs = mock_client.chat.completions.create.call_args[1]
+            assert call_kwargs["stream"] is True
+            assert "portfolio" in call_kwargs["messages"][0]["content"].lower()
+
+    def test_format_sources_truncates_text(self):
+        """Sources should carry truncated text, metadata and score."""
+        from ai_insights.utils.generator import InsightGenerator
+
+        sources = InsightGenerator.format_sources([{"text": "x" * 300, "metadata": {"a": 1}, "distance": 0.2}])
+
+        assert sources == [{"text": "x" * 200 + "...", "metadata": {"a": 1}, "score": 0.2}]
+
+    def test_stream_without_client_raises(self):
+        """Should raise when no API key is configured."""
+        with patch.dict("os.environ", {}, clear=True):
+            from ai_insights.utils.generator import InsightGenerator
+
+            generator = InsightGenerator(api_key=None)
+            generator.client = None
+
+            with pytest.raises(RuntimeError, match="not configured"):
+                list(generator.stream("Query", []))
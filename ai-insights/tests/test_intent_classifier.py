@@ -284,6 +284,55 @@ class TestKeywordPatterns:
         assert "compare" in IntentClassifier.MIXED_KEYWORDS
 
 
+class TestKeywordMatcher:
+    """Test single-pass keyword scoring."""
+
+    def test_counts_distinct_keywords_per_list(self):
+        """Shared keywords count for every list; repeats count once."""
+        from ai_insights.orchestration.intent_classifier import _KeywordMatcher
+
+        matcher = _KeywordMatcher({"a": ["what led to", "trend"], "b": ["what led to", "due to"]})
+
+        assert matcher.scores("what led to the trend? the trend was due to x") == {"a": 2, "b": 2}
+        assert matcher.scores("nothing here") == {"a": 0, "b": 0}
+
+    def test_regex_scan_finds_overlapping_keywords(self):
+        """Without pyahocorasick, keywords nested in or overlapping others should still count."""
+        from ai_insights.orchestration import intent_classifier
+
+        with patch.object(intent_classifier, "ahocorasick", None):
+            matcher = intent_classifier._KeywordMatcher(
+                {"a": ["current", "currently", "now"], "b": ["tly now", "a.b"]}
+            )
+
+        assert matcher.scores("currently now") == {"a": 3, "b": 1}
+        assert matcher.scores("axb") == {"a": 0, "b": 0}
+
+    def test_uses_automaton_when_available(self):
+        """With pyahocorasick installed, matches should come from one automaton scan."""
+        from ai_insights.orchestration import intent_classifier
+
+        class FakeAutomaton:
+            def __init__(self):
+                self.words = []
+
+            def add_word(self, key, value):
+                self.words.append(value)
+
+            def make_automaton(self):
+                pass
+
+            def iter(self, text):
+                return ((text.find(w), w) for w in self.words if w in text)
+
+        fake_module = MagicMock(Automaton=FakeAutomaton)
+        with patch.object(intent_classifier, "ahocorasick", fake_module):
+            matcher = intent_classifier._KeywordMatcher({"a": ["current", "currently"]})
+
+        assert matcher._automaton is not None
+        assert matcher.scores("currently") == {"a": 2}
+
+
 class TestGetIntentClassifier:
     """Test get_intent_classifier singleton function."""
 
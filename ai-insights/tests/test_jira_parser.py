@@ -5,9 +5,12 @@ Tests the actual implementation:
 - parse_jira_csv() function
 - match_products() function
 - get_ingestion_summary() function
+- parse_jira_csv_file() function
 """
 
+import os
 from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -364,6 +367,130 @@ TEST-3,Ticket 3,Open,Epic B"""
         assert summary["by_epic"] == {}
 
 
+class TestColumnResolution:
+    """Test header-based column resolution in parse_jira_csv."""
+
+    def test_case_insensitive_headers(self):
+        """Lower-case Jira headers should resolve like the canonical names."""
+        from ai_insights.utils.jira_parser import parse_jira_csv
+
+        docs = parse_jira_csv("issue key,SUMMARY,status\nTEST-1,Summary text,Open")
+
+        assert docs[0]["metadata"]["issue_key"] == "TEST-1"
+        assert docs[0]["metadata"]["status"] == "Open"
+
+    def test_short_rows_and_extra_values(self):
+        """Missing trailing cells should read as None; extra cells should be ignored."""
+        from ai_insights.utils.jira_parser import parse_jira_csv
+
+        docs = parse_jira_csv("Issue key,Summary,Status\nTEST-1,Short\nTEST-2,Long,Done,extra,cells\n\n")
+
+        assert [d["metadata"]["status"] for d in docs] == [None, "Done"]
+
+    def test_resolve_column_prefers_exact_then_last_duplicate(self):
+        """Exact names win over case-insensitive ones; duplicates resolve to the last column."""
+        from ai_insights.utils.jira_parser import _resolve_column
+
+        assert _resolve_column(["summary", "Summary"], "Summary") == 1
+        assert _resolve_column(["Key", "Sprint", "Key"], "Key") == 2
+        assert _resolve_column(["Status"], "Missing", "status") == 0
+        assert _resolve_column(["Status"], "Missing") is None
+
+
+class TestParseJiraCsvLines:
+    """Test parse_jira_csv with an iterable of lines instead of a string."""
+
+    def test_parse_from_file_object(self, tmp_path):
+        """Should parse the same documents from an open file as from its text."""
+        from ai_insights.utils.jira_parser import parse_jira_csv
+
+        csv_content = "Issue key,Summary,Status\nTEST-1,First,Open\nTEST-2,Second,Done\n"
+        csv_path = tmp_path / "export.csv"
+        csv_path.write_text(csv_content, encoding="utf-8")
+
+        with open(csv_path, encoding="utf-8", newline="") as f:
+            from_file = parse_jira_csv(f)
+
+        assert [d["id"] for d in from_file] == [d["id"] for d in parse_jira_csv(csv_content)]
+        assert len(from_file) == 2
+
+
+class TestParseJiraCsvFile:
+    """Test parse_jira_csv_file (process pool entry point)."""
+
+    def test_parses_and_removes_file(self, tmp_path):
+        """Should return documents + summary and delete the spooled upload."""
+        from ai_insights.utils.jira_parser import parse_jira_csv_file
+
+        csv_path = tmp_path / "upload.csv"
+        csv_path.write_text("Issue key,Summary,Status\nTEST-1,Café ticket,Open", encoding="utf-8")
+
+        documents, summary = parse_jira_csv_file(str(csv_path))
+
+        assert len(documents) == 1
+        assert summary["total_tickets"] == 1
+        assert not csv_path.exists()
+
+    @pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="posix_fadvise unavailable")
+    def test_advises_sequential_read(self, tmp_path):
+        """The scan descriptor should get sequential read-ahead advice."""
+        from ai_insights.utils.jira_parser import parse_jira_csv_file
+
+        csv_path = tmp_path / "upload.csv"
+        csv_path.write_text("Issue key,Summary\nTEST-1,Ticket", encoding="utf-8")
+
+        with (
+            patch("ai_insights.utils.jira_parser.pa_csv", None),
+            patch("ai_insights.utils.jira_parser.os.posix_fadvise") as fadvise,
+        ):
+            parse_jira_csv_file(str(csv_path))
+
+        assert fadvise.call_args[0][1:] == (0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+    def test_removes_file_on_decode_error(self, tmp_path):
+        """The upload should be removed even if it can't be decoded."""
+        from ai_insights.utils.jira_parser import parse_jira_csv_file
+
+        csv_path = tmp_path / "upload.csv"
+        csv_path.write_bytes(b"\xff\xfe bad")
+
+        with pytest.raises(UnicodeDecodeError):
+            parse_jira_csv_file(str(csv_path))
+        assert not csv_path.exists()
+
+
+    def test_arrow_matches_csv_reader(self, tmp_path):
+        """Arrow's columnar parse should produce the same documents as csv.reader."""
+        pytest.importorskip("pyarrow")
+        from ai_insights.utils.jira_parser import _parse_jira_csv_arrow, parse_jira_csv
+
+        csv_content = (
+            "Issue key,Summary,Status,Updated,Description\n"
+            'TEST-1,"Ticket with ""quotes""",Open,2024-01-05 10:00,"line one\nline two, comma"\n'
+            ",No key,Open,,\n"
+            "TEST-2,123,Done,,\n"
+        )
+        csv_path = tmp_path / "upload.csv"
+        csv_path.write_text(csv_content, encoding="utf-8")
+
+        assert _parse_jira_csv_arrow(str(csv_path)) == parse_jira_csv(csv_content)
+
+    def test_falls_back_to_csv_reader_when_arrow_declines(self, tmp_path):
+        """Files Arrow can't parse as-is (e.g. ragged rows) should still parse row by row."""
+        from ai_insights.utils.jira_parser import parse_jira_csv_file
+
+        csv_path = tmp_path / "upload.csv"
+        csv_path.write_text("Issue key,Summary,Status\nTEST-1,Short row\n", encoding="utf-8")
+
+        with (
+            patch("ai_insights.utils.jira_parser.pa_csv", MagicMock()),
+            patch("ai_insights.utils.jira_parser._parse_jira_csv_arrow", return_value=None) as arrow,
+        ):
+            documents, _ = parse_jira_csv_file(str(csv_path))
+
+        arrow.assert_called_once_with(str(csv_path))
+        assert [d["metadata"]["issue_key"] for d in documents] == ["TEST-1"]
+
 class TestEdgeCases:
     """Test edge cases and error handling."""
 
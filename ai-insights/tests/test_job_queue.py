@@ -0,0 +1,119 @@
+"""
+Tests for ai_insights.utils.job_queue module.
+
+Tests:
+- Jobs submitted to a running pool are executed by workers
+- Concurrency is capped at the worker count
+- A full queue raises asyncio.QueueFull
+- A failing job doesn't kill its worker
+"""
+
+import asyncio
+
+import pytest
+
+from ai_insights.utils.job_queue import JobQueue, get_job_queue, reset_job_queue
+
+
+class TestJobQueue:
+    """Test the bounded worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_runs_submitted_jobs(self):
+        """Submitted jobs should be run by the workers."""
+        queue = JobQueue(maxsize=10, workers=2)
+        await queue.start()
+        done = []
+
+        async def job():
+            done.append(True)
+
+        for _ in range(3):
+            queue.submit(job)
+        await queue._queue.join()
+        await queue.stop()
+
+        assert len(done) == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrency_capped_at_worker_count(self):
+        """No more jobs than workers should run at once."""
+        queue = JobQueue(maxsize=10, workers=2)
+        await queue.start()
+        in_flight = 0
+        peak = 0
+
+        async def job():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        for _ in range(6):
+            queue.submit(job)
+        await queue._queue.join()
+        await queue.stop()
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_full_queue_raises(self):
+        """Submitting past maxsize should raise QueueFull."""
+        queue = JobQueue(maxsize=1, workers=1)
+        await queue.start()
+        release = asyncio.Event()
+
+        async def blocker():
+            await release.wait()
+
+        queue.submit(blocker)
+        await asyncio.sleep(0)  # worker picks up the first job
+        queue.submit(blocker)
+
+        with pytest.raises(asyncio.QueueFull):
+            queue.submit(blocker)
+
+        release.set()
+        await queue._queue.join()
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_failing_job_does_not_kill_worker(self):
+        """A job exception should be logged and the worker keep going."""
+        queue = JobQueue(maxsize=10, workers=1)
+        await queue.start()
+        done = []
+
+        async def bad():
+            raise ValueError("boom")
+
+        async def good():
+            done.append(True)
+
+        queue.submit(bad)
+        queue.submit(good)
+        await queue._queue.join()
+        await queue.stop()
+
+        assert done == [True]
+
+    def test_submit_before_start_raises(self):
+        """Submitting to a stopped pool should raise RuntimeError."""
+        queue = JobQueue()
+
+        assert queue.running is False
+        with pytest.raises(RuntimeError):
+            queue.submit(lambda: None)
+
+
+class TestGetJobQueue:
+    """Test the global queue accessor."""
+
+    def teardown_method(self):
+        reset_job_queue()
+
+    def test_returns_singleton(self):
+        """Repeated calls should return the same queue."""
+        reset_job_queue()
+        assert get_job_queue() is get_job_queue()
@@ -0,0 +1,332 @@
+"""
+Tests for ai_insights.utils.job_store module.
+
+Tests:
+- InMemoryJobStore get/get_status/set/update semantics, TTL expiry and size cap
+- RedisJobStore orjson hash encoding, TTL refresh and decoding (with a fake Redis)
+- CachedJobStore micro-TTL caching and invalidation
+- get_job_store backend selection from REDIS_URL
+"""
+
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from ai_insights.utils.job_store import (
+    JOB_TTL_SECONDS,
+    CachedJobStore,
+    InMemoryJobStore,
+    RedisJobStore,
+    get_job_store,
+    reset_job_store,
+)
+
+
+class FakePipeline:
+    """Minimal async pipeline that records commands and applies them on execute."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def delete(self, key):
+        self._commands.append(("delete", key))
+
+    def hset(self, key, mapping):
+        self._commands.append(("hset", key, mapping))
+
+    def expire(self, key, ttl):
+        self._commands.append(("expire", key, ttl))
+
+    async def execute(self):
+        for command in self._commands:
+            if command[0] == "delete":
+                self._redis.hashes.pop(command[1], None)
+            elif command[0] == "hset":
+                self._redis.hashes.setdefault(command[1], {}).update(
+                    {k.encode(): v for k, v in command[2].items()}
+                )
+            elif command[0] == "expire":
+                self._redis.ttls[command[1]] = command[2]
+
+
+class FakeRedis:
+    """In-memory stand-in for redis.asyncio.Redis (hash commands only)."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.ttls = {}
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hget(self, key, field):
+        self.hget_calls = getattr(self, "hget_calls", 0) + 1
+        return self.hashes.get(key, {}).get(field.encode())
+
+    async def aclose(self):
+        self.closed = True
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def redis_store():
+    """RedisJobStore wired to a FakeRedis."""
+    store = RedisJobStore.__new__(RedisJobStore)
+    store._redis = FakeRedis()
+    store._ttl = JOB_TTL_SECONDS
+    store._prefix = "job:"
+    return store
+
+
+class TestInMemoryJobStore:
+    """Test the in-memory fallback store."""
+
+    @pytest.mark.asyncio
+    async def test_get_unknown_job_returns_none(self):
+        """Unknown jobs should return None."""
+        store = InMemoryJobStore()
+        assert await store.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_set_replaces_status(self):
+        """set() should replace the whole status dict."""
+        store = InMemoryJobStore()
+        await store.set("job1", {"status": "queued", "progress": 0})
+        await store.set("job1", {"status": "failed"})
+
+        assert await store.get("job1") == {"status": "failed"}
+
+    @pytest.mark.asyncio
+    async def test_update_merges_fields(self):
+        """update() should merge fields into the existing status."""
+        store = InMemoryJobStore()
+        await store.set("job1", {"status": "queued", "progress": 0})
+        await store.update("job1", status="processing", progress=50)
+
+        assert await store.get("job1") == {"status": "processing", "progress": 50}
+
+    @pytest.mark.asyncio
+    async def test_get_status_reads_status_field(self):
+        """get_status() should return only the status, or None for unknown jobs."""
+        store = InMemoryJobStore()
+        await store.set("job1", {"status": "queued", "progress": 0})
+
+        assert await store.get_status("job1") == "queued"
+        assert await store.get_status("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_get_returns_copy(self):
+        """Mutating a returned status should not change the stored job."""
+        store = InMemoryJobStore()
+        await store.set("job1", {"status": "queued"})
+
+        status = await store.get("job1")
+        status["status"] = "tampered"
+
+        assert (await store.get("job1"))["status"] == "queued"
+
+
+    @pytest.mark.asyncio
+    async def test_expired_jobs_are_dropped(self):
+        """Jobs older than the TTL should be unreadable and pruned on the next write."""
+        store = InMemoryJobStore(ttl_seconds=10)
+        with patch("ai_insights.utils.job_store.time.monotonic", return_value=100.0):
+            await store.set("old", {"status": "completed"})
+
+        with patch("ai_insights.utils.job_store.time.monotonic", return_value=111.0):
+            assert await store.get("old") is None
+            await store.set("new", {"status": "queued"})
+
+        assert list(store._jobs) == ["new"]
+
+    @pytest.mark.asyncio
+    async def test_drops_least_recently_written_over_cap(self):
+        """The store should never hold more than max_jobs jobs."""
+        store = InMemoryJobStore(max_jobs=2)
+        for job_id in ("a", "b", "c"):
+            await store.set(job_id, {"status": "queued"})
+
+        assert list(store._jobs) == ["b", "c"]
+        assert await store.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_update_refreshes_expiry(self):
+        """update() should move the job to the back of the expiry order."""
+        store = InMemoryJobStore()
+        await store.set("a", {"status": "queued"})
+        await store.set("b", {"status": "queued"})
+        await store.update("a", status="processing")
+
+        assert list(store._jobs) == ["b", "a"]
+
+
+class TestRedisJobStore:
+    """Test the Redis-backed store."""
+
+    @pytest.mark.asyncio
+    async def test_set_and_get_roundtrip(self, redis_store):
+        """Nested values should survive JSON encoding per hash field."""
+        await redis_store.set("job1", {"status": "completed", "stats": {"ingested": 3}})
+
+        assert await redis_store.get("job1") == {"status": "completed", "stats": {"ingested": 3}}
+
+    @pytest.mark.asyncio
+    async def test_update_only_touches_given_fields(self, redis_store):
+        """update() should write only the given fields and refresh the TTL."""
+        await redis_store.set("job1", {"status": "queued", "progress": 0})
+        await redis_store.update("job1", progress=50)
+
+        raw = redis_store._redis.hashes["job:job1"]
+        assert json.loads(raw[b"status"]) == "queued"
+        assert json.loads(raw[b"progress"]) == 50
+        assert redis_store._redis.ttls["job:job1"] == JOB_TTL_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_set_clears_previous_fields(self, redis_store):
+        """set() should drop fields that are not in the new status."""
+        await redis_store.set("job1", {"status": "queued", "progress": 0})
+        await redis_store.set("job1", {"status": "failed"})
+
+        assert await redis_store.get("job1") == {"status": "failed"}
+
+    @pytest.mark.asyncio
+    async def test_get_unknown_job_returns_none(self, redis_store):
+        """Missing hashes should return None."""
+        assert await redis_store.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_get_status_is_single_hget(self, redis_store):
+        """get_status() should decode one field rather than the whole hash."""
+        await redis_store.set("job1", {"status": "processing", "progress": 50})
+
+        assert await redis_store.get_status("job1") == "processing"
+        assert await redis_store.get_status("missing") is None
+        assert redis_store._redis.hget_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_close_through_cache(self, redis_store):
+        """Closing the cached store should close the Redis connection."""
+        store = CachedJobStore(redis_store)
+        await store.close()
+
+        assert redis_store._redis.closed is True
+
+
+class CountingStore(InMemoryJobStore):
+    """In-memory store that counts reads."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    async def get(self, job_id):
+        self.reads += 1
+        return await super().get(job_id)
+
+
+class TestCachedJobStore:
+    """Test the micro-TTL read cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_reads_hit_cache(self):
+        """Polls within the TTL should not reach the backing store."""
+        inner = CountingStore()
+        store = CachedJobStore(inner, ttl_seconds=60)
+        await store.set("job1", {"status": "queued"})
+
+        for _ in range(5):
+            assert (await store.get("job1"))["status"] == "queued"
+
+        assert inner.reads == 1
+
+    @pytest.mark.asyncio
+    async def test_update_invalidates_entry(self):
+        """A local write should be visible on the next read."""
+        inner = CountingStore()
+        store = CachedJobStore(inner, ttl_seconds=60)
+        await store.set("job1", {"status": "queued"})
+        await store.get("job1")
+
+        await store.update("job1", status="completed")
+
+        assert (await store.get("job1"))["status"] == "completed"
+        assert inner.reads == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_refetched(self):
+        """Entries older than the TTL should be re-read."""
+        inner = CountingStore()
+        store = CachedJobStore(inner, ttl_seconds=0)
+        await store.set("job1", {"status": "queued"})
+
+        await store.get("job1")
+        await store.get("job1")
+
+        assert inner.reads == 2
+
+    @pytest.mark.asyncio
+    async def test_get_status_bypasses_cache(self):
+        """Duplicate-submit checks should always read the backing store."""
+        inner = InMemoryJobStore()
+        store = CachedJobStore(inner, ttl_seconds=60)
+        await store.set("job1", {"status": "queued"})
+        await store.get("job1")
+
+        await inner.update("job1", status="processing")
+
+        assert await store.get_status("job1") == "processing"
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        """The cache should stay within max_entries."""
+        store = CachedJobStore(InMemoryJobStore(), ttl_seconds=60, max_entries=2)
+        for job_id in ("a", "b", "c"):
+            await store.get(job_id)
+
+        assert list(store._cache) == ["b", "c"]
+
+
+class TestGetJobStore:
+    """Test backend selection."""
+
+    def setup_method(self):
+        reset_job_store()
+
+    def teardown_method(self):
+        reset_job_store()
+
+    def test_defaults_to_in_memory(self, monkeypatch):
+        """Without REDIS_URL the in-memory store should be used."""
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        assert isinstance(get_job_store(), InMemoryJobStore)
+
+    def test_returns_singleton(self, monkeypatch):
+        """Repeated calls should return the same store."""
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        assert get_job_store() is get_job_store()
+
+    def test_warns_for_in_memory_with_multiple_workers(self, monkeypatch):
+        """Multi-worker deployments without REDIS_URL should be warned about."""
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        monkeypatch.setenv("WEB_CONCURRENCY", "4")
+        with patch("ai_insights.utils.job_store.logger") as logger:
+            get_job_store()
+
+        assert "REDIS_URL" in logger.warning.call_args[0][0]
+
+    def test_falls_back_when_redis_missing(self, monkeypatch):
+        """REDIS_URL without the redis package should fall back to in-memory."""
+        monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+        with patch.dict(sys.modules, {"redis": None, "redis.asyncio": None}):
+            assert isinstance(get_job_store(), InMemoryJobStore)
@@ -0,0 +1,45 @@
+"""
+Tests for ai_insights.config.logger module.
+
+Tests:
+- Structured lines reach stdout through the background writer
+- Exceptions survive the queue hand-off
+"""
+
+import logging.handlers
+import sys
+import uuid
+
+from ai_insights.config import logger as logger_module
+
+
+def _flush():
+    """Drain the writer thread, then restart it for later tests."""
+    logger_module._stop_listener()
+    logger_module._start_listener()
+
+
+class TestQueuedLogging:
+    """Test non-blocking console logging."""
+
+    def test_console_handler_is_queued(self):
+        """Loggers should enqueue records instead of writing to stdout themselves."""
+        log = logger_module.setup_logger(f"test-{uuid.uuid4()}")
+
+        assert [type(h) for h in log.handlers] == [logging.handlers.QueueHandler]
+
+    def test_structured_line_with_exception_is_written(self, capsys, monkeypatch):
+        """The writer should print the structured line, traceback included."""
+        monkeypatch.setattr(logger_module._console_handler, "stream", sys.stdout)
+        log = logger_module.setup_logger(f"test-{uuid.uuid4()}")
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            log.warning("retrieval failed", exc_info=True)
+        _flush()
+
+        out = capsys.readouterr().out
+        assert "level=WARNING" in out
+        assert "message=retrieval failed" in out
+        assert "ValueError: boom" in out
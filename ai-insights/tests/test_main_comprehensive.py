@@ -49,7 +49,7 @@ def mock_ingestion_modules():
     mock_orchestration = MagicMock()
     mock_orchestrator_instance = AsyncMock()
     mock_orchestrator_instance.orchestrate = AsyncMock(return_value=MagicMock(
-        dict=MagicMock(return_value={
+        model_dump=MagicMock(return_value={
             "success": True,
             "query": "test",
             "answer": "mocked answer",
@@ -309,6 +309,25 @@ class TestHealthEndpoint:
         data = response.json()
         assert "cognee_initialized" in data
 
+    def test_health_not_modified_for_matching_etag(self, client):
+        """A matching If-None-Match should get an empty 304."""
+        etag = client.get("/health").headers["etag"]
+
+        response = client.get("/health", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_health_reuses_recent_vector_count(self, client):
+        """Probes within the TTL window should not hit the vector store again."""
+        vs = MagicMock()
+        vs.count.return_value = 7
+        with patch("main.get_lazy_vector_store", return_value=vs):
+            for _ in range(3):
+                assert client.get("/health").json()["vector_store"]["document_count"] == 7
+
+        vs.count.assert_called_once()
+
 
 # ============================================================================
 # METRICS ENDPOINT TESTS
@@ -417,6 +436,127 @@ class TestProductInsightEndpoint:
                 )
                 assert response.status_code == 200
 
+    def test_product_insight_unknown_type_rejected(self, client):
+        """Unknown insight types should be rejected before any work is done."""
+        with patch("main.fetch_from_supabase", new_callable=AsyncMock) as mock_fetch:
+            response = client.post(
+                "/product-insight", json={"product_id": "P001", "insight_type": "gossip"}
+            )
+
+        assert response.status_code == 422
+        mock_fetch.assert_not_called()
+
+    def test_product_insight_no_cache_header_refetches(self, client):
+        """Cache-Control: no-cache should bypass the cached product read."""
+        with patch("main.fetch_from_supabase", new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = [{"id": "C001", "name": "Cached Product"}]
+            body = {"product_id": "C001", "insight_type": "summary"}
+            client.post("/product-insight", json=body)
+            client.post("/product-insight", json=body)
+            assert mock_fetch.await_count == 1
+
+            response = client.post("/product-insight", json=body, headers={"Cache-Control": "no-cache"})
+            assert response.status_code == 200
+            assert mock_fetch.await_count == 2
+
+    def test_product_insight_answer_is_cached(self, client):
+        """Repeat requests should reuse the answer; no-cache should regenerate it."""
+        generator = MagicMock()
+        generator.generate_product_insight.return_value = {"success": True, "insight": "Cached"}
+        with (
+            patch("main.fetch_from_supabase", new_callable=AsyncMock) as mock_fetch,
+            patch("main.get_lazy_generator", return_value=generator),
+        ):
+            mock_fetch.return_value = [{"id": "K001", "name": "Cached Product"}]
+            body = {"product_id": "K001", "insight_type": "risks"}
+            first = client.post("/product-insight", json=body).json()
+            assert client.post("/product-insight", json=body).json() == first
+            assert generator.generate_product_insight.call_count == 1
+
+            client.post("/product-insight", json={**body, "insight_type": "summary"})
+            client.post("/product-insight", json=body, headers={"Cache-Control": "no-cache"})
+            assert generator.generate_product_insight.call_count == 3
+
+    def test_product_insight_batch_single_fetch(self, client):
+        """Batch insights should fetch all products in one in.(...) request."""
+        with patch("main.fetch_from_supabase", new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = [{"id": "B001", "name": "A"}, {"id": "B002", "name": "B"}]
+            response = client.post(
+                "/product-insight/batch",
+                json={"product_ids": ["B001", "B002", "B404", "B001"], "insight_type": "risks"},
+            )
+
+            assert response.status_code == 200
+            data = response.json()
+            assert set(data) == {"B001", "B002", "B404"}
+            assert data["B001"]["success"] is True
+            assert data["B404"] == {
+                "success": False, "insight": None, "sources": None,
+                "error": "Product not found", "usage": None,
+            }
+            mock_fetch.assert_awaited_once()
+            params = mock_fetch.call_args.kwargs["params"]
+            assert params["id"] == 'in.("B001","B002","B404")'
+
+    def test_product_insight_batch_reuses_cached_answers(self, client):
+        """Batch and single endpoints should share cached answers per (product, type)."""
+        generator = MagicMock()
+        generator.generate_product_insight.return_value = {"success": True, "insight": "Shared"}
+        with (
+            patch("main.fetch_from_supabase", new_callable=AsyncMock) as mock_fetch,
+            patch("main.get_lazy_generator", return_value=generator),
+        ):
+            mock_fetch.return_value = [{"id": "S001", "name": "A"}]
+            client.post("/product-insight", json={"product_id": "S001", "insight_type": "risks"})
+
+            mock_fetch.return_value = [{"id": "S002", "name": "B"}]
+            data = client.post(
+                "/product-insight/batch", json={"product_ids": ["S001", "S002"], "insight_type": "risks"}
+            ).json()
+
+            assert data["S001"]["insight"] == data["S002"]["insight"] == "Shared"
+            assert generator.generate_product_insight.call_count == 2
+            assert mock_fetch.call_args.kwargs["params"]["id"] == 'in.("S002")'
+
+            # Everything cached now: no fetch and no LLM call
+            client.post("/product-insight/batch", json={"product_ids": ["S002", "S001"], "insight_type": "risks"})
+            assert mock_fetch.await_count == 2
+            assert generator.generate_product_insight.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_product_insight_batch_caps_its_llm_fan_out(self):
+        """A large batch should hold at most PRODUCT_INSIGHT_BATCH_CONCURRENCY LLM slots."""
+        import main
+
+        in_flight = 0
+        peak = 0
+
+        async def run_generator(generate, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return {"success": True, "insight": "ok"}
+
+        ids = [f"F{i:03d}" for i in range(20)]
+        with (
+            patch("main.fetch_products_bulk", AsyncMock(return_value={i: {"id": i} for i in ids})),
+            patch("main.get_lazy_generator", return_value=MagicMock()),
+            patch("main._run_generator", run_generator),
+        ):
+            responses = await main.product_insight_batch(
+                main.ProductInsightBatchRequest(product_ids=ids, insight_type="summary")
+            )
+
+        assert all(response.success for response in responses.values())
+        assert peak == main.PRODUCT_INSIGHT_BATCH_CONCURRENCY
+
+    def test_product_insight_batch_requires_ids(self, client):
+        """An empty id list should be rejected."""
+        response = client.post("/product-insight/batch", json={"product_ids": []})
+        assert response.status_code == 422
+
 
 # ============================================================================
 # PORTFOLIO INSIGHT ENDPOINT TESTS
@@ -460,6 +600,19 @@ class TestPortfolioInsightEndpoint:
             )
             assert response.status_code == 200
 
+    def test_portfolio_insight_selects_summary_columns(self, client):
+        """The portfolio fetch should select only the columns the summary uses, with no joins."""
+        with patch("main.fetch_from_supabase", new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = [{"id": "P001", "name": "Product 1"}]
+            client.post(
+                "/portfolio-insight",
+                json={"query": "Summarize", "filters": {"region": "projection-test"}},
+            )
+
+            params = mock_fetch.call_args.kwargs["params"]
+            assert params["select"] == "id,name,lifecycle_stage,region,revenue_target"
+            assert params["region"] == "eq.projection-test"
+
 
 # ============================================================================
 # INGEST ENDPOINT TESTS
@@ -488,6 +641,18 @@ class TestIngestEndpoint:
             assert data["success"] is True
             assert data["source"] == "products"
 
+    def test_ingest_clears_cached_answers(self, client, mock_document_loader):
+        """A successful ingest should drop cached answers so they reflect new data."""
+        from ai_insights.utils.semantic_cache import get_semantic_cache
+
+        cache = get_semantic_cache("query")
+        cache.put("key", None, "", {"insight": "stale"})
+        with patch("main.fetch_from_supabase", new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = [{"id": "P001", "name": "Test Product"}]
+            assert client.post("/ingest", json={"source": "products"}).status_code == 200
+
+        assert cache.get_exact("key") is None
+
     def test_ingest_feedback_source(self, client, mock_document_loader):
         """Ingest from feedback source should work."""
         with patch("main.fetch_from_supabase", new_callable=AsyncMock) as mock_fetch:
@@ -505,11 +670,44 @@ class TestIngestEndpoint:
             response = client.post("/ingest", json={"source": "feedback", "product_id": "P001"})
             assert response.status_code == 200
 
+    @pytest.mark.asyncio
+    async def test_ingest_pages_through_supabase(self):
+        """Rows should be fetched in id-ordered pages and each page ingested as it arrives."""
+        import main
+
+        pages = {0: [{"id": "P1"}, {"id": "P2"}], 2: [{"id": "P3"}]}
+
+        async def fetch(endpoint, params):
+            return pages[params["offset"]]
+
+        ingested_before_second_fetch = []
+
+        def ingest(docs):
+            ingested_before_second_fetch.append(mock_fetch.call_count)
+            return len(docs)
+
+        loader = MagicMock()
+        loader.load_product_data.side_effect = lambda rows: [r["id"] for r in rows]
+        loader.ingest_documents.side_effect = ingest
+
+        with (
+            patch("main.SUPABASE_PAGE_SIZE", 2),
+            patch("main.fetch_from_supabase", side_effect=fetch) as mock_fetch,
+            patch("main.get_lazy_document_loader", return_value=loader),
+        ):
+            count = await main._ingest_supabase_pages("products", {"select": "*"}, "load_product_data")
+
+        assert count == 3
+        assert [c.kwargs["params"]["offset"] for c in mock_fetch.call_args_list] == [0, 2]
+        assert mock_fetch.call_args.kwargs["params"] == {"order": "id", "select": "*", "limit": 2, "offset": 2}
+        # The second page was requested before the first was embedded
+        assert ingested_before_second_fetch[0] == 2
+        assert [c.args[0] for c in loader.ingest_documents.call_args_list] == [["P1", "P2"], ["P3"]]
+
     def test_ingest_unknown_source(self, client):
-        """Ingest with unknown source should return 400."""
+        """Ingest with unknown source should be rejected at validation."""
         response = client.post("/ingest", json={"source": "invalid_source"})
-        assert response.status_code == 400
-        assert "Unknown source" in response.json()["detail"]
+        assert response.status_code == 422
 
 
 # ============================================================================
@@ -530,6 +728,16 @@ class TestStatsEndpoint:
         assert "collection" in data
         assert data["collection"] == "test_collection"
 
+    def test_stats_etag_changes_with_count(self, client):
+        """The ETag should change when the body does."""
+        def stats_etag(count):
+            vs = MagicMock(collection_name="test_collection")
+            vs.count.return_value = count
+            with patch("main.get_lazy_vector_store", return_value=vs):
+                return client.get("/stats").headers["etag"]
+
+        assert stats_etag(1) != stats_etag(2)
+
 
 # ============================================================================
 # JIRA CSV UPLOAD TESTS
@@ -568,6 +776,210 @@ class TestJiraCSVUpload:
         assert response.status_code == 400
         assert "encoding" in response.json()["detail"].lower()
 
+    def test_upload_without_header_rejected(self, client):
+        """A .csv without a comma-separated header row should be rejected up front."""
+        with patch("main.tempfile.mkstemp") as mkstemp:
+            response = client.post(
+                "/upload/jira-csv", files={"file": ("test.csv", b"just some text\nmore text", "text/csv")}
+            )
+        assert response.status_code == 400
+        assert "header" in response.json()["detail"]
+        mkstemp.assert_not_called()
+
+    def test_upload_csv_content_type_accepted(self, client):
+        """A CSV content type should be accepted even without a .csv extension."""
+        response = client.post(
+            "/upload/jira-csv",
+            files={"file": ("export", b"Issue Key,Summary\nTEST-9,Typed", "text/csv; charset=utf-8")},
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicate_uploads_queue_once(self):
+        """Two simultaneous uploads of the same file should queue a single job."""
+        import io
+
+        from fastapi import BackgroundTasks, UploadFile
+
+        import main
+        from ai_insights.utils.job_store import InMemoryJobStore
+
+        class SlowStore(InMemoryJobStore):
+            async def get_status(self, job_id):
+                await asyncio.sleep(0.01)  # Yield between the check and the write
+                return await super().get_status(job_id)
+
+        data = b"Issue Key,Summary\nTEST-1,Double click"
+        tasks = [BackgroundTasks(), BackgroundTasks()]
+
+        with patch("main.job_store", SlowStore()):
+            results = await asyncio.gather(
+                *(
+                    main.upload_jira_csv(UploadFile(file=io.BytesIO(data), filename="a.csv"), bg)
+                    for bg in tasks
+                )
+            )
+
+        assert sorted(r["status"] for r in results) == ["already_processing", "queued"]
+        assert results[0]["job_id"] == results[1]["job_id"]
+        queued = [task for bg in tasks for task in bg.tasks]
+        assert len(queued) == 1
+        os.unlink(queued[0].func.args[1])
+        assert main._upload_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_upload_rejected_when_job_queue_full(self, tmp_path):
+        """A full worker queue should return 503 and not leave the spooled file behind."""
+        import io
+
+        from fastapi import BackgroundTasks, HTTPException, UploadFile
+
+        import main
+        from ai_insights.utils.job_store import InMemoryJobStore
+
+        queue = MagicMock(running=True)
+        queue.submit.side_effect = asyncio.QueueFull
+        store = InMemoryJobStore()
+        upload = UploadFile(file=io.BytesIO(b"Issue Key,Summary\nTEST-9,Full queue"), filename="a.csv")
+
+        with (
+            patch("main.job_queue", queue),
+            patch("main.job_store", store),
+            patch("main.tempfile.tempdir", str(tmp_path)),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                await main.upload_jira_csv(upload, BackgroundTasks())
+
+        assert exc_info.value.status_code == 503
+        assert list(tmp_path.iterdir()) == []
+        job = next(iter(store._jobs.values()))[1]
+        assert job["status"] == "rejected"
+
+    @pytest.mark.asyncio
+    async def test_upload_enqueued_on_arq_when_configured(self, tmp_path):
+        """With an arq pool on app.state the CSV should go to the arq worker, not the local queue."""
+        import io
+
+        from fastapi import BackgroundTasks, UploadFile
+
+        import main
+        from ai_insights.utils.job_store import InMemoryJobStore
+
+        arq = MagicMock()
+        arq.enqueue_job = AsyncMock()
+        queue = MagicMock(running=True)
+        upload = UploadFile(file=io.BytesIO(b"Issue Key,Summary\nTEST-3,Worker"), filename="a.csv")
+
+        with (
+            patch.object(main.app.state, "arq", arq, create=True),
+            patch("main.job_queue", queue),
+            patch("main.job_store", InMemoryJobStore()),
+            patch("main.CSV_SPOOL_DIR", str(tmp_path)),
+        ):
+            result = await main.upload_jira_csv(upload, BackgroundTasks())
+
+        assert result["status"] == "queued"
+        queue.submit.assert_not_called()
+        name, job_id, csv_path, filename = arq.enqueue_job.call_args.args
+        assert (name, job_id, filename) == ("process_jira_csv_task", result["job_id"], "a.csv")
+        assert os.path.dirname(csv_path) == str(tmp_path)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("enqueue", [AsyncMock(return_value=None), AsyncMock(side_effect=ConnectionError)])
+    async def test_arq_enqueue_failure_marks_job_failed(self, tmp_path, enqueue):
+        """A dropped or failed arq enqueue should fail the job, not leave it "queued" forever."""
+        import io
+
+        from fastapi import BackgroundTasks, HTTPException, UploadFile
+
+        import main
+        from ai_insights.utils.job_store import InMemoryJobStore
+
+        arq = MagicMock(enqueue_job=enqueue)
+        store = InMemoryJobStore()
+        upload = UploadFile(file=io.BytesIO(b"Issue Key,Summary\nTEST-4,Dropped"), filename="a.csv")
+
+        with (
+            patch.object(main.app.state, "arq", arq, create=True),
+            patch("main.job_store", store),
+            patch("main.CSV_SPOOL_DIR", str(tmp_path)),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                await main.upload_jira_csv(upload, BackgroundTasks())
+
+        assert exc_info.value.status_code in (409, 503)
+        assert list(tmp_path.iterdir()) == []
+        job = next(iter(store._jobs.values()))[1]
+        assert job["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_arq_pool_refused_without_shared_vector_store(self, monkeypatch):
+        """Workers can't reach the API's local Chroma index, so arq ingestion stays in-process."""
+        import main
+
+        monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+        arq = MagicMock()
+        with patch("main.CSV_INGEST_QUEUE", "arq"), patch.dict(sys.modules, {"arq": arq}):
+            assert await main._open_arq_pool() is None
+        arq.create_pool.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_arq_pool_falls_back_without_arq(self, monkeypatch):
+        """CSV_INGEST_QUEUE=arq without the arq package should keep ingestion in-process."""
+        import main
+
+        monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+        with (
+            patch("main.CSV_INGEST_QUEUE", "arq"),
+            patch("main.VECTOR_STORE_SHARED_WITH_WORKERS", True),
+            patch.dict(sys.modules, {"arq": None, "arq.connections": None}),
+        ):
+            assert await main._open_arq_pool() is None
+
+    @pytest.mark.asyncio
+    async def test_cache_invalidation_messages_clear_caches(self):
+        """A worker's invalidation message should clear this process's answer caches."""
+        import main
+
+        class FakePubSub:
+            async def subscribe(self, channel):
+                self.channel = channel
+
+            async def listen(self):
+                yield {"type": "subscribe", "data": 1}
+                yield {"type": "message", "data": b"job-1"}
+
+            async def reset(self):
+                self.closed = True
+
+        pubsub = FakePubSub()
+        with patch("main.clear_semantic_caches") as clear:
+            await main._listen_for_cache_invalidation(MagicMock(pubsub=lambda: pubsub))
+
+        assert pubsub.channel == main.CACHE_INVALIDATION_CHANNEL
+        clear.assert_called_once()
+        assert pubsub.closed
+
+    def test_upload_job_id_is_content_hash(self, client):
+        """The same bytes should map to the same job id; different bytes should not."""
+        import main
+
+        with patch.object(main, "CSV_UPLOAD_CHUNK_SIZE", 3):
+            # Small chunks split the multi-byte character across reads
+            first = client.post(
+                "/upload/jira-csv", files={"file": ("a.csv", "Issue Key,Summary\nT-1,Café".encode(), "text/csv")}
+            )
+        second = client.post(
+            "/upload/jira-csv", files={"file": ("a.csv", "Issue Key,Summary\nT-1,Café".encode(), "text/csv")}
+        )
+        other = client.post(
+            "/upload/jira-csv", files={"file": ("a.csv", b"Issue Key,Summary\nT-2,Other", "text/csv")}
+        )
+
+        assert first.status_code == 200
+        assert first.json()["job_id"] == second.json()["job_id"]
+        assert first.json()["job_id"] != other.json()["job_id"]
+
 
 class TestUploadStatus:
     """Tests for the /upload/status/{job_id} endpoint."""
@@ -781,6 +1193,40 @@ class TestCogneeIngestEndpoints:
         response = client.post("/cognee/ingest/actions")
         assert response.status_code == 200
 
+    def test_cognee_ingest_unknown_kind_rejected(self, client):
+        """Only known ingestion kinds should be routed."""
+        response = client.post("/cognee/ingest/widgets")
+        assert response.status_code == 422
+
+    def test_job_status_paths_are_aliases(self, client):
+        """/jobs/{id} and the per-feature status paths should return the same job."""
+        with patch("main.fetch_from_supabase", new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = [{"id": "A001"}]
+            job_id = client.post("/cognee/ingest/actions").json()["job_id"]
+
+        statuses = [
+            client.get(f"{path}/{job_id}").json()
+            for path in ("/jobs", "/cognee/ingest/status", "/upload/status", "/api/sync/status")
+        ]
+        assert all(status == statuses[0] for status in statuses)
+
+    @pytest.mark.asyncio
+    async def test_cognee_ingest_background_dispatches_by_kind(self):
+        """The shared background job should call the kind's ingestion method."""
+        import main
+
+        ingestion = MagicMock()
+        ingestion.ingest_batch_actions = AsyncMock(return_value={"ingested": 1})
+        module = MagicMock(GovernanceActionIngestion=MagicMock(return_value=ingestion))
+        with patch.dict(sys.modules, {"ingestion.governance_actions": module}):
+            await main.job_store.set("job-actions", {"status": "queued"})
+            await main._cognee_ingest_background("job-actions", "actions", [{"id": "A001"}])
+
+        ingestion.ingest_batch_actions.assert_awaited_once_with([{"id": "A001"}])
+        status = await main.job_store.get("job-actions")
+        assert status["status"] == "completed"
+        assert status["stats"] == {"ingested": 1}
+
 
 # ============================================================================
 # ADMIN ENDPOINT TESTS
@@ -929,6 +1375,39 @@ class TestSupabaseHelper:
         assert exc_info.value.status_code == 500
         assert "not configured" in exc_info.value.detail
 
+    @pytest.mark.asyncio
+    async def test_http_client_is_pooled(self):
+        """The Supabase HTTP client should be reused until closed."""
+        from main import close_http_client, get_http_client
+
+        first = get_http_client()
+        assert get_http_client() is first
+
+        await close_http_client()
+        assert first.is_closed
+
+        second = get_http_client()
+        assert second is not first
+        await close_http_client()
+
+    @pytest.mark.asyncio
+    async def test_http_client_carries_supabase_auth(self):
+        """Base URL and auth headers should be set once on the pooled client."""
+        from main import close_http_client, get_http_client
+
+        await close_http_client()
+        with (
+            patch("main.SUPABASE_URL", "https://example.supabase.co"),
+            patch("main.SUPABASE_KEY", "key"),
+        ):
+            client = get_http_client()
+
+        assert str(client.base_url) == "https://example.supabase.co/rest/v1/"
+        assert client.headers["apikey"] == "key"
+        assert client.headers["authorization"] == "Bearer key"
+        assert client.timeout.connect == 5.0
+        await close_http_client()
+
 
 # ============================================================================
 # REQUEST MODEL VALIDATION TESTS
@@ -975,10 +1454,53 @@ class TestCORSMiddleware:
         # OPTIONS should be allowed
         assert response.status_code in [200, 204, 405]
 
-    def test_cors_allows_all_origins(self, client):
-        """CORS should allow all origins (development mode)."""
+    def test_cors_unknown_origin_not_allowed(self, client):
+        """Origins outside the allow list get no CORS grant."""
         response = client.get("/", headers={"Origin": "http://any-origin.com"})
         assert response.status_code == 200
+        assert "access-control-allow-origin" not in response.headers
+
+    def test_cors_preflight_is_cached(self, client):
+        """Preflights for known origins should be cacheable for a day."""
+        response = client.options(
+            "/product-insight",
+            headers={
+                "Origin": "http://localhost:5173",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "Content-Type",
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+        assert response.headers["access-control-max-age"] == "86400"
+
+
+# ============================================================================
+# COMPRESSION TESTS
+# ============================================================================
+
+
+class TestGZipMiddleware:
+    """Tests for response compression."""
+
+    def test_large_json_is_gzipped(self, client):
+        """Responses over the size threshold should be gzip-encoded."""
+        response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "paths" in response.json()
+
+    def test_small_response_not_compressed(self, client):
+        """Bodies under minimum_size should be sent as-is."""
+        response = client.get("/upload/status/missing-job", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 404
+        assert "content-encoding" not in response.headers
+
+    def test_sse_opts_out_of_compression(self):
+        """SSE streams must not be compressed, or events would sit in the gzip buffer."""
+        from main import SSE_HEADERS
+
+        assert SSE_HEADERS["Content-Encoding"] == "identity"
 
 
 # ============================================================================
@@ -1015,7 +1537,8 @@ class TestErrorHandling:
 class TestProcessJiraCsvBackground:
     """Tests for the process_jira_csv_background function."""
 
-    def test_process_valid_csv(self):
+    @pytest.mark.asyncio
+    async def test_process_valid_csv(self):
         """Valid CSV should be processed successfully."""
         with patch.dict(
             "sys.modules",
@@ -1030,26 +1553,90 @@ class TestProcessJiraCsvBackground:
                 "ai_insights.utils": MagicMock(),
                 "admin_endpoints": MagicMock(),
                 "ai_insights.utils.jira_parser": MagicMock(
-                    parse_jira_csv=MagicMock(
-                        return_value=[{"id": "1", "text": "Test", "metadata": {}}]
+                    parse_jira_csv_file=MagicMock(
+                        return_value=([{"id": "1", "text": "Test", "metadata": {}}], {"total": 1})
                     ),
-                    get_ingestion_summary=MagicMock(return_value={"total": 1}),
                 ),
             },
         ):
-            from main import _job_status, process_jira_csv_background
+            from main import job_store, process_jira_csv_background
 
-            with patch("main.get_lazy_document_loader") as mock_loader:
+            with (
+                patch("main.get_lazy_document_loader") as mock_loader,
+                patch("main.clear_semantic_caches") as clear_caches,
+            ):
                 mock_doc_loader = MagicMock()
-                mock_doc_loader.ingest_documents.return_value = 1
+                mock_doc_loader.ingest_records.return_value = 1
                 mock_loader.return_value = mock_doc_loader
 
-                process_jira_csv_background("job123", "Issue Key,Summary\nTEST-1,Test", "test.csv")
+                await process_jira_csv_background("job123", "/tmp/upload.csv", "test.csv")
+
+                status = await job_store.get("job123")
+                assert status["status"] == "completed"
+                assert status["ingested"] == 1
+                clear_caches.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_custom_cache_invalidation_replaces_local_clear(self):
+        """Workers pass their own invalidation; the in-process caches aren't theirs to clear."""
+        import main
+        from ai_insights.utils.job_store import InMemoryJobStore
+
+        loader = MagicMock()
+        loader.ingest_records.return_value = 1
+        invalidate = AsyncMock()
+        parsed = ([{"id": "1", "text": "T", "metadata": {}}], {"total": 1})
+
+        with (
+            patch("main.job_store", InMemoryJobStore()),
+            patch("main._get_csv_pool", return_value=None),
+            patch("ai_insights.utils.jira_parser.parse_jira_csv_file", return_value=parsed),
+            patch("main.get_lazy_document_loader", return_value=loader),
+            patch("main.clear_semantic_caches") as clear_caches,
+        ):
+            await main.process_jira_csv_background(
+                "job-w", "/tmp/missing.csv", "w.csv", invalidate_caches=invalidate
+            )
+            assert (await main.job_store.get("job-w"))["status"] == "completed"
+
+        invalidate.assert_awaited_once()
+        clear_caches.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ingests_in_batches(self):
+        """Tickets should be ingested batch by batch with progress in between."""
+        import main
+        from ai_insights.utils.job_store import InMemoryJobStore
+
+        records = [{"id": str(i), "text": f"T{i}", "metadata": {}} for i in range(5)]
+        loader = MagicMock()
+        loader.ingest_records.side_effect = lambda batch: len(batch)
+        store = InMemoryJobStore()
+        progress = []
+        original_update = store.update
+
+        async def record_update(job_id, **fields):
+            progress.append(fields.get("progress"))
+            await original_update(job_id, **fields)
+
+        store.update = record_update
+
+        with (
+            patch("ai_insights.utils.jira_parser.parse_jira_csv_file", return_value=(records, {})),
+            patch.object(main, "CSV_INGEST_BATCH_SIZE", 2),
+            patch.object(main, "get_lazy_document_loader", return_value=loader),
+            patch.object(main, "job_store", store),
+        ):
+            await main.process_jira_csv_background("batched", "/tmp/unused.csv", "t.csv")
 
-                assert _job_status["job123"]["status"] == "completed"
-                assert _job_status["job123"]["ingested"] == 1
+        assert [len(call.args[0]) for call in loader.ingest_records.call_args_list] == [2, 2, 1]
+        assert progress == [60, 76, 92]
+        status = await store.get("batched")
+        assert status["status"] == "completed"
+        assert status["ingested"] == 5
 
-    def test_process_empty_csv(self):
+    @pytest.mark.asyncio
+    async def test_process_empty_csv(self):
         """Empty CSV should result in failed status."""
         with patch.dict(
             "sys.modules",
@@ -1064,17 +1651,188 @@ class TestProcessJiraCsvBackground:
                 "ai_insights.utils": MagicMock(),
                 "admin_endpoints": MagicMock(),
                 "ai_insights.utils.jira_parser": MagicMock(
-                    parse_jira_csv=MagicMock(return_value=[]),
-                    get_ingestion_summary=MagicMock(return_value={}),
+                    parse_jira_csv_file=MagicMock(return_value=([], {})),
                 ),
             },
         ):
-            from main import _job_status, process_jira_csv_background
+            from main import job_store, process_jira_csv_background
+
+            await process_jira_csv_background("job456", "/tmp/empty.csv", "empty.csv")
+
+            status = await job_store.get("job456")
+            assert status["status"] == "failed"
+            assert "No valid tickets" in status["error"]
+
+    @pytest.mark.asyncio
+    async def test_spool_removed_when_parse_never_runs(self, tmp_path):
+        """A worker failure before parsing should still delete the spooled CSV."""
+        import main
+
+        csv_path = tmp_path / "spooled.csv"
+        csv_path.write_text("Issue Key,Summary\nT-1,x\n")
+        pool = MagicMock()
+        pool.submit.side_effect = RuntimeError("pool broken")
+
+        with patch.object(main, "_get_csv_pool", return_value=pool):
+            await main.process_jira_csv_background("spool-fail", str(csv_path), "x.csv")
+
+        assert not csv_path.exists()
+        assert (await main.job_store.get("spool-fail"))["status"] == "failed"
 
-            process_jira_csv_background("job456", "", "empty.csv")
 
-            assert _job_status["job456"]["status"] == "failed"
-            assert "No valid tickets" in _job_status["job456"]["error"]
+
+# ============================================================================
+# QUERY PATH AND RESPONSE RENDERING TESTS
+# ============================================================================
+
+
+class TestQueryEmbedsOnce:
+    """Test that /query reuses the semantic cache embedding for retrieval."""
+    
+    @pytest.mark.asyncio
+    async def test_cache_miss_passes_embedding_to_retrieval(self):
+        """An uncached /query should embed once and hand that vector to retrieve()."""
+        import numpy as np
+        from main import QueryRequest, query_insights
+        from ai_insights.utils.semantic_cache import get_semantic_cache
+        
+        vector = np.ones(4, dtype=np.float32)
+        retrieval = MagicMock()
+        retrieval.embeddings.embed_text.return_value = vector[None, :]
+        retrieval.retrieve.return_value = []
+        generator = MagicMock()
+        generator.generate.return_value = {"success": True, "insight": "ok", "sources": []}
+        get_semantic_cache("query").clear()
+        
+        with (
+            patch("main.get_lazy_retrieval", return_value=retrieval),
+            patch("main.get_lazy_generator", return_value=generator),
+        ):
+            await query_insights(QueryRequest(query="What is unique here?"))
+        
+        retrieval.embeddings.embed_text.assert_called_once_with("What is unique here?")
+        passed = retrieval.retrieve.call_args.kwargs["query_vector"]
+        assert np.array_equal(passed, vector)
+
+
+class TestOrjsonResponse:
+    """Test the orjson-rendered JSON response."""
+    
+    def test_renders_compact_json(self):
+        """Status dicts should render as compact JSON bytes."""
+        from main import OrjsonResponse
+        
+        response = OrjsonResponse({"status": "completed", "progress": 100, "stats": {1: "a"}})
+        
+        assert response.body == b'{"status":"completed","progress":100,"stats":{"1":"a"}}'
+        assert response.media_type == "application/json"
+    
+    def test_renders_numpy_values(self):
+        """NumPy arrays and scalars should serialize without conversion."""
+        import numpy as np
+        
+        from main import OrjsonResponse
+        
+        response = OrjsonResponse({"scores": np.array([1.5, 2.0], dtype=np.float32), "n": np.int64(3)})
+        
+        assert response.body == b'{"scores":[1.5,2.0],"n":3}'
+    
+    @pytest.mark.asyncio
+    async def test_unified_query_error_omits_null_fields(self):
+        """/ai/query should dump the real response model in JSON mode without null fields."""
+        from main import UnifiedQueryRequest, unified_query_v2
+        
+        orchestrator = MagicMock()
+        orchestrator.orchestrate = AsyncMock(side_effect=RuntimeError("boom"))
+        orchestration = MagicMock(get_production_orchestrator=MagicMock(return_value=orchestrator))
+        
+        with (
+            patch.dict(sys.modules, {"ai_insights.orchestration": orchestration}),
+            patch("main._embed_for_cache", return_value=None),
+        ):
+            response = await unified_query_v2(UnifiedQueryRequest(query="q"))
+        
+        data = json.loads(response.body)
+        assert data["success"] is False
+        assert data["source_type"] == "error"
+        assert "forecast" not in data and "shared_context" not in data
+        assert isinstance(data["timestamp"], str)
+
+
+class TestRunGenerator:
+    """Test off-loop, concurrency-capped generator calls."""
+    
+    @pytest.mark.asyncio
+    async def test_runs_in_thread_with_kwargs(self):
+        """The blocking call should run in a worker thread with its kwargs."""
+        import threading
+        
+        from main import _run_generator
+        
+        main_thread = threading.get_ident()
+        
+        def generate(query):
+            return {"query": query, "off_loop": threading.get_ident() != main_thread}
+        
+        assert await _run_generator(generate, query="q") == {"query": "q", "off_loop": True}
+    
+    @pytest.mark.asyncio
+    async def test_caps_concurrent_calls(self):
+        """No more than the semaphore limit should run at once."""
+        import asyncio
+        import threading
+        import time
+        
+        import main
+        
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+        
+        def generate():
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return {}
+        
+        with patch("main._llm_semaphore", asyncio.Semaphore(2)):
+            await asyncio.gather(*(main._run_generator(generate) for _ in range(6)))
+        
+        assert state["peak"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_saturated_semaphore_sheds_with_429(self):
+        """A caller that can't get a slot within the wait should get a 429."""
+        from fastapi import HTTPException
+        
+        import main
+        
+        generate = MagicMock(return_value={})
+        with patch("main._llm_semaphore", asyncio.Semaphore(0)), \
+                patch("main.CONCURRENCY_WAIT_SECONDS", 0.01):
+            with pytest.raises(HTTPException) as exc_info:
+                await main._run_generator(generate)
+        
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers == {"Retry-After": "1"}
+        generate.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_retrieval_uses_its_own_slots(self):
+        """Retrieval should be capped by the vector store semaphore, not the LLM one."""
+        import main
+        
+        semaphore = asyncio.Semaphore(1)
+        retrieve = MagicMock(return_value=[{"text": "chunk"}])
+        with patch("main._vstore_semaphore", semaphore), \
+                patch("main._llm_semaphore", asyncio.Semaphore(0)):
+            chunks = await main._run_retrieval(retrieve, query="q", top_k=3)
+        
+        assert chunks == [{"text": "chunk"}]
+        retrieve.assert_called_once_with(query="q", top_k=3)
+        assert not semaphore.locked()
 
 
 if __name__ == "__main__":
@@ -59,7 +59,7 @@ def client():
             # Mock orchestrator to prevent Cognee initialization hang
             mock_orchestrator = MagicMock()
             mock_response = MagicMock()
-            mock_response.dict.return_value = {
+            mock_response.model_dump.return_value = {
                 "query": "test",
                 "answer": "mocked answer",
                 "confidence": 0.8,
@@ -105,7 +105,7 @@ def auth_client():
             # Mock orchestrator to prevent Cognee initialization hang
             mock_orchestrator = MagicMock()
             mock_response = MagicMock()
-            mock_response.dict.return_value = {
+            mock_response.model_dump.return_value = {
                 "query": "test",
                 "answer": "mocked answer",
                 "confidence": 0.8,
@@ -343,5 +343,47 @@ class TestMetricsIntegration:
             await failing_cognee()
 
 
+class TestRegistry:
+    """Test the application metrics registry served by /metrics."""
+
+    def test_excludes_default_collectors(self):
+        """Process/GC/platform collectors should not be scraped."""
+        from prometheus_client import generate_latest
+
+        from ai_insights.utils.metrics import REGISTRY
+
+        output = generate_latest(REGISTRY).decode()
+
+        assert "ai_insights_queries_total" in output
+        assert "python_gc_" not in output
+        assert "process_" not in output
+
+    def test_stage_histograms_registered(self):
+        """Retrieve/generate histograms should be exported from the registry."""
+        from ai_insights.utils.metrics import REGISTRY, rag_retrieve_duration_seconds
+
+        before = REGISTRY.get_sample_value("ai_insights_rag_retrieve_duration_seconds_count") or 0
+        with rag_retrieve_duration_seconds.time():
+            pass
+
+        assert REGISTRY.get_sample_value("ai_insights_rag_retrieve_duration_seconds_count") == before + 1
+        assert REGISTRY.get_sample_value("ai_insights_llm_generate_duration_seconds_count") is not None
+
+    def test_semantic_cache_hit_ratio_read_at_scrape(self):
+        """The hit ratio gauge should reflect the named cache's current stats."""
+        from ai_insights.utils.metrics import REGISTRY
+        from ai_insights.utils.semantic_cache import get_semantic_cache
+
+        cache = get_semantic_cache("metrics_test")
+        cache.put("k", None, "", {"answer": "a"})
+        cache.get_exact("k")
+        cache.get_similar([1.0, 0.0], "")
+
+        ratio = REGISTRY.get_sample_value(
+            "ai_insights_semantic_cache_hit_ratio", {"cache": "metrics_test"}
+        )
+        assert ratio == 0.5
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -321,6 +321,35 @@ class TestProductionOrchestratorOrchestrate:
         assert result is not None
         orchestrator._rag_primary_flow.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_orchestrate_classifies_off_event_loop(self):
+        """Intent classification (a blocking LLM fallback) should not run on the loop thread."""
+        import threading
+
+        from ai_insights.orchestration.intent_classifier import QueryIntent
+
+        orchestrator, mocks = create_mock_orchestrator()
+
+        loop_thread = threading.current_thread()
+        classify_threads = []
+
+        def classify(query):
+            classify_threads.append(threading.current_thread())
+            return (QueryIntent.FACTUAL, 0.9, "Factual query")
+
+        mocks['classifier'].classify.side_effect = classify
+
+        mock_response = MagicMock()
+        mock_response.confidence.overall = 0.85
+        mock_response.sources = []
+        mock_response.guardrails.warnings = []
+        orchestrator._rag_primary_flow = AsyncMock(return_value=mock_response)
+        orchestrator._apply_guardrails = MagicMock(return_value=mock_response)
+
+        await orchestrator.orchestrate("What is product X?")
+
+        assert classify_threads and classify_threads[0] is not loop_thread
+
     @pytest.mark.asyncio
     async def test_orchestrate_historical_with_cognee(self):
         """Should route historical queries to Cognee when available."""
@@ -510,7 +539,7 @@ class TestRagPrimaryFlow:
     
     @pytest.mark.asyncio
     async def test_rag_primary_flow_with_cognee_context(self):
-        """Should get Cognee context before RAG query."""
+        """Should fetch Cognee context alongside the RAG query."""
         from ai_insights.orchestration.orchestrator_v2 import SharedContext
         from ai_insights.models import ReasoningStep
         
@@ -534,6 +563,48 @@ class TestRagPrimaryFlow:
         
         assert result is not None
         orchestrator._get_cognee_context.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_rag_primary_flow_runs_cognee_and_rag_concurrently(self):
+        """RAG should not wait for the Cognee context to finish."""
+        from ai_insights.orchestration.orchestrator_v2 import SharedContext
+        from ai_insights.models import ReasoningStep
+        
+        orchestrator, mocks = create_mock_orchestrator()
+        call_order = []
+        
+        async def mock_cognee_query(query, context):
+            call_order.append("cognee_start")
+            await asyncio.sleep(0.02)
+            call_order.append("cognee_end")
+            return {"answer": "Context", "sources": [], "confidence": 0.7}
+        
+        async def mock_rag_context(query, shared_ctx):
+            call_order.append("rag_start")
+            await asyncio.sleep(0.02)
+            call_order.append("rag_end")
+            return {"answer": "RAG answer", "sources": [], "confidence": 0.85}
+        
+        mocks['cognee_loader'].query = mock_cognee_query
+        orchestrator._get_rag_context = mock_rag_context
+        
+        reasoning_trace = [ReasoningStep(step=1, action="Test", details={}, confidence=0.9)]
+        await orchestrator._rag_primary_flow("query", None, SharedContext(), reasoning_trace)
+        
+        assert set(call_order[:2]) == {"cognee_start", "rag_start"}
+    
+    @pytest.mark.asyncio
+    async def test_slow_cognee_context_is_skipped(self):
+        """A Cognee lookup past the timeout should yield no context rather than block."""
+        orchestrator, mocks = create_mock_orchestrator()
+        orchestrator.COGNEE_CONTEXT_TIMEOUT_SECONDS = 0.01
+        
+        async def slow_query(query, context):
+            await asyncio.sleep(1)
+        
+        mocks['cognee_loader'].query = slow_query
+        
+        assert await orchestrator._get_cognee_context("query", None) is None
 
 
 class TestApplyGuardrails:
@@ -48,10 +48,7 @@ class TestRetrieve:
 
         # Setup mocks
         mock_emb_instance = MagicMock()
-        mock_emb_instance.embed_and_quantize.return_value = (
-            np.random.rand(1, 384).astype(np.float32),
-            np.random.rand(1, 48).astype(np.uint8),
-        )
+        mock_emb_instance.embed_text.return_value = np.random.rand(1, 384).astype(np.float32)
         mock_emb.return_value = mock_emb_instance
 
         mock_vs_instance = MagicMock()
@@ -66,7 +63,8 @@ class TestRetrieve:
 
         assert len(results) == 2
         assert results[0]["score"] == 0.95
-        mock_emb_instance.embed_and_quantize.assert_called_once()
+        mock_emb_instance.embed_text.assert_called_once_with("What are the product risks?")
+        mock_emb_instance.embed_and_quantize.assert_not_called()
         mock_vs_instance.search.assert_called_once()
 
     @patch("ai_insights.retrieval.retrieval.get_reranker")
@@ -77,10 +75,7 @@ class TestRetrieve:
         from ai_insights.retrieval.retrieval import RetrievalPipeline
 
         mock_emb_instance = MagicMock()
-        mock_emb_instance.embed_and_quantize.return_value = (
-            np.random.rand(1, 384).astype(np.float32),
-            np.random.rand(1, 48).astype(np.uint8),
-        )
+        mock_emb_instance.embed_text.return_value = np.random.rand(1, 384).astype(np.float32)
         mock_emb.return_value = mock_emb_instance
 
         mock_vs_instance = MagicMock()
@@ -106,10 +101,7 @@ class TestRetrieve:
         from ai_insights.retrieval.retrieval import RetrievalPipeline
 
         mock_emb_instance = MagicMock()
-        mock_emb_instance.embed_and_quantize.return_value = (
-            np.random.rand(1, 384).astype(np.float32),
-            np.random.rand(1, 48).astype(np.uint8),
-        )
+        mock_emb_instance.embed_text.return_value = np.random.rand(1, 384).astype(np.float32)
         mock_emb.return_value = mock_emb_instance
 
         mock_vs_instance = MagicMock()
@@ -124,14 +116,13 @@ class TestRetrieve:
     @patch("ai_insights.retrieval.retrieval.get_embeddings")
     @patch("ai_insights.retrieval.retrieval.get_vector_store")
     def test_retrieve_uses_float_embeddings(self, mock_vs, mock_emb):
-        """Should use float embeddings for search (not binary)."""
+        """Should search with the float embedding, without quantizing it."""
         from ai_insights.retrieval.retrieval import RetrievalPipeline
 
         float_emb = np.random.rand(1, 384).astype(np.float32)
-        binary_emb = np.random.rand(1, 48).astype(np.uint8)
 
         mock_emb_instance = MagicMock()
-        mock_emb_instance.embed_and_quantize.return_value = (float_emb, binary_emb)
+        mock_emb_instance.embed_text.return_value = float_emb
         mock_emb.return_value = mock_emb_instance
 
         mock_vs_instance = MagicMock()
@@ -147,6 +138,70 @@ class TestRetrieve:
         assert query_vector.shape == (384,)  # Should be float embedding
 
 
+class TestRetrieveWithQueryVector:
+    """Test retrieval with a precomputed query embedding."""
+
+    @patch("ai_insights.retrieval.retrieval.get_embeddings")
+    @patch("ai_insights.retrieval.retrieval.get_vector_store")
+    def test_retrieve_for_product_reuses_query_vector(self, mock_vs, mock_emb):
+        """A caller-supplied vector should be searched as-is, without re-embedding."""
+        from ai_insights.retrieval.retrieval import RetrievalPipeline
+
+        mock_emb_instance = MagicMock()
+        mock_emb.return_value = mock_emb_instance
+
+        mock_vs_instance = MagicMock()
+        mock_vs_instance.search.return_value = []
+        mock_vs.return_value = mock_vs_instance
+
+        vector = np.random.rand(384).astype(np.float32)
+        pipeline = RetrievalPipeline(use_reranking=False)
+        pipeline.retrieve_for_product("prod_001", "test", query_vector=vector)
+
+        mock_emb_instance.embed_text.assert_not_called()
+        assert mock_vs_instance.search.call_args.kwargs["query_vector"] is vector
+
+
+class TestRetrieveBatch:
+    """Test batched retrieval."""
+
+    @patch("ai_insights.retrieval.retrieval.get_embeddings")
+    @patch("ai_insights.retrieval.retrieval.get_vector_store")
+    def test_retrieve_batch_embeds_and_searches_once(self, mock_vs, mock_emb):
+        """Should embed all queries together and issue one batched search."""
+        from ai_insights.retrieval.retrieval import RetrievalPipeline
+
+        mock_emb_instance = MagicMock()
+        mock_emb_instance.embed_text.return_value = np.random.rand(2, 384).astype(np.float32)
+        mock_emb.return_value = mock_emb_instance
+
+        mock_vs_instance = MagicMock()
+        mock_vs_instance.search_batch.return_value = [
+            [{"id": "1", "text": "A"}, {"id": "2", "text": "B"}],
+            [{"id": "3", "text": "C"}],
+        ]
+        mock_vs.return_value = mock_vs_instance
+
+        pipeline = RetrievalPipeline(use_reranking=False)
+        results = pipeline.retrieve_batch(["first", "second"], top_k=1)
+
+        mock_emb_instance.embed_text.assert_called_once_with(["first", "second"])
+        mock_emb_instance.embed_and_quantize.assert_not_called()
+        mock_vs_instance.search_batch.assert_called_once()
+        assert [[r["id"] for r in hits] for hits in results] == [["1"], ["3"]]
+
+    @patch("ai_insights.retrieval.retrieval.get_embeddings")
+    @patch("ai_insights.retrieval.retrieval.get_vector_store")
+    def test_retrieve_batch_empty(self, mock_vs, mock_emb):
+        """Should return no result lists for no queries."""
+        from ai_insights.retrieval.retrieval import RetrievalPipeline
+
+        pipeline = RetrievalPipeline()
+
+        assert pipeline.retrieve_batch([]) == []
+        mock_emb.return_value.embed_text.assert_not_called()
+
+
 class TestRetrieveForProduct:
     """Test product-filtered retrieval."""
 
@@ -157,10 +212,7 @@ class TestRetrieveForProduct:
         from ai_insights.retrieval.retrieval import RetrievalPipeline
 
         mock_emb_instance = MagicMock()
-        mock_emb_instance.embed_and_quantize.return_value = (
-            np.random.rand(1, 384).astype(np.float32),
-            np.random.rand(1, 48).astype(np.uint8),
-        )
+        mock_emb_instance.embed_text.return_value = np.random.rand(1, 384).astype(np.float32)
         mock_emb.return_value = mock_emb_instance
 
         # Return mixed results
@@ -190,10 +242,7 @@ class TestRetrieveForProduct:
         from ai_insights.retrieval.retrieval import RetrievalPipeline
 
         mock_emb_instance = MagicMock()
-        mock_emb_instance.embed_and_quantize.return_value = (
-            np.random.rand(1, 384).astype(np.float32),
-            np.random.rand(1, 48).astype(np.uint8),
-        )
+        mock_emb_instance.embed_text.return_value = np.random.rand(1, 384).astype(np.float32)
         mock_emb.return_value = mock_emb_instance
 
         # Return only 1 product-specific result
@@ -218,10 +267,7 @@ class TestRetrieveForProduct:
         from ai_insights.retrieval.retrieval import RetrievalPipeline
 
         mock_emb_instance = MagicMock()
-        mock_emb_instance.embed_and_quantize.return_value = (
-            np.random.rand(1, 384).astype(np.float32),
-            np.random.rand(1, 48).astype(np.uint8),
-        )
+        mock_emb_instance.embed_text.return_value = np.random.rand(1, 384).astype(np.float32)
         mock_emb.return_value = mock_emb_instance
 
         mock_vs_instance = MagicMock()
@@ -247,10 +293,7 @@ class TestRetrieveByTheme:
         from ai_insights.retrieval.retrieval import RetrievalPipeline
 
         mock_emb_instance = MagicMock()
-        mock_emb_instance.embed_and_quantize.return_value = (
-            np.random.rand(1, 384).astype(np.float32),
-            np.random.rand(1, 48).astype(np.uint8),
-        )
+        mock_emb_instance.embed_text.return_value = np.random.rand(1, 384).astype(np.float32)
         mock_emb.return_value = mock_emb_instance
 
         mock_vs_instance = MagicMock()
@@ -275,10 +318,7 @@ class TestRetrieveByTheme:
         from ai_insights.retrieval.retrieval import RetrievalPipeline
 
         mock_emb_instance = MagicMock()
-        mock_emb_instance.embed_and_quantize.return_value = (
-            np.random.rand(1, 384).astype(np.float32),
-            np.random.rand(1, 48).astype(np.uint8),
-        )
+        mock_emb_instance.embed_text.return_value = np.random.rand(1, 384).astype(np.float32)
         mock_emb.return_value = mock_emb_instance
 
         mock_vs_instance = MagicMock()
@@ -299,10 +339,7 @@ class TestRetrieveByTheme:
         from ai_insights.retrieval.retrieval import RetrievalPipeline
 
         mock_emb_instance = MagicMock()
-        mock_emb_instance.embed_and_quantize.return_value = (
-            np.random.rand(1, 384).astype(np.float32),
-            np.random.rand(1, 48).astype(np.uint8),
-        )
+        mock_emb_instance.embed_text.return_value = np.random.rand(1, 384).astype(np.float32)
         mock_emb.return_value = mock_emb_instance
 
         mock_vs_instance = MagicMock()
@@ -318,6 +355,28 @@ class TestRetrieveByTheme:
         # Should fall back to all results
         assert len(results) == 2
 
+    @patch("ai_insights.retrieval.retrieval.get_embeddings")
+    @patch("ai_insights.retrieval.retrieval.get_vector_store")
+    def test_retrieve_by_theme_matches_stored_theme_lc(self, mock_vs, mock_emb):
+        """Should match the pre-lowercased theme stored with vector store chunks."""
+        from ai_insights.retrieval.retrieval import RetrievalPipeline
+
+        mock_emb_instance = MagicMock()
+        mock_emb_instance.embed_text.return_value = np.random.rand(1, 384).astype(np.float32)
+        mock_emb.return_value = mock_emb_instance
+
+        mock_vs_instance = MagicMock()
+        mock_vs_instance.search.return_value = [
+            {"id": "1", "score": 0.95, "text": "Text 1", "metadata": {"theme_lc": "usability"}},
+            {"id": "2", "score": 0.90, "text": "Text 2", "metadata": {"theme_lc": "performance"}},
+        ]
+        mock_vs.return_value = mock_vs_instance
+
+        pipeline = RetrievalPipeline()
+        results = pipeline.retrieve_by_theme("Usability", "test")
+
+        assert [r["id"] for r in results] == ["1"]
+
 
 class TestGetRetrievalPipeline:
     """Test singleton factory function."""
@@ -0,0 +1,130 @@
+"""
+Tests for ai_insights.utils.semantic_cache module.
+
+Tests:
+- Exact tier hits, TTL expiry and LRU eviction
+- Semantic tier similarity threshold and scope isolation
+- Ring buffer slot reuse
+"""
+
+import numpy as np
+
+from ai_insights.utils.semantic_cache import (
+    SemanticCache,
+    clear_semantic_caches,
+    get_semantic_cache,
+    reset_semantic_caches,
+)
+
+
+def unit(*values):
+    """Build a float32 vector."""
+    return np.array(values, dtype=np.float32)
+
+
+class TestExactTier:
+    """Test exact-match caching."""
+
+    def test_key_normalizes_case_and_whitespace(self):
+        """Trivial rephrasings should share a key; scopes should not."""
+        key = SemanticCache.make_key("What is  PayLink?", "p1")
+
+        assert key == SemanticCache.make_key("what is paylink?", "p1")
+        assert key != SemanticCache.make_key("what is paylink?", "p2")
+
+    def test_exact_hit(self):
+        """A stored response should be returned for the same key."""
+        cache = SemanticCache()
+        cache.put("k", None, "", {"answer": 1})
+
+        assert cache.get_exact("k") == {"answer": 1}
+        assert cache.stats()["hits"] == 1
+
+    def test_expired_entry_misses(self):
+        """Entries past the TTL should not be returned."""
+        cache = SemanticCache(ttl_seconds=-1)
+        cache.put("k", None, "", "stale")
+
+        assert cache.get_exact("k") is None
+
+    def test_lru_eviction(self):
+        """The least recently used entry should be evicted past maxsize."""
+        cache = SemanticCache(maxsize=2)
+        cache.put("a", None, "", 1)
+        cache.put("b", None, "", 2)
+        cache.get_exact("a")
+        cache.put("c", None, "", 3)
+
+        assert cache.get_exact("b") is None
+        assert cache.get_exact("a") == 1
+        assert cache.get_exact("c") == 3
+
+
+class TestSemanticTier:
+    """Test embedding-similarity lookups."""
+
+    def test_similar_query_hits(self):
+        """A near-identical embedding should return the cached response."""
+        cache = SemanticCache(threshold=0.97)
+        cache.put("k", unit(1.0, 0.0, 0.0), "", "answer")
+
+        assert cache.get_similar(unit(0.99, 0.05, 0.0)) == "answer"
+        assert cache.stats()["semantic_hits"] == 1
+
+    def test_dissimilar_query_misses(self):
+        """Embeddings below the threshold should miss."""
+        cache = SemanticCache(threshold=0.97)
+        cache.put("k", unit(1.0, 0.0, 0.0), "", "answer")
+
+        assert cache.get_similar(unit(0.7, 0.7, 0.0)) is None
+        assert cache.stats()["misses"] == 1
+
+    def test_scope_isolation(self):
+        """A similar query in a different scope should miss."""
+        cache = SemanticCache()
+        cache.put("k", unit(1.0, 0.0), "product-1", "answer")
+
+        assert cache.get_similar(unit(1.0, 0.0), "product-2") is None
+        assert cache.get_similar(unit(1.0, 0.0), "product-1") == "answer"
+
+    def test_ring_slot_reuse_drops_old_link(self):
+        """Overwritten ring slots should no longer match the old query."""
+        cache = SemanticCache(maxsize=1)
+        cache.put("a", unit(1.0, 0.0), "", "A")
+        cache.put("b", unit(0.0, 1.0), "", "B")
+
+        assert cache.get_similar(unit(1.0, 0.0)) is None
+        assert cache.get_similar(unit(0.0, 1.0)) == "B"
+
+    def test_clear(self):
+        """clear() should drop both tiers."""
+        cache = SemanticCache()
+        cache.put("k", unit(1.0, 0.0), "", "answer")
+        cache.clear()
+
+        assert cache.get_exact("k") is None
+        assert cache.get_similar(unit(1.0, 0.0)) is None
+
+
+class TestGetSemanticCache:
+    """Test named cache accessor."""
+
+    def test_named_caches_are_separate(self):
+        """Each name should get its own cache instance."""
+        reset_semantic_caches()
+
+        assert get_semantic_cache("query") is get_semantic_cache("query")
+        assert get_semantic_cache("query") is not get_semantic_cache("ai_query")
+
+    def test_clear_empties_every_named_cache(self):
+        """clear_semantic_caches() should drop entries but keep the instances."""
+        query_cache = get_semantic_cache("query")
+        insight_cache = get_semantic_cache("product_insight")
+        query_cache.put("q", None, "", "answer")
+        insight_cache.put("p", None, "", "insight")
+
+        clear_semantic_caches()
+
+        assert get_semantic_cache("query") is query_cache
+        assert query_cache.get_exact("q") is None
+        assert insight_cache.get_exact("p") is None
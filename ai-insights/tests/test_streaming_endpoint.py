@@ -4,6 +4,7 @@ Tests for SSE streaming endpoint and parallel webhook sync.
 Tests the race-loop pattern implementation and parallel data fetching.
 """
 
+import asyncio
 import pytest
 import json
 import sys
@@ -21,7 +22,9 @@ def mock_cognee_module():
     mock_cognee.search = AsyncMock(return_value=[])
     
     with patch.dict(sys.modules, {'cognee': mock_cognee}):
-        yield mock_cognee
+        # Drop main's cached ai_insights.cognee so patches on it are picked up
+        with patch("main._cognee_module", None):
+            yield mock_cognee
 
 
 class TestStreamingEndpoint:
@@ -225,6 +228,112 @@ class TestStreamingEndpoint:
         assert "cognee" in event_types or "rag" in event_types
 
 
+class TestPortfolioInsightStream:
+    """Test the streaming portfolio insight endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_streams_tokens_then_sources_and_complete(self):
+        """Should emit token events in order, then sources, then complete."""
+        from main import PortfolioInsightRequest, portfolio_insight_stream
+        
+        generator = MagicMock()
+        generator.stream_portfolio_insight.return_value = (
+            [{"text": "Product: A", "metadata": {"source": "portfolio", "product_id": "1"}}],
+            iter(["Healthy ", "portfolio"]),
+        )
+        
+        with (
+            patch("main.fetch_from_supabase_cached", AsyncMock(return_value=[{"id": "1", "name": "A"}])),
+            patch("main.get_lazy_generator", return_value=generator),
+        ):
+            response = await portfolio_insight_stream(PortfolioInsightRequest(query="How healthy?"))
+            events = [
+                json.loads(chunk.decode()[5:].strip())
+                async for chunk in response.body_iterator
+            ]
+        
+        assert [e["type"] for e in events] == ["token", "token", "sources", "complete"]
+        assert "".join(e["payload"]["text"] for e in events[:2]) == "Healthy portfolio"
+        assert events[2]["payload"] == [{"source": "portfolio", "product_id": "1"}]
+    
+    @pytest.mark.asyncio
+    async def test_generation_error_becomes_error_event(self):
+        """Generator failures should end the stream with an error event."""
+        from main import PortfolioInsightRequest, portfolio_insight_stream
+        
+        generator = MagicMock()
+        generator.stream_portfolio_insight.side_effect = RuntimeError("Groq API key not configured")
+        
+        with (
+            patch("main.fetch_from_supabase_cached", AsyncMock(return_value=[{"id": "1"}])),
+            patch("main.get_lazy_generator", return_value=generator),
+        ):
+            response = await portfolio_insight_stream(PortfolioInsightRequest(query="q"))
+            events = [json.loads(chunk.decode()[5:].strip()) async for chunk in response.body_iterator]
+        
+        assert events[-1]["type"] == "error"
+        assert "not configured" in events[-1]["payload"]["error"]
+    
+    @pytest.mark.asyncio
+    async def test_no_products_is_404(self):
+        """An empty portfolio should fail before streaming starts."""
+        from fastapi import HTTPException
+        
+        from main import PortfolioInsightRequest, portfolio_insight_stream
+        
+        with patch("main.fetch_from_supabase_cached", AsyncMock(return_value=[])):
+            with pytest.raises(HTTPException) as exc_info:
+                await portfolio_insight_stream(PortfolioInsightRequest(query="q"))
+        
+        assert exc_info.value.status_code == 404
+
+
+class TestQueryStream:
+    """Test /query?stream=true."""
+    
+    @pytest.mark.asyncio
+    async def test_streams_answer_and_skips_cache(self):
+        """Streaming should emit tokens then formatted sources, without touching the cache."""
+        from main import QueryRequest, query_insights
+        
+        chunks = [{"text": "Ticket", "metadata": {"source": "jira"}, "score": 0.9}]
+        retrieval = MagicMock()
+        retrieval.retrieve.return_value = chunks
+        generator = MagicMock()
+        generator.stream.return_value = iter(["On ", "track"])
+        generator.format_sources.side_effect = lambda c: [x["metadata"] for x in c]
+        
+        with (
+            patch("main.get_lazy_retrieval", return_value=retrieval),
+            patch("main.get_lazy_generator", return_value=generator),
+            patch("main.get_semantic_cache") as get_cache,
+        ):
+            response = await query_insights(QueryRequest(query="Status?"), stream=True)
+            events = [json.loads(chunk.decode()[5:].strip()) async for chunk in response.body_iterator]
+        
+        get_cache.assert_not_called()
+        generator.stream.assert_called_once_with(query="Status?", retrieved_chunks=chunks)
+        assert [e["type"] for e in events] == ["token", "token", "sources", "complete"]
+        assert events[2]["payload"] == [{"source": "jira"}]
+    
+    @pytest.mark.asyncio
+    async def test_include_sources_false_omits_sources_event(self):
+        """include_sources=False should end with just the completion event."""
+        from main import QueryRequest, query_insights
+        
+        generator = MagicMock()
+        generator.stream.return_value = iter(["ok"])
+        
+        with (
+            patch("main.get_lazy_retrieval", return_value=MagicMock(retrieve=MagicMock(return_value=[]))),
+            patch("main.get_lazy_generator", return_value=generator),
+        ):
+            response = await query_insights(QueryRequest(query="q", include_sources=False), stream=True)
+            events = [json.loads(chunk.decode()[5:].strip()) async for chunk in response.body_iterator]
+        
+        assert [e["type"] for e in events] == ["token", "complete"]
+
+
 class TestParallelWebhookSync:
     """Test parallel data fetching in webhook sync."""
     
@@ -246,6 +355,41 @@ class TestParallelWebhookSync:
         assert result["success"] is True
         assert "job_id" in result
     
+    @pytest.mark.asyncio
+    async def test_webhook_sync_ingests_sources_independently(self):
+        """A failing source ingest should not prevent the others from syncing."""
+        from fastapi import BackgroundTasks
+        from main import job_store, sync_webhook
+        
+        async def mock_fetch_supabase(endpoint, params=None):
+            return [{"id": f"{endpoint}_1", "product": {"name": "Alpha"}}]
+        
+        loader = MagicMock()
+        loader.load_product_payloads.side_effect = Exception("chroma down")
+        cognee_client = MagicMock()
+        cognee_client.add_data = AsyncMock(return_value="ok")
+        cognee_client.cognify = AsyncMock(return_value="done")
+        
+        with (
+            patch("main.fetch_from_supabase", side_effect=mock_fetch_supabase),
+            patch("main.get_lazy_document_loader", return_value=loader),
+            patch("main._get_cognee", new_callable=AsyncMock, return_value=cognee_client),
+            patch("main._last_webhook_sync", 0),
+            patch("main._last_webhook_done", 0),
+            patch("main._schedule_cognify") as mock_schedule,
+        ):
+            bg_tasks = BackgroundTasks()
+            result = await sync_webhook(bg_tasks)
+            await bg_tasks()
+        
+        mock_schedule.assert_called_once()
+        status = await job_store.get(result["job_id"])
+        assert status["status"] == "completed"
+        assert status["products_synced"] == 0
+        assert status["feedback_synced"] == 1
+        assert status["actions_synced"] == 1
+        assert "chroma down" in status["sync_errors"]["products"]
+    
     @pytest.mark.asyncio
     async def test_webhook_sync_handles_fetch_errors(self):
         """Should handle errors from individual fetch calls.
@@ -274,6 +418,60 @@ class TestParallelWebhookSync:
         # Others should be lists
         assert isinstance(results[1], list)
         assert isinstance(results[2], list)
+    
+    @pytest.mark.asyncio
+    async def test_webhook_skips_while_sync_running(self):
+        """A trigger while the sync lock is held should be skipped."""
+        import asyncio
+        from fastapi import BackgroundTasks
+        from main import sync_webhook
+        
+        lock = asyncio.Lock()
+        await lock.acquire()
+        with patch("main._webhook_lock", lock):
+            result = await sync_webhook(BackgroundTasks())
+        
+        assert result == {"status": "skipped", "reason": "sync_in_progress"}
+    
+    @pytest.mark.asyncio
+    async def test_webhook_debounced_after_recent_finish(self):
+        """A trigger shortly after a sync finished should be debounced."""
+        import time
+        from fastapi import BackgroundTasks
+        from main import sync_webhook
+        
+        with (
+            patch("main._last_webhook_sync", 0),
+            patch("main._last_webhook_done", time.time()),
+        ):
+            result = await sync_webhook(BackgroundTasks())
+        
+        assert result["status"] == "skipped"
+        assert result["reason"] == "debounced"
+    
+    @pytest.mark.asyncio
+    async def test_queued_run_coalesces_into_running_sync(self):
+        """A queued run that finds the lock held should not sync again."""
+        import asyncio
+        from fastapi import BackgroundTasks
+        from main import job_store, sync_webhook
+        
+        lock = asyncio.Lock()
+        fetch = AsyncMock(return_value=[])
+        with (
+            patch("main._webhook_lock", lock),
+            patch("main._last_webhook_sync", 0),
+            patch("main._last_webhook_done", 0),
+            patch("main.fetch_from_supabase", fetch),
+        ):
+            bg_tasks = BackgroundTasks()
+            result = await sync_webhook(bg_tasks)
+            await lock.acquire()  # another sync grabs the lock before this task runs
+            await bg_tasks()
+        
+        status = await job_store.get(result["job_id"])
+        assert status["status"] == "coalesced"
+        fetch.assert_not_called()
 
 
 class TestStreamQueryRequest:
@@ -0,0 +1,236 @@
+"""
+Tests for main.py's Supabase read helpers.
+
+Covers HEAD row counts, single-flight and TTL-cached reads, and paged fetches.
+"""
+
+import asyncio
+import json
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+# Mock cognee module before any imports to prevent PyO3 initialization
+@pytest.fixture(autouse=True)
+def mock_cognee_module():
+    """Mock cognee module to prevent PyO3 initialization."""
+    mock_cognee = MagicMock()
+    mock_cognee.add = AsyncMock(return_value="added")
+    mock_cognee.cognify = AsyncMock(return_value="cognified")
+    mock_cognee.search = AsyncMock(return_value=[])
+    
+    with patch.dict(sys.modules, {'cognee': mock_cognee}):
+        # Drop main's cached ai_insights.cognee so patches on it are picked up
+        with patch("main._cognee_module", None):
+            yield mock_cognee
+
+
+class TestCountFromSupabase:
+    """Test HEAD row counts."""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content_range,expected", [("0-24/123", 123), ("*/0", 0), ("0-24/*", None), ("", None)])
+    async def test_parses_content_range(self, content_range, expected):
+        """Should read the total from Content-Range and request an exact count."""
+        from main import count_from_supabase
+        
+        response = MagicMock()
+        response.headers = {"content-range": content_range} if content_range else {}
+        http_client = MagicMock()
+        http_client.head = AsyncMock(return_value=response)
+        
+        with (
+            patch("main.SUPABASE_URL", "https://example.supabase.co"),
+            patch("main.SUPABASE_KEY", "key"),
+            patch("main.get_http_client", return_value=http_client),
+        ):
+            assert await count_from_supabase("products", {"select": "*"}) == expected
+        
+        assert http_client.head.call_args[1]["headers"]["Prefer"] == "count=exact"
+
+
+class TestFetchFromSupabaseSingleflight:
+    """Test coalescing of identical concurrent Supabase GETs."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_fetches_share_one_request(self):
+        """Identical concurrent fetches should make one HTTP call; different params should not."""
+        import asyncio
+        
+        import main
+        
+        async def get(url, headers=None, params=None):
+            await asyncio.sleep(0.01)
+            response = MagicMock()
+            response.content = json.dumps([{"params": params}]).encode()
+            return response
+        
+        http_client = MagicMock()
+        http_client.get = AsyncMock(side_effect=get)
+        
+        with (
+            patch("main.SUPABASE_URL", "https://example.supabase.co"),
+            patch("main.SUPABASE_KEY", "key"),
+            patch("main.get_http_client", return_value=http_client),
+        ):
+            results = await asyncio.gather(
+                main.fetch_from_supabase("products", {"select": "*"}),
+                main.fetch_from_supabase("products", {"select": "*"}),
+                main.fetch_from_supabase("products", {"select": "id"}),
+            )
+        
+        assert results[0] is results[1]
+        assert results[2] == [{"params": {"select": "id"}}]
+        assert http_client.get.await_count == 2
+        assert main._supabase_inflight == {}
+    
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self):
+        """A failed shared fetch should raise for all callers and not stay in flight."""
+        import asyncio
+        
+        import httpx
+        
+        import main
+        
+        async def get(url, headers=None, params=None):
+            await asyncio.sleep(0.01)
+            raise httpx.ConnectError("down")
+        
+        http_client = MagicMock()
+        http_client.get = AsyncMock(side_effect=get)
+        
+        with (
+            patch("main.SUPABASE_URL", "https://example.supabase.co"),
+            patch("main.SUPABASE_KEY", "key"),
+            patch("main.get_http_client", return_value=http_client),
+        ):
+            results = await asyncio.gather(
+                main.fetch_from_supabase("products"),
+                main.fetch_from_supabase("products"),
+                return_exceptions=True,
+            )
+        
+        assert all(isinstance(r, httpx.ConnectError) for r in results)
+        assert http_client.get.await_count == 1
+        assert main._supabase_inflight == {}
+
+
+class TestFetchFromSupabaseCached:
+    """Test the short-TTL Supabase read cache."""
+    
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from main import clear_supabase_cache
+        
+        clear_supabase_cache()
+        yield
+        clear_supabase_cache()
+    
+    @pytest.mark.asyncio
+    async def test_repeated_reads_hit_cache(self):
+        """Identical endpoint + params (in any order) should fetch once."""
+        from main import fetch_from_supabase_cached
+        
+        fetch = AsyncMock(return_value=[{"id": "p1"}])
+        
+        with patch("main.fetch_from_supabase", fetch):
+            first = await fetch_from_supabase_cached("products", {"id": "eq.p1", "select": "*"})
+            second = await fetch_from_supabase_cached("products", {"select": "*", "id": "eq.p1"})
+            await fetch_from_supabase_cached("products", {"id": "eq.p2", "select": "*"})
+        
+        assert first == second == [{"id": "p1"}]
+        assert fetch.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_expired_and_cleared_entries_refetch(self):
+        """Entries past the TTL or after clear_supabase_cache() should be re-fetched."""
+        from main import clear_supabase_cache, fetch_from_supabase_cached
+        
+        fetch = AsyncMock(return_value=[])
+        
+        with patch("main.fetch_from_supabase", fetch):
+            with patch("main.SUPABASE_CACHE_TTL_SECONDS", 0):
+                await fetch_from_supabase_cached("products")
+                await fetch_from_supabase_cached("products")
+            clear_supabase_cache()
+            await fetch_from_supabase_cached("products")
+        
+        assert fetch.await_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_fresh_read_bypasses_and_refreshes_cache(self):
+        """fresh=True should refetch and leave the new result cached."""
+        from main import fetch_from_supabase_cached
+        
+        fetch = AsyncMock(side_effect=[[{"v": 1}], [{"v": 2}]])
+        
+        with patch("main.fetch_from_supabase", fetch):
+            await fetch_from_supabase_cached("products")
+            fresh = await fetch_from_supabase_cached("products", fresh=True)
+            cached = await fetch_from_supabase_cached("products")
+        
+        assert fresh == cached == [{"v": 2}]
+        assert fetch.await_count == 2
+    
+    def test_no_cache_header(self):
+        """Only a Cache-Control header containing no-cache should bypass the cache."""
+        from main import _no_cache
+        
+        assert _no_cache("no-cache")
+        assert _no_cache("max-age=0, No-Cache")
+        assert not _no_cache("max-age=60")
+        assert not _no_cache(None)
+
+
+class TestFetchFromSupabasePaged:
+    """Test paged Supabase fetching."""
+    
+    @pytest.mark.asyncio
+    async def test_pages_until_short_page(self):
+        """Should advance offset by page size and stop after a short page."""
+        from main import fetch_from_supabase_paged
+        
+        fetch = AsyncMock(side_effect=[[1, 2], [3, 4], [5]])
+        
+        with patch("main.fetch_from_supabase", fetch):
+            pages = [page async for page in fetch_from_supabase_paged("products", {"select": "*"}, page_size=2)]
+        
+        assert pages == [[1, 2], [3, 4], [5]]
+        assert [call[1]["params"]["offset"] for call in fetch.call_args_list] == [0, 2, 4]
+        assert fetch.call_args_list[0][1]["params"] == {
+            "order": "id", "select": "*", "limit": 2, "offset": 0
+        }
+    
+    @pytest.mark.asyncio
+    async def test_orders_pages_for_stable_offsets(self):
+        """Every page request should carry a stable order; a caller's order wins."""
+        from main import fetch_from_supabase_paged
+        
+        fetch = AsyncMock(side_effect=[[1, 2], [3], [4]])
+        
+        with patch("main.fetch_from_supabase", fetch):
+            [page async for page in fetch_from_supabase_paged("products", page_size=2)]
+            [page async for page in fetch_from_supabase_paged(
+                "products", {"order": "updated_at"}, page_size=2
+            )]
+        
+        assert [c[1]["params"]["order"] for c in fetch.call_args_list] == ["id", "id", "updated_at"]
+    
+    @pytest.mark.asyncio
+    async def test_skips_empty_trailing_page(self):
+        """An exactly-full last page should end on an empty fetch without yielding it."""
+        from main import fetch_from_supabase_paged
+        
+        fetch = AsyncMock(side_effect=[[1, 2], []])
+        
+        with patch("main.fetch_from_supabase", fetch):
+            pages = [page async for page in fetch_from_supabase_paged("products", page_size=2)]
+        
+        assert pages == [[1, 2]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,387 @@
+"""
+Tests for the unified sync jobs in main.py.
+
+Covers batched Cognee adds, payload builders, the background sync job, the
+sync job queue and debounced cognify.
+"""
+
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+# Mock cognee module before any imports to prevent PyO3 initialization
+@pytest.fixture(autouse=True)
+def mock_cognee_module():
+    """Mock cognee module to prevent PyO3 initialization."""
+    mock_cognee = MagicMock()
+    mock_cognee.add = AsyncMock(return_value="added")
+    mock_cognee.cognify = AsyncMock(return_value="cognified")
+    mock_cognee.search = AsyncMock(return_value=[])
+    
+    with patch.dict(sys.modules, {'cognee': mock_cognee}):
+        # Drop main's cached ai_insights.cognee so patches on it are picked up
+        with patch("main._cognee_module", None):
+            yield mock_cognee
+
+
+class TestBatchedCogneeAdd:
+    """Test batched Cognee ingestion helper used by sync tasks."""
+    
+    @pytest.mark.asyncio
+    async def test_batched_add_chunks_items(self):
+        """Should call add_data once per batch, not once per item."""
+        from main import _batched_add
+        
+        client = MagicMock()
+        client.add_data = AsyncMock(return_value="ok")
+        
+        added = await _batched_add(client, [{"id": i} for i in range(250)], "products", batch_size=100)
+        
+        assert added == 250
+        assert client.add_data.await_count == 3
+        assert len(client.add_data.call_args_list[-1][0][0]) == 50
+        assert client.add_data.call_args_list[0][1]["node_set"] == "products"
+    
+    @pytest.mark.asyncio
+    async def test_batched_add_skips_failed_batch(self):
+        """A failing batch should be skipped without aborting the rest."""
+        from main import _batched_add
+        
+        client = MagicMock()
+        client.add_data = AsyncMock(side_effect=[Exception("boom"), "ok"])
+        
+        added = await _batched_add(client, list(range(20)), "feedback", batch_size=10)
+        
+        assert added == 10
+    
+    @pytest.mark.asyncio
+    async def test_batched_add_samples_error_logs(self):
+        """Failures should all be counted but only the first few logged."""
+        from main import COGNEE_ERROR_LOG_SAMPLE, _batched_add
+        
+        client = MagicMock()
+        client.add_data = AsyncMock(side_effect=Exception("backend down"))
+        error_stats = {}
+        
+        with patch("main.logger") as mock_logger:
+            await _batched_add(client, list(range(15)), "feedback", batch_size=1, error_stats=error_stats)
+            await _batched_add(client, list(range(5)), "feedback", batch_size=1, error_stats=error_stats)
+        
+        assert error_stats["count"] == 20
+        assert error_stats["last"] == "feedback batch 4: backend down"
+        assert mock_logger.warning.call_count == COGNEE_ERROR_LOG_SAMPLE
+    
+    @pytest.mark.asyncio
+    async def test_batched_add_sends_one_batch_at_a_time(self):
+        """Batches should go out sequentially - add_data serializes on a lock anyway."""
+        import asyncio
+        from main import _batched_add
+        
+        in_flight = 0
+        peak = 0
+        
+        async def slow_add(chunk, node_set=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+        
+        client = MagicMock()
+        client.add_data = slow_add
+        
+        added = await _batched_add(client, list(range(60)), "actions", batch_size=10)
+        
+        assert added == 60
+        assert peak == 1
+
+
+class TestSyncPayloadBuilders:
+    """Test the CPU-only payload builders used by sync tasks."""
+    
+    def test_build_action_docs_offsets_ids(self):
+        """Actions without an id should get an index continuing from start."""
+        from main import _build_action_docs
+        
+        docs = _build_action_docs([{"title": "Fix", "description": "bug"}, {"id": "a9"}], start=5)
+        
+        assert docs[0]["id"] == "action_5"
+        assert docs[0]["text"] == "Action: Fix. bug"
+        assert docs[1]["id"] == "a9"
+    
+    def test_build_feedback_payloads_labels_sentiment(self):
+        """Sentiment labels should follow the +/-0.3 thresholds and tolerate nulls."""
+        from main import _build_feedback_payloads
+        
+        payloads = _build_feedback_payloads([
+            {"sentiment_score": 0.5, "product": {"name": "Alpha"}},
+            {"sentiment_score": -0.5, "product": None},
+            {"sentiment_score": None},
+        ])
+        
+        assert [p["sentiment"] for p in payloads] == ["positive", "negative", "neutral"]
+        assert [p["product_name"] for p in payloads] == ["Alpha", "Unknown", "Unknown"]
+        assert payloads[2]["sentiment_score"] == 0
+
+
+class TestUnifiedSyncBackground:
+    """Test the unified sync background task."""
+    
+    @pytest.mark.asyncio
+    async def test_sync_ingests_chroma_and_cognee(self):
+        """Both sinks should be ingested and reported on the job status."""
+        from fastapi import BackgroundTasks
+        from main import SyncRequest, job_store, unified_sync_ingest
+        
+        loader = MagicMock()
+        loader.ingest_documents.return_value = 2
+        cognee_client = MagicMock()
+        cognee_client.add_data = AsyncMock(return_value="ok")
+        
+        with (
+            patch("main.fetch_from_supabase", new_callable=AsyncMock,
+                  return_value=[{"id": "a1", "title": "Fix"}, {"id": "a2", "title": "Ship"}]),
+            patch("main.count_from_supabase", new_callable=AsyncMock, return_value=2),
+            patch("main.get_lazy_document_loader", return_value=loader),
+            patch("main._get_cognee", new_callable=AsyncMock, return_value=cognee_client),
+        ):
+            bg_tasks = BackgroundTasks()
+            result = await unified_sync_ingest(SyncRequest(source="actions", run_cognify=False), bg_tasks)
+            await bg_tasks()
+        
+        status = await job_store.get(result["job_id"])
+        assert status["status"] == "completed"
+        assert status["chroma_status"] == "completed"
+        assert status["chroma_ingested"] == 2
+        assert status["cognee_status"] == "completed"
+        assert status["cognee_ingested"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_sync_streams_pages(self):
+        """Every page should reach both sinks and totals should span all pages."""
+        from fastapi import BackgroundTasks
+        from main import SyncRequest, job_store, unified_sync_ingest
+        
+        pages = [[{"id": "a1"}, {"id": "a2"}], [{"id": "a3"}]]
+        
+        async def fake_pages(table, params):
+            for page in pages:
+                yield page
+        
+        loader = MagicMock()
+        loader.ingest_documents.side_effect = lambda docs: len(docs)
+        cognee_client = MagicMock()
+        cognee_client.add_data = AsyncMock(return_value="ok")
+        
+        with (
+            patch("main.fetch_from_supabase_paged", fake_pages),
+            patch("main.count_from_supabase", new_callable=AsyncMock, return_value=None),
+            patch("main.get_lazy_document_loader", return_value=loader),
+            patch("main._get_cognee", new_callable=AsyncMock, return_value=cognee_client),
+            patch("main.clear_semantic_caches") as clear_caches,
+        ):
+            bg_tasks = BackgroundTasks()
+            result = await unified_sync_ingest(SyncRequest(source="actions", run_cognify=False), bg_tasks)
+            await bg_tasks()
+        
+        status = await job_store.get(result["job_id"])
+        clear_caches.assert_called_once()
+        assert status["records_found"] == 3
+        assert status["chroma_ingested"] == 3
+        assert status["cognee_ingested"] == 3
+        assert loader.ingest_documents.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_sync_cancels_page_ingests_when_fetch_fails(self):
+        """A fetch error mid-stream should cancel in-flight page ingests before failing the job."""
+        from fastapi import BackgroundTasks
+        from main import SyncRequest, job_store, unified_sync_ingest
+        
+        ingest_started = asyncio.Event()
+        ingest_cancelled = asyncio.Event()
+        
+        async def fake_pages(table, params):
+            yield [{"id": "a1"}]
+            await ingest_started.wait()
+            raise RuntimeError("supabase down")
+        
+        async def slow_add_data(*args, **kwargs):
+            ingest_started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                ingest_cancelled.set()
+                raise
+        
+        loader = MagicMock()
+        loader.ingest_documents.side_effect = lambda docs: len(docs)
+        cognee_client = MagicMock()
+        cognee_client.add_data = slow_add_data
+        
+        with (
+            patch("main.fetch_from_supabase_paged", fake_pages),
+            patch("main.count_from_supabase", new_callable=AsyncMock, return_value=None),
+            patch("main.get_lazy_document_loader", return_value=loader),
+            patch("main._get_cognee", new_callable=AsyncMock, return_value=cognee_client),
+        ):
+            bg_tasks = BackgroundTasks()
+            result = await unified_sync_ingest(SyncRequest(source="actions", run_cognify=False), bg_tasks)
+            await bg_tasks()
+        
+        status = await job_store.get(result["job_id"])
+        assert status["status"] == "failed"
+        assert ingest_cancelled.is_set()
+    
+    @pytest.mark.asyncio
+    async def test_sync_reports_no_data(self):
+        """An empty table should complete with a no-data message."""
+        from fastapi import BackgroundTasks
+        from main import SyncRequest, job_store, unified_sync_ingest
+        
+        with (
+            patch("main.fetch_from_supabase", new_callable=AsyncMock, return_value=[]),
+            patch("main.count_from_supabase", new_callable=AsyncMock, side_effect=Exception("no count")),
+            patch("main._get_cognee", new_callable=AsyncMock, return_value=None),
+        ):
+            bg_tasks = BackgroundTasks()
+            result = await unified_sync_ingest(SyncRequest(source="feedback"), bg_tasks)
+            await bg_tasks()
+        
+        status = await job_store.get(result["job_id"])
+        assert status["status"] == "completed"
+        assert status["message"] == "No data found to sync"
+    
+    @pytest.mark.asyncio
+    async def test_sync_short_circuits_on_zero_count(self):
+        """A zero HEAD count should complete without fetching any rows."""
+        from fastapi import BackgroundTasks
+        from main import SyncRequest, job_store, unified_sync_ingest
+        
+        fetch = AsyncMock(return_value=[])
+        with (
+            patch("main.fetch_from_supabase", fetch),
+            patch("main.count_from_supabase", new_callable=AsyncMock, return_value=0),
+        ):
+            bg_tasks = BackgroundTasks()
+            result = await unified_sync_ingest(SyncRequest(source="products"), bg_tasks)
+            await bg_tasks()
+        
+        status = await job_store.get(result["job_id"])
+        assert status["message"] == "No data found to sync"
+        fetch.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_sync_job_is_module_level(self):
+        """The queued job should be the module-level task with its state bound explicitly."""
+        import functools
+        
+        from fastapi import BackgroundTasks
+        from main import SyncRequest, _sync_job, unified_sync_ingest
+        
+        request = SyncRequest(source="products")
+        bg_tasks = BackgroundTasks()
+        with patch("main.job_queue") as queue:
+            queue.running = False
+            result = await unified_sync_ingest(request, bg_tasks)
+        
+        job = bg_tasks.tasks[0].func
+        assert isinstance(job, functools.partial)
+        assert job.func is _sync_job
+        assert job.args == (result["job_id"], request)
+
+
+class TestSyncJobQueue:
+    """Test sync endpoints handing jobs to the worker pool."""
+    
+    @pytest.mark.asyncio
+    async def test_sync_returns_503_when_queue_full(self):
+        """A saturated worker pool should reject with 503 + Retry-After."""
+        import asyncio
+        from fastapi import BackgroundTasks, HTTPException
+        from main import SyncRequest, unified_sync_ingest
+        
+        queue = MagicMock()
+        queue.running = True
+        queue.submit.side_effect = asyncio.QueueFull()
+        
+        with patch("main.job_queue", queue):
+            with pytest.raises(HTTPException) as exc_info:
+                await unified_sync_ingest(SyncRequest(source="products"), BackgroundTasks())
+        
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "30"
+    
+    @pytest.mark.asyncio
+    async def test_sync_submitted_to_running_pool(self):
+        """With the pool running, the job should not go to BackgroundTasks."""
+        from fastapi import BackgroundTasks
+        from main import SyncRequest, unified_sync_ingest
+        
+        queue = MagicMock()
+        queue.running = True
+        bg_tasks = BackgroundTasks()
+        
+        with patch("main.job_queue", queue):
+            await unified_sync_ingest(SyncRequest(source="products"), bg_tasks)
+        
+        queue.submit.assert_called_once()
+        assert bg_tasks.tasks == []
+
+
+class TestDebouncedCognify:
+    """Test the trailing, debounced cognify() scheduler."""
+    
+    @pytest.mark.asyncio
+    async def test_burst_of_schedules_runs_cognify_once(self):
+        """Several schedules inside the debounce window should build the graph once."""
+        import asyncio
+        import main
+        
+        cognee_client = MagicMock()
+        cognee_client.cognify = AsyncMock(return_value="done")
+        
+        with (
+            patch("main.COGNIFY_DEBOUNCE_SECONDS", 0.02),
+            patch("main._cognify_task", None),
+            patch("main._get_cognee", new_callable=AsyncMock, return_value=cognee_client),
+        ):
+            for _ in range(3):
+                main._schedule_cognify()
+                await asyncio.sleep(0.005)
+            await main._cognify_task
+        
+        cognee_client.cognify.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_schedule_during_cognify_triggers_rebuild(self):
+        """Ingests that land while cognify runs should get a follow-up build."""
+        import asyncio
+        import main
+        
+        calls = 0
+        
+        async def slow_cognify():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                main._schedule_cognify()  # an ingest finishes mid-build
+        
+        cognee_client = MagicMock()
+        cognee_client.cognify = slow_cognify
+        
+        with (
+            patch("main.COGNIFY_DEBOUNCE_SECONDS", 0.01),
+            patch("main._cognify_task", None),
+            patch("main._get_cognee", new_callable=AsyncMock, return_value=cognee_client),
+        ):
+            main._schedule_cognify()
+            await main._cognify_task
+        
+        assert calls == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
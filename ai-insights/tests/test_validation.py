@@ -224,6 +224,17 @@ class TestProductInsightRequestValidation:
 
         assert request.insight_type == "recommendations"
 
+    def test_insight_types_match_generator_prompts(self):
+        """Every accepted insight type should have a prompt, and vice versa."""
+        from typing import get_args
+
+        from ai_insights.utils.generator import INSIGHT_PROMPTS
+        from ai_insights.utils.validation import InsightType
+
+        assert set(get_args(InsightType)) == set(INSIGHT_PROMPTS)
+        request = ProductInsightRequest(product_id="prod-abc", insight_type="competitive")
+        assert request.insight_type == "competitive"
+
     def test_invalid_insight_type_rejected(self):
         """Should reject invalid insight types."""
         with pytest.raises(ValidationError):
@@ -150,6 +150,31 @@ class TestInsert:
         assert metadatas[0]["source"] == "test"
         assert metadatas[0]["product_id"] == "prod_001"
 
+    @patch("ai_insights.retrieval.vector_store.chromadb")
+    def test_insert_stores_lowercased_theme(self, mock_chromadb):
+        """Should store a lowercased theme only for chunks that have one."""
+        from ai_insights.retrieval.vector_store import ChromaVectorStore
+
+        mock_client = MagicMock()
+        mock_collection = MagicMock()
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_chromadb.PersistentClient.return_value = mock_client
+
+        store = ChromaVectorStore()
+
+        store.insert(
+            texts=["Feedback", "Doc"],
+            float_embeddings=np.random.rand(2, 384).astype(np.float32),
+            binary_embeddings=np.random.rand(2, 48).astype(np.uint8),
+            doc_ids=["doc1", "doc2"],
+            chunk_ids=[0, 0],
+            metadata=[{"source": "feedback", "theme": "Usability"}, {"source": "test"}],
+        )
+
+        metadatas = mock_collection.upsert.call_args.kwargs.get("metadatas")
+        assert metadatas[0]["theme_lc"] == "usability"
+        assert "theme_lc" not in metadatas[1]
+
     @patch("ai_insights.retrieval.vector_store.chromadb")
     def test_insert_returns_empty_if_no_collection(self, mock_chromadb):
         """Should return empty list if collection is None."""
@@ -178,6 +203,86 @@ class TestInsert:
         assert ids == []
 
 
+class TestStoredChunks:
+    """Test the single read of what the store already holds."""
+
+    @patch("ai_insights.retrieval.vector_store.chromadb")
+    def test_matches_on_text_and_metadata(self, mock_chromadb):
+        """Only chunks stored with the same text and flattened metadata should be unchanged."""
+        from ai_insights.retrieval.vector_store import ChromaVectorStore
+
+        mock_client = MagicMock()
+        mock_collection = MagicMock()
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_chromadb.PersistentClient.return_value = mock_client
+        mock_collection.get.return_value = {
+            "ids": ["doc1_0", "doc2_0", "doc3_0"],
+            "documents": ["Same", "Old text", "Same"],
+            "metadatas": [
+                {"doc_id": "doc1", "chunk_id": 0, "source": "jira", "product_id": ""},
+                {"doc_id": "doc2", "chunk_id": 0, "source": "jira", "product_id": ""},
+                {"doc_id": "doc3", "chunk_id": 0, "source": "jira", "product_id": "old"},
+            ],
+            "embeddings": None,
+        }
+
+        store = ChromaVectorStore()
+
+        unchanged, vectors = store.stored_chunks(
+            texts=["Same", "New text", "Same", "Unseen"],
+            doc_ids=["doc1", "doc2", "doc3", "doc4"],
+            chunk_ids=[0, 0, 0, 0],
+            metadata=[{"source": "jira"}, {"source": "jira"}, {"source": "jira", "product_id": "new"}, {}],
+        )
+
+        assert unchanged == {0}
+        assert vectors == {}
+        assert mock_collection.get.call_args.kwargs["ids"] == ["doc1_0", "doc2_0", "doc3_0", "doc4_0"]
+
+    @patch("ai_insights.retrieval.vector_store.chromadb")
+    def test_returns_vectors_of_matching_text_from_same_read(self, mock_chromadb):
+        """Stored vectors of still-wanted text should come from the same single get()."""
+        from ai_insights.retrieval.vector_store import ChromaVectorStore
+
+        mock_client = MagicMock()
+        mock_collection = MagicMock()
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_chromadb.PersistentClient.return_value = mock_client
+        mock_collection.get.return_value = {
+            "ids": ["doc1_0", "doc2_0"],
+            "documents": ["Same", "Old text"],
+            "metadatas": [
+                {"doc_id": "doc1", "chunk_id": 0, "source": "", "product_id": "old"},
+                {"doc_id": "doc2", "chunk_id": 0, "source": "", "product_id": ""},
+            ],
+            "embeddings": [[0.5, 0.5], [0.1, 0.9]],
+        }
+
+        store = ChromaVectorStore()
+
+        unchanged, vectors = store.stored_chunks(
+            ["Same", "New text"], ["doc1", "doc2"], [0, 0], [{"product_id": "new"}, {}]
+        )
+
+        mock_collection.get.assert_called_once()
+        assert mock_collection.get.call_args.kwargs["include"] == ["documents", "metadatas", "embeddings"]
+        assert unchanged == set()
+        assert list(vectors) == ["Same"]
+        assert vectors["Same"].dtype == np.float32
+        assert vectors["Same"].tolist() == [0.5, 0.5]
+
+    @patch("ai_insights.retrieval.vector_store.chromadb")
+    def test_returns_empty_if_no_collection(self, mock_chromadb):
+        """Should report nothing stored if collection is None."""
+        from ai_insights.retrieval.vector_store import ChromaVectorStore
+
+        mock_chromadb.PersistentClient.return_value = MagicMock()
+        store = ChromaVectorStore()
+        store.collection = None
+
+        assert store.stored_chunks(["Text"], ["doc1"], [0], [{}]) == (set(), {})
+
+
 class TestSearch:
     """Test vector similarity search."""
 
@@ -295,6 +400,35 @@ class TestSearch:
         assert results == []
 
 
+class TestSearchBatch:
+    """Test batched search."""
+
+    @patch("ai_insights.retrieval.vector_store.chromadb")
+    def test_search_batch_queries_once_and_splits_rows(self, mock_chromadb):
+        """Should send all query vectors in one query and return hits per query."""
+        from ai_insights.retrieval.vector_store import ChromaVectorStore
+
+        mock_client = MagicMock()
+        mock_collection = MagicMock()
+        mock_collection.query.return_value = {
+            "ids": [["a_0"], ["b_0", "c_0"]],
+            "distances": [[0.1], [0.2, 0.3]],
+            "documents": [["A"], ["B", "C"]],
+            "metadatas": [[{"doc_id": "a"}], [{"doc_id": "b"}, {"doc_id": "c"}]],
+        }
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_chromadb.PersistentClient.return_value = mock_client
+
+        store = ChromaVectorStore()
+
+        results = store.search_batch(np.random.rand(2, 384).astype(np.float32), top_k=2)
+
+        mock_collection.query.assert_called_once()
+        assert len(mock_collection.query.call_args.kwargs["query_embeddings"]) == 2
+        assert [[hit["text"] for hit in hits] for hits in results] == [["A"], ["B", "C"]]
+        assert results[1][0]["score"] == pytest.approx(0.8)
+
+
 class TestSearchFloat:
     """Test float embedding search (alias for search)."""
 
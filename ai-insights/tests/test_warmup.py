@@ -0,0 +1,241 @@
+"""
+Tests for main.py's startup warmups and lazily built singletons.
+
+Covers the Cognee client singleton, Cognee and RAG warmup, and the lazy
+module-level components.
+"""
+
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+# Mock cognee module before any imports to prevent PyO3 initialization
+@pytest.fixture(autouse=True)
+def mock_cognee_module():
+    """Mock cognee module to prevent PyO3 initialization."""
+    mock_cognee = MagicMock()
+    mock_cognee.add = AsyncMock(return_value="added")
+    mock_cognee.cognify = AsyncMock(return_value="cognified")
+    mock_cognee.search = AsyncMock(return_value=[])
+    
+    with patch.dict(sys.modules, {'cognee': mock_cognee}):
+        # Drop main's cached ai_insights.cognee so patches on it are picked up
+        with patch("main._cognee_module", None):
+            yield mock_cognee
+
+
+class TestCogneeClientSingleton:
+    """Test the process-wide Cognee client cache."""
+    
+    @pytest.mark.asyncio
+    async def test_client_resolved_once(self):
+        """Repeated calls should reuse the client instead of re-resolving it."""
+        cognee_client = MagicMock()
+        cognee_loader = MagicMock()
+        cognee_loader.get_client = AsyncMock(return_value=cognee_client)
+        
+        with (
+            patch("main._cognee_client_singleton", None),
+            patch("main._cognee_client_checked_at", 0.0),
+            patch("ai_insights.cognee.get_cognee_lazy_loader", return_value=cognee_loader),
+        ):
+            from main import _get_cognee
+            
+            first = await _get_cognee()
+            second = await _get_cognee()
+        
+        assert first is cognee_client
+        assert second is cognee_client
+        cognee_loader.get_client.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_unavailable_client_not_cached(self):
+        """A None client should not be cached so later calls retry."""
+        cognee_loader = MagicMock()
+        cognee_loader.get_client = AsyncMock(return_value=None)
+        
+        with (
+            patch("main._cognee_client_singleton", None),
+            patch("main._cognee_client_checked_at", 0.0),
+            patch("ai_insights.cognee.get_cognee_lazy_loader", return_value=cognee_loader),
+        ):
+            from main import _get_cognee
+            
+            assert await _get_cognee() is None
+            assert await _get_cognee() is None
+        
+        assert cognee_loader.get_client.await_count == 2
+
+
+class TestCogneeWarmup:
+    """Test the Cognee warm-up install guard."""
+    
+    @pytest.mark.asyncio
+    async def test_skips_import_when_cognee_missing(self):
+        """Without the cognee package, warm-up should not touch the Cognee loader."""
+        import main
+        
+        get_cognee = AsyncMock()
+        
+        with (
+            patch.object(main, "_cognee_installed", return_value=False),
+            patch.object(main, "_get_cognee", get_cognee),
+            patch.object(main, "update_cognee_availability") as availability,
+        ):
+            await main.background_warmup()
+        
+        get_cognee.assert_not_called()
+        availability.assert_called_once_with(False)
+        assert main._cognee_initialized is False
+    
+    @pytest.mark.asyncio
+    async def test_initializes_when_cognee_installed(self):
+        """With the package present, warm-up should initialize the client."""
+        import main
+        
+        client = MagicMock()
+        client.initialize = AsyncMock()
+        
+        with (
+            patch.object(main, "_cognee_installed", return_value=True),
+            patch.object(main, "_get_cognee", AsyncMock(return_value=client)),
+            patch.object(main, "update_cognee_availability") as availability,
+            patch.object(main, "_cognee_initialized", False),
+        ):
+            await main.background_warmup()
+            assert main._cognee_initialized is True
+        
+        client.initialize.assert_awaited_once()
+        availability.assert_called_once_with(True)
+
+
+class TestRagWarmup:
+    """Test parallel RAG warm-up at startup."""
+    
+    @pytest.mark.asyncio
+    async def test_builds_leaves_before_composites(self):
+        """Shared leaf singletons should be built before the pipeline and loader."""
+        import main
+        
+        calls = []
+        embeddings = MagicMock()
+        retrieval = MagicMock()
+        retrieval.get_embeddings.side_effect = lambda: calls.append("embeddings") or embeddings
+        retrieval.get_reranker.side_effect = lambda: calls.append("reranker")
+        
+        with (
+            patch.object(main.importlib, "import_module", return_value=retrieval),
+            patch.object(main, "get_lazy_vector_store", side_effect=lambda: calls.append("vector_store")),
+            patch.object(main, "get_lazy_generator", side_effect=lambda: calls.append("generator")),
+            patch.object(main, "get_lazy_retrieval", side_effect=lambda: calls.append("retrieval")),
+            patch.object(main, "get_lazy_document_loader", side_effect=lambda: calls.append("loader")),
+        ):
+            await main.background_rag_warmup()
+        
+        assert sorted(calls) == ["embeddings", "generator", "loader", "reranker", "retrieval", "vector_store"]
+        leaves = max(calls.index(name) for name in ("embeddings", "reranker", "vector_store"))
+        assert leaves < min(calls.index("retrieval"), calls.index("loader"))
+        embeddings.embed_text.assert_called_once_with("warm-up")
+    
+    @pytest.mark.asyncio
+    async def test_failures_are_not_raised(self):
+        """A failing component should be logged, not crash startup, and not stop the others."""
+        import main
+        
+        generator = MagicMock()
+        
+        with (
+            patch.object(main.importlib, "import_module", side_effect=ImportError("no torch")),
+            patch.object(main, "get_lazy_generator", generator),
+        ):
+            await main.background_rag_warmup()
+        
+        generator.assert_called_once()
+    
+    def test_preload_builds_models_and_freezes_gc(self):
+        """Pre-fork preload should build the heavy singletons, then freeze the GC."""
+        import main
+        
+        with (
+            patch.object(main, "get_lazy_vector_store") as vector_store,
+            patch.object(main, "get_lazy_retrieval") as retrieval,
+            patch.object(main, "get_lazy_document_loader") as loader,
+            patch.object(main, "get_lazy_generator") as generator,
+            patch.object(main.gc, "freeze") as freeze,
+        ):
+            main.preload_rag_models()
+        
+        vector_store.assert_called_once()
+        retrieval.assert_called_once()
+        loader.assert_called_once()
+        generator.assert_not_called()
+        freeze.assert_called_once()
+    
+    def test_preload_failure_is_not_raised(self):
+        """A failed preload should leave loading to the workers."""
+        import main
+        
+        with (
+            patch.object(main, "get_lazy_vector_store", side_effect=ImportError("no chromadb")),
+            patch.object(main.gc, "freeze") as freeze,
+        ):
+            main.preload_rag_models()
+        
+        freeze.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_preload_models_blocks_startup(self):
+        """With PRELOAD_MODELS the warm-up should finish before the app starts serving."""
+        import main
+        
+        warmed = []
+        
+        async def warmup():
+            await asyncio.sleep(0)
+            warmed.append(True)
+        
+        with (
+            patch.object(main, "PRELOAD_MODELS", True),
+            patch.object(main, "background_rag_warmup", warmup),
+            patch.object(main, "background_warmup", AsyncMock()),
+            patch.object(main, "job_queue", AsyncMock()),
+            patch.object(main, "get_http_client"),
+            patch.object(main, "close_http_client", AsyncMock()),
+            patch.object(main, "close_job_store", AsyncMock()),
+        ):
+            async with main.lifespan(main.app):
+                assert warmed == [True]
+
+
+class TestLazySingletons:
+    """Test the module-level __getattr__ lazy singletons."""
+    
+    def test_builds_once_then_plain_global(self):
+        """First access should call the factory; later accesses reuse the global."""
+        import main
+        
+        module = MagicMock()
+        try:
+            with patch.object(main.importlib, "import_module", return_value=module) as import_module:
+                first = main.retrieval
+                assert main.get_lazy_retrieval() is first
+                assert main.retrieval is first
+            
+            import_module.assert_called_once_with("ai_insights.retrieval")
+            module.get_retrieval_pipeline.assert_called_once()
+        finally:
+            vars(main).pop("retrieval", None)
+    
+    def test_unknown_attribute_raises(self):
+        """Names outside the lazy table should still raise AttributeError."""
+        import main
+        
+        with pytest.raises(AttributeError):
+            main.not_a_singleton
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,55 @@
+"""
+arq worker for out-of-process Jira CSV ingestion.
+
+WHY: Parsing, embedding and upserting a large Jira export is CPU heavy. Run
+     in the API process it takes CPU from every request on the same pod.
+     With CSV_INGEST_QUEUE=arq the API only spools the upload and enqueues it;
+     these workers do the ingestion and scale independently of the API.
+
+Run alongside the API (same REDIS_URL, same CSV_SPOOL_DIR volume):
+    arq worker.WorkerSettings
+
+Requires a vector store shared with the API. The current one is a local
+chromadb.PersistentClient, so the worker refuses to start (see
+main.VECTOR_STORE_SHARED_WITH_WORKERS) and the API ingests CSVs in-process.
+"""
+
+import os
+
+from arq.connections import RedisSettings
+
+from main import (
+    CACHE_INVALIDATION_CHANNEL,
+    VECTOR_STORE_SHARED_WITH_WORKERS,
+    process_jira_csv_background,
+)
+
+
+async def startup(ctx):
+    if not VECTOR_STORE_SHARED_WITH_WORKERS:
+        raise RuntimeError(
+            "CSV ingestion workers need a vector store shared with the API; "
+            "the local Chroma index is per process"
+        )
+
+
+async def process_jira_csv_task(ctx, job_id: str, csv_path: str, filename: str):
+    """Ingest a spooled Jira CSV; progress is written to the shared job store."""
+
+    async def invalidate_caches():
+        # The answer caches live in the API processes, not here
+        await ctx["redis"].publish(CACHE_INVALIDATION_CHANNEL, job_id)
+
+    await process_jira_csv_background(job_id, csv_path, filename, invalidate_caches=invalidate_caches)
+
+
+class WorkerSettings:
+    functions = [process_jira_csv_task]
+    on_startup = startup
+    redis_settings = RedisSettings.from_dsn(os.getenv("REDIS_URL", "redis://localhost:6379"))
+    max_jobs = int(os.getenv("CSV_INGEST_WORKER_JOBS", "2"))
+    # Large exports take minutes to embed
+    job_timeout = int(os.getenv("CSV_INGEST_JOB_TIMEOUT", "3600"))
+    # Progress and results live in the job store. A kept arq result would hold the
+    # content-hash job id for an hour and silently drop re-uploads of the same file.
+    keep_result = 0